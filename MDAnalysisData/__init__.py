@@ -2,14 +2,35 @@
 #
 # Modelled after sklearn.datasets
 # https://github.com/scikit-learn/scikit-learn/tree/0.20.X/sklearn/datasets
+#
+# Submodules (including MDAnalysisData.datasets) and __version__ are only
+# loaded on first access so that importing the package is cheap.
+
+import importlib
 
 __all__ = ['datasets']
 
-from . import datasets
+_SUBMODULES = ('datasets', 'base', 'batch', 'aio', 'bundle', 'cache',
+               'chunked', 'decompress', 'materialize', 'offsets', 'registry',
+               'session', 'variants',
+               'adk_equilibrium', 'adk_transitions', 'nhaa_equilibrium',
+               'ifabp_water', 'vesicles', 'CG_fiber', 'PEG_1chain',
+               'membrane_peptide', 'yiip_equilibrium')
+
+
+def __getattr__(name):
+    if name in _SUBMODULES:
+        return importlib.import_module('.' + name, __name__)
+    if name == '__version__':
+        from importlib.metadata import version
+        value = globals()['__version__'] = version("MDAnalysisData")
+        return value
+    raise AttributeError("module {0!r} has no attribute {1!r}".format(
+        __name__, name))
 
 
-from importlib.metadata import version
-__version__ = version("MDAnalysisData")
+def __dir__():
+    return sorted(set(globals()) | set(_SUBMODULES) | {'__version__'})
 
 
 try:
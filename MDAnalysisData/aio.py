@@ -0,0 +1,175 @@
+# -*- coding: utf-8 -*-
+
+"""Fetch datasets from :mod:`asyncio` code.
+
+Every ``fetch_*`` function has an awaitable counterpart
+``async_fetch_*`` with the same arguments, e.g. ::
+
+  data = await datasets.async_fetch_yiip_equilibrium_long()
+
+The files of a dataset are downloaded (all files of a dataset at the
+same time), verified and unpacked by the same code as in the ``fetch_*``
+functions. That code blocks, so it runs in the default executor of the
+loop and the loop itself is never blocked. Every file that is being
+downloaded occupies a worker thread of the executor; the number of
+concurrent downloads of :func:`asyncio.gather` or
+:func:`async_fetch_many` is therefore limited by the executor (see
+:meth:`asyncio.loop.set_default_executor`) and further files wait for a
+free worker.
+
+If a task is cancelled, its downloads stop after the chunk of data that
+they are reading and the task ends; the partial files are kept so that
+the next fetch resumes them. Unpacking the files of a dataset, which
+starts once all files were downloaded, is finished before the task ends
+so that no file is left half-written. With ``keep_archive=False`` an
+archive is downloaded and unpacked in one step by the ``fetch_*``
+function, so that this step is not interrupted either.
+"""
+
+from os.path import join
+import asyncio
+import functools
+import inspect
+import threading
+
+import logging
+
+from .base import get_blob_store, get_data_home, get_verify
+from .base import _dataset_layers
+from .batch import DATASETS, _ensure, _missing
+
+logger = logging.getLogger(__name__)
+
+
+async def _run(func, *args, **kwargs):
+    """Run `func` in the default executor of the loop.
+
+    If the calling task is cancelled, the `cancel` event among the
+    arguments (if any) is set and the cancellation is only raised once
+    `func` has returned, so that no file is used by a worker thread after
+    the task gave up on it.
+    """
+    cancel = kwargs.get('cancel')
+    future = asyncio.get_running_loop().run_in_executor(
+        None, functools.partial(func, *args, **kwargs))
+    try:
+        return await asyncio.shield(future)
+    except asyncio.CancelledError:
+        if cancel is not None:
+            cancel.set()
+        await asyncio.wait([future])
+        if not future.cancelled():
+            # retrieve the exception of the stopped download so that it
+            # is not logged as unhandled
+            future.exception()
+        raise
+
+
+async def async_fetch(name, **kwargs):
+    """Fetch the dataset `name` without blocking the event loop.
+
+    Parameters
+    ----------
+    name : str
+        name of the dataset, i.e., the name of its ``fetch_*`` function
+        without the ``fetch_`` prefix (see
+        :data:`MDAnalysisData.batch.DATASETS`)
+    **kwargs
+        arguments of the ``fetch_*`` function of the dataset
+
+    Returns
+    -------
+    dataset : Bunch
+        as returned by the ``fetch_*`` function
+
+    Raises
+    ------
+    ValueError
+        if the dataset name is not known
+    """
+    try:
+        dataset = DATASETS[name]
+    except KeyError:
+        raise ValueError("Unknown dataset {0}; choose from {1}".format(
+            name, ", ".join(DATASETS)))
+    data_home = kwargs.get('data_home')
+    if (kwargs.get('download_if_missing', True)
+            and kwargs.get('keep_archive', True)):
+        # without keep_archive the archive is streamed by the fetch_*
+        # function instead of stored
+        verify = get_verify(kwargs.get('verify'))
+        data_location = join(get_data_home(data_home), dataset.name)
+        layers = _dataset_layers(dataset.name, data_home=data_home)
+        store = get_blob_store(data_home)
+        # an archive whose contents are unpacked is not downloaded again
+        files, options = await _run(_missing, name, data_location, layers)
+        for keyword, value in options.items():
+            kwargs.setdefault(keyword, value)
+        cancel = threading.Event()
+        await asyncio.gather(*[
+            _run(_ensure, meta, data_location, verify=verify, store=store,
+                 layers=layers, cancel=cancel)
+            for meta in files.values()])
+        if verify != 'exists':
+            # the files were just verified (and recorded in the manifest)
+            kwargs['verify'] = 'stat'
+    return await _run(dataset.fetch, **kwargs)
+
+
+async def async_fetch_many(names=None, **kwargs):
+    """Fetch several datasets concurrently without blocking the event loop.
+
+    Parameters
+    ----------
+    names : list of str or None
+        names of the datasets (see :func:`async_fetch`); ``None``
+        fetches all datasets
+    **kwargs
+        arguments of the ``fetch_*`` functions that all datasets accept,
+        e.g., `data_home` or `verify`
+
+    Returns
+    -------
+    datasets : dict
+        the :class:`~MDAnalysisData.base.Bunch` of each dataset, keyed by
+        the name of the dataset
+    """
+    if names is None:
+        names = list(DATASETS)
+    results = await asyncio.gather(*[async_fetch(name, **kwargs)
+                                     for name in names])
+    return dict(zip(names, results))
+
+
+def _make_async_fetch(name):
+    fetch = DATASETS[name].fetch
+    signature = inspect.signature(fetch)
+
+    @functools.wraps(fetch)
+    async def async_fetch_dataset(*args, **kwargs):
+        arguments = signature.bind(*args, **kwargs).arguments
+        return await async_fetch(name, **arguments)
+
+    async_fetch_dataset.__name__ = 'async_' + fetch.__name__
+    async_fetch_dataset.__qualname__ = async_fetch_dataset.__name__
+    async_fetch_dataset.__doc__ = (
+        "Awaitable version of :func:`~{0}.{1}`.\n\n"
+        "    Takes the same arguments and returns the same "
+        ":class:`~MDAnalysisData.base.Bunch`;\n"
+        "    see :mod:`MDAnalysisData.aio`.\n".format(fetch.__module__,
+                                                     fetch.__name__))
+    return async_fetch_dataset
+
+
+async_fetch_adk_equilibrium = _make_async_fetch('adk_equilibrium')
+async_fetch_adk_transitions_DIMS = _make_async_fetch('adk_transitions_DIMS')
+async_fetch_adk_transitions_FRODA = _make_async_fetch('adk_transitions_FRODA')
+async_fetch_nhaa_equilibrium = _make_async_fetch('nhaa_equilibrium')
+async_fetch_ifabp_water = _make_async_fetch('ifabp_water')
+async_fetch_vesicle_lib = _make_async_fetch('vesicle_lib')
+async_fetch_CG_fiber = _make_async_fetch('CG_fiber')
+async_fetch_PEG_1chain = _make_async_fetch('PEG_1chain')
+async_fetch_membrane_peptide = _make_async_fetch('membrane_peptide')
+async_fetch_yiip_equilibrium_short = _make_async_fetch(
+    'yiip_equilibrium_short')
+async_fetch_yiip_equilibrium_long = _make_async_fetch('yiip_equilibrium_long')
@@ -24,17 +24,38 @@ downloads and the checksum check in :func:`_fetch_remote` will fail:
 # Code taken from sklearn/utils/ and sklearn/datasets under the 'New BSD license'
 # https://github.com/scikit-learn/scikit-learn/blob/master/COPYING and adapted
 
-from urllib.request import urlretrieve
+from urllib.error import HTTPError
+from http.client import HTTPException
 
+import json
+import logging
+import re
 import shutil
+import sys
+import tarfile
+import tempfile
+import threading
+import time
 from collections import namedtuple
-from os import environ, listdir, makedirs
-from os.path import dirname, exists, expanduser, isdir, join, splitext
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import ExitStack, contextmanager
+import os
+from os import environ, listdir, makedirs, remove, replace
+from os.path import (basename, dirname, exists, expanduser, getsize, isdir,
+                     join, splitext)
 import hashlib
 import importlib.resources
 
+if sys.platform == 'win32':
+    import msvcrt
+else:
+    import fcntl
+
 from tqdm import tqdm
 
+from .decompress import get_compression, open_decompressed
+from .session import get_session
+
 #: Default value for the cache directory. It can be changed by setting
 #: the environment variable :envvar:`MDANALYSIS_DATA`. The current
 #: value should be queried with :func:`get_data_home`.
@@ -42,6 +63,54 @@ from tqdm import tqdm
 #: .. SeeAlso:: :ref:`managing-data`.
 DEFAULT_DATADIR = join('~', 'MDAnalysis_data')
 
+#: Suffix of the file that a download is written to until it is complete
+#: and verified. An incomplete download is resumed from this file.
+PARTIAL_SUFFIX = '.part'
+
+#: Name of the directory in the data home that holds the content-addressed
+#: store of all downloaded files (see :func:`get_blob_store`).
+BLOBS = '.blobs'
+
+#: Name of the file in each dataset directory that records the SHA256
+#: checksum and the :func:`os.stat` signature (size, modification time
+#: and inode) of every file at the time it was verified.
+MANIFEST = '.manifest.json'
+
+#: Ways to check a cached file before it is used (see :func:`get_verify`).
+VERIFY_MODES = ('exists', 'stat', 'full')
+
+#: Default verification of cached files. It can be changed by setting the
+#: environment variable :envvar:`MDANALYSIS_DATA_VERIFY` to one of
+#: :data:`VERIFY_MODES`.
+DEFAULT_VERIFY = 'exists'
+
+#: Default number of concurrent connections used to download a single
+#: large file. It can be changed by setting the environment variable
+#: :envvar:`MDANALYSIS_DATA_CONNECTIONS`; a value of 1 disables
+#: parallel downloads.
+DEFAULT_CONNECTIONS = 4
+
+#: Files smaller than this size (in bytes) are always downloaded over a
+#: single connection.
+PARALLEL_MIN_SIZE = 64 * 1024**2
+
+#: Time (in seconds) to wait for the first byte from a mirror when the
+#: sources of a file are probed (see :func:`_rank_urls`).
+PROBE_TIMEOUT = 5
+
+#: Number of bytes read from the network at a time.
+_CHUNK_SIZE = 1024 * 1024
+
+#: Size of the byte ranges that a parallel download is split into; it is
+#: also the granularity with which a parallel download can be resumed.
+_SEGMENT_SIZE = 16 * 1024**2
+
+# descriptions that were read, keyed by (description_dir, filename)
+_descriptions = {}
+
+logger = logging.getLogger(__name__)
+
+
 class Bunch(dict):
     """Container object for datasets
 
@@ -87,6 +156,127 @@ class Bunch(dict):
         pass
 
 
+class _FileLock(object):
+    """Exclusive lock on a lock file, shared between processes and threads.
+
+    The lock is held inside a ``with`` block and uses :func:`fcntl.flock`
+    (:func:`msvcrt.locking` on Windows) so that it also works for
+    processes on different nodes if the file system supports it. The
+    lock file itself is never removed.
+
+    >>> with _FileLock("/tmp/.dataset.lock"):
+    ...     pass  # only one process at a time
+
+    A `shared` lock can be held by several owners at the same time and
+    only excludes exclusive locks. Windows does not support shared locks,
+    so they are exclusive there.
+    """
+
+    def __init__(self, path, shared=False):
+        self.path = path
+        self.shared = shared
+        self._file = None
+
+    def acquire(self, blocking=True):
+        """Acquire the lock.
+
+        Returns ``False`` if `blocking` is ``False`` and the lock is held
+        by someone else, ``True`` otherwise.
+        """
+        self._file = open(self.path, 'a+b')
+        try:
+            if not self._lock(blocking=False):
+                if not blocking:
+                    self._file.close()
+                    self._file = None
+                    return False
+                logger.info("Waiting for lock {}...".format(self.path))
+                self._lock(blocking=True)
+        except BaseException:
+            self._file.close()
+            self._file = None
+            raise
+        return True
+
+    def release(self):
+        """Release the lock."""
+        try:
+            self._unlock()
+        finally:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+
+    if sys.platform == 'win32':
+        def _lock(self, blocking):
+            self._file.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(self._file.fileno(), msvcrt.LK_NBLCK, 1)
+                    return True
+                except OSError:
+                    if not blocking:
+                        return False
+                    time.sleep(0.1)
+
+        def _unlock(self):
+            self._file.seek(0)
+            msvcrt.locking(self._file.fileno(), msvcrt.LK_UNLCK, 1)
+    else:
+        def _lock(self, blocking):
+            flags = fcntl.LOCK_SH if self.shared else fcntl.LOCK_EX
+            if not blocking:
+                flags |= fcntl.LOCK_NB
+            try:
+                fcntl.flock(self._file.fileno(), flags)
+            except BlockingIOError:
+                return False
+            return True
+
+        def _unlock(self):
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+
+
+class _Cancelled(Exception):
+    """A download was stopped because its `cancel` event was set.
+
+    The partial file (and the record of completed byte ranges) is kept
+    so that the next fetch resumes the download.
+    """
+
+
+def _check_cancelled(cancel, url):
+    """Raise :exc:`_Cancelled` if the `cancel` event is set."""
+    if cancel is not None and cancel.is_set():
+        raise _Cancelled("Download of {} cancelled; run again to "
+                         "resume.".format(url))
+
+
+def _lock_path(path):
+    """Return the name of the (hidden) lock file that belongs to `path`."""
+    head, tail = os.path.split(path)
+    return join(head, '.' + tail + '.lock')
+
+
+def _use_lock(data_location, shared=True):
+    """Return the lock that protects the dataset in `data_location`.
+
+    Every fetch holds the shared lock while it downloads, unpacks or
+    converts files of the dataset;
+    :func:`~MDAnalysisData.cache.evict_datasets` only removes a dataset
+    if it can acquire the exclusive lock. The lock file is kept next to
+    the directory of the dataset so that it outlives the dataset.
+    """
+    head, tail = os.path.split(data_location)
+    return _FileLock(join(head, '.' + tail + '.use.lock'), shared=shared)
+
+
 #: Each remote resource is described by a :class:`RemoteFileMetadata`,
 #: which is a :func:`~collections.namedtuple` with fields
 #:
@@ -95,9 +285,12 @@ class Bunch(dict):
 #: - *checksum*: SHA256 (can be generated with :func:`MDAnalysisData.base._sha256`;
 #:   often it is just as convenient to run the downloader during testing and note the
 #:   required SHA256 then)
+#: - *mirrors*: alternative URLs of the same file (optional); see
+#:   :func:`get_mirrors` for mirrors configured by the user
 #:
 RemoteFileMetadata = namedtuple('RemoteFileMetadata',
-                                ['filename', 'url', 'checksum'])
+                                ['filename', 'url', 'checksum', 'mirrors'],
+                                defaults=((),))
 
 
 def get_data_home(data_home=None):
@@ -109,7 +302,9 @@ def get_data_home(data_home=None):
 
     Alternatively, it can be set by the :envvar:`MDANALYSIS_DATA` environment
     variable or programmatically by giving an explicit folder path. The '~'
-    symbol is expanded to the user home folder.
+    symbol is expanded to the user home folder. If only the search path
+    :envvar:`MDANALYSIS_DATA_PATH` is set (see :func:`get_data_path`), its
+    last directory is the data dir.
 
     If the folder does not already exist, it is automatically created.
 
@@ -120,14 +315,72 @@ def get_data_home(data_home=None):
 
     """
     if data_home is None:
-        data_home = environ.get('MDANALYSIS_DATA',
-                                DEFAULT_DATADIR)
+        data_home = environ.get('MDANALYSIS_DATA')
+    if data_home is None:
+        path = _split_data_path()
+        data_home = path[-1] if path else DEFAULT_DATADIR
     data_home = expanduser(data_home)
     if not exists(data_home):
         makedirs(data_home)
     return data_home
 
 
+def get_data_path(data_home=None):
+    """Return the data dirs that are searched for datasets.
+
+    The environment variable :envvar:`MDANALYSIS_DATA_PATH` holds a list
+    of directories (separated by :data:`os.pathsep`, i.e., ``:`` on
+    Linux and macOS), e.g., a read-only copy of all datasets that is
+    shared by all users of a cluster followed by a small per-user
+    directory::
+
+      MDANALYSIS_DATA_PATH=/shared/MDAnalysis_data:/scratch/$USER/MDAnalysis_data
+
+    The ``fetch_*`` functions use the files of a dataset from the first
+    directory that holds a verified copy. Only the data dir
+    (:func:`get_data_home`, the last directory of the search path unless
+    :envvar:`MDANALYSIS_DATA` is set) is ever written to; it is searched
+    last.
+
+    Parameters
+    ----------
+    data_home : str | None
+        The path to MDAnalysisData data dir. If it is given, it is the
+        only directory that is searched.
+
+    Returns
+    -------
+    path : list of str
+        directories to search in order; the last one is the data dir
+    """
+    if data_home is not None:
+        return [get_data_home(data_home)]
+    data_home = get_data_home()
+    path = [layer for layer in _split_data_path() if layer != data_home]
+    return path + [data_home]
+
+
+def _split_data_path():
+    """Return the directories in :envvar:`MDANALYSIS_DATA_PATH`."""
+    return [expanduser(layer) for layer in
+            environ.get('MDANALYSIS_DATA_PATH', '').split(os.pathsep)
+            if layer]
+
+
+def _dataset_layers(name, data_home=None):
+    """Return the read-only directories of dataset `name` in the data path."""
+    return [join(layer, name) for layer in get_data_path(data_home)[:-1]]
+
+
+def _find_file(remote, layers, verify=None):
+    """Return the path of a verified copy of `remote` in `layers` or ``None``."""
+    for layer in layers:
+        path = join(layer, remote.filename)
+        if exists(path) and _verify(path, remote.checksum, verify=verify):
+            return path
+    return None
+
+
 def clear_data_home(data_home=None):
     """Delete all the content of the data home cache.
 
@@ -139,27 +392,365 @@ def clear_data_home(data_home=None):
     data_home = get_data_home(data_home)
     shutil.rmtree(data_home)
 
+def get_blob_store(data_home=None):
+    """Return the path of the content-addressed store of downloaded files.
+
+    Every downloaded file is also stored under its SHA256 checksum in the
+    store and the files in the dataset directories are hardlinks to the
+    stored copies. A file whose checksum is already in the store is
+    linked instead of downloaded, so files that are shared between
+    datasets (or data homes) are downloaded and stored only once.
+
+    The store is the directory :data:`BLOBS` in the data home. It can be
+    changed with the environment variable :envvar:`MDANALYSIS_DATA_BLOBS`
+    (e.g., to share one store between data homes on the same file
+    system); an empty value disables the store.
+
+    Parameters
+    ----------
+    data_home : str | None
+        The path to MDAnalysisData data dir.
+
+    Returns
+    -------
+    store : str | None
+        path of the store or ``None`` if it is disabled
+    """
+    store = environ.get('MDANALYSIS_DATA_BLOBS')
+    if store is None:
+        return join(get_data_home(data_home), BLOBS)
+    return expanduser(store) if store else None
+
+
+def _blob_path(store, checksum):
+    """Return the path of the file with SHA256 `checksum` in `store`."""
+    return join(store, 'sha256', checksum[:2], checksum)
+
+
+#: Suffix of the file next to a stored file that lists the paths of the
+#: hardlinks to it in the data homes.
+_LINKS_SUFFIX = '.links'
+
+
+def _record_link(blob, file_path):
+    """Record that `file_path` is a hardlink to the stored `blob`."""
+    try:
+        with open(blob + _LINKS_SUFFIX, 'a') as f:
+            f.write(os.path.abspath(file_path) + '\n')
+    except OSError as err:
+        logger.debug("Cannot record link {0} of {1}: {2}".format(
+            file_path, blob, err))
+
+
+def _links_changed(blob, ctime):
+    """Keep the frame offsets of the hardlinks to `blob` valid.
+
+    Adding or removing a hardlink changes the ctime of the file and with
+    it of every other link (in any data home that shares the store), which
+    invalidates their offsets files (see :mod:`MDAnalysisData.offsets`).
+    Offsets that were valid for the previous `ctime` are updated.
+    """
+    # imported here because the offsets module builds on this module
+    from . import offsets
+    try:
+        with open(blob + _LINKS_SUFFIX) as f:
+            paths = set(f.read().splitlines())
+    except OSError:
+        return
+    for path in paths:
+        try:
+            if os.path.samefile(path, blob):
+                offsets._update_ctime(path, ctime)
+        except OSError:
+            # removed or replaced
+            pass
+
+
+def _add_to_store(store, file_path, checksum):
+    """Hardlink the verified `file_path` into `store` under its `checksum`.
+
+    Files that cannot be hardlinked (e.g., because the store is on a
+    different file system) are not stored.
+    """
+    blob = _blob_path(store, checksum)
+    if exists(blob):
+        return
+    try:
+        makedirs(dirname(blob), exist_ok=True)
+        os.link(file_path, blob)
+    except FileExistsError:
+        pass
+    except OSError as err:
+        logger.debug("Cannot add {0} to {1}: {2}".format(file_path, store,
+                                                         err))
+        return
+    _record_link(blob, file_path)
+
+
+def _link_from_store(store, file_path, checksum):
+    """Hardlink the file with `checksum` from `store` to `file_path`.
+
+    A stored file that is the same file as an existing `file_path` (which
+    is only replaced because it failed verification) is removed from the
+    store instead.
+
+    Returns
+    -------
+    linked : bool
+        ``True`` if `file_path` is now a link to the stored file
+    """
+    blob = _blob_path(store, checksum)
+    if not exists(blob):
+        return False
+    if exists(file_path) and os.path.samefile(blob, file_path):
+        logger.warning("Removing corrupted {} from the store".format(blob))
+        remove(blob)
+        return False
+    tmp_path = file_path + '.link'
+    try:
+        if exists(tmp_path):
+            remove(tmp_path)
+        ctime = os.stat(blob).st_ctime
+        os.link(blob, tmp_path)
+    except OSError as err:
+        logger.debug("Cannot link {0} to {1}: {2}".format(blob, file_path,
+                                                          err))
+        return False
+    replace(tmp_path, file_path)
+    logger.info("{0} found in {1}".format(basename(file_path), store))
+    _links_changed(blob, ctime)
+    _record_link(blob, file_path)
+    return True
+
+
+def _unlink_from_store(store, file_path, checksum):
+    """Remove `file_path`, a hardlink to the file with `checksum` in `store`.
+
+    The frame offsets of the other links are kept valid (see
+    :func:`_links_changed`).
+    """
+    blob = _blob_path(store, checksum)
+    try:
+        if not os.path.samefile(blob, file_path):
+            return
+        ctime = os.stat(blob).st_ctime
+        remove(file_path)
+    except OSError:
+        return
+    _links_changed(blob, ctime)
+
+
+def _prune_store(store):
+    """Remove the files from `store` that are no longer used by a dataset.
+
+    Returns
+    -------
+    removed : int
+        number of bytes that were freed
+    """
+    removed = 0
+    for root, dirs, files in os.walk(store):
+        for filename in files:
+            if filename.endswith(_LINKS_SUFFIX):
+                # removed with the stored file
+                continue
+            path = join(root, filename)
+            try:
+                stat = os.stat(path)
+                if stat.st_nlink == 1:
+                    remove(path)
+                    removed += stat.st_size
+                    if exists(path + _LINKS_SUFFIX):
+                        remove(path + _LINKS_SUFFIX)
+            except FileNotFoundError:
+                pass
+    return removed
+
+
 def _sha256(path):
     """Calculate the sha256 hash of the file at path."""
 
-    sha256hash = hashlib.sha256()
-    chunk_size = 8192
     with open(path, "rb") as f:
-        while True:
-            buffer = f.read(chunk_size)
-            if not buffer:
-                break
-            sha256hash.update(buffer)
-    return sha256hash.hexdigest()
+        return hashlib.file_digest(f, "sha256").hexdigest()
+
+
+def get_connections(n_connections=None):
+    """Return the number of connections used to download a large file.
+
+    Parameters
+    ----------
+    n_connections : int | None
+        Explicit number of connections. If ``None``, the value of the
+        :envvar:`MDANALYSIS_DATA_CONNECTIONS` environment variable or
+        :data:`DEFAULT_CONNECTIONS` is used.
+
+    """
+    if n_connections is None:
+        n_connections = environ.get('MDANALYSIS_DATA_CONNECTIONS',
+                                    DEFAULT_CONNECTIONS)
+    return max(int(n_connections), 1)
+
+
+def get_verify(verify=None):
+    """Return how cached files are checked before they are used.
+
+    The modes are
+
+    ``"exists"``
+        the file only has to exist (fastest, but a truncated or
+        corrupted file is not detected)
+    ``"stat"``
+        the SHA256 checksum is only computed if the size, modification
+        time or inode of the file changed since it was last verified
+        (or if it was never verified); otherwise the checksum recorded
+        in the :data:`MANIFEST` of the dataset directory is trusted
+    ``"full"``
+        the SHA256 checksum is always computed
+
+    Parameters
+    ----------
+    verify : str | None
+        Explicit mode. If ``None``, the value of the
+        :envvar:`MDANALYSIS_DATA_VERIFY` environment variable or
+        :data:`DEFAULT_VERIFY` is used.
+
+    Raises
+    ------
+    ValueError
+        if the mode is not one of :data:`VERIFY_MODES`
+
+    """
+    if verify is None:
+        verify = environ.get('MDANALYSIS_DATA_VERIFY', DEFAULT_VERIFY)
+    if verify not in VERIFY_MODES:
+        raise ValueError("verify must be one of {0}, not {1!r}".format(
+            ", ".join(VERIFY_MODES), verify))
+    return verify
+
+
+def _stat_signature(path):
+    """Return size, modification time (ns) and inode of `path`."""
+    st = os.stat(path)
+    return [st.st_size, st.st_mtime_ns, st.st_ino]
+
+
+def _read_manifest(dirname):
+    """Return the manifest of directory `dirname` (empty if missing)."""
+    try:
+        with open(join(dirname, MANIFEST)) as f:
+            return json.load(f)
+    except (IOError, ValueError):
+        return {}
+
+
+def _record_checksum(path, checksum):
+    """Record the verified `checksum` of `path` in the manifest."""
+    head, tail = os.path.split(path)
+    manifest_path = join(head, MANIFEST)
+    with _FileLock(_lock_path(manifest_path)):
+        manifest = _read_manifest(head)
+        manifest[tail] = {'sha256': checksum,
+                          'stat': _stat_signature(path)}
+        with open(manifest_path + '.tmp', 'w') as f:
+            json.dump(manifest, f, indent=1, sort_keys=True)
+        replace(manifest_path + '.tmp', manifest_path)
+
+
+def _verify(path, checksum, verify=None):
+    """Check that the existing file `path` has the SHA256 `checksum`.
+
+    Parameters
+    ----------
+    path : str
+        existing file
+    checksum : str
+        expected SHA256 checksum
+    verify : str | None
+        verification mode (see :func:`get_verify`)
+
+    Returns
+    -------
+    valid : bool
+        ``True`` if the file passed the check
+    """
+    verify = get_verify(verify)
+    if verify == 'exists':
+        return True
+    if verify == 'stat':
+        head, tail = os.path.split(path)
+        entry = _read_manifest(head).get(tail)
+        if (entry is not None and entry['sha256'] == checksum
+                and entry['stat'] == _stat_signature(path)):
+            return True
+    actual = _sha256(path)
+    if actual != checksum:
+        logger.warning("{} has an SHA256 checksum ({}) differing from "
+                       "expected ({})".format(path, actual, checksum))
+        return False
+    try:
+        _record_checksum(path, actual)
+    except OSError as err:
+        # e.g., a read-only layer of the data path
+        logger.debug("Cannot record checksum of {0}: {1}".format(path, err))
+    return True
 
 
-def _fetch_remote(remote, dirname=None):
+def _copy_from_bundles(file_path, checksum):
+    """Copy the file with `checksum` from an attached bundle to `file_path`.
+
+    See :func:`MDAnalysisData.bundle._copy_from_bundles`.
+    """
+    # imported here because the bundle module builds on this module
+    from . import bundle
+    return bundle._copy_from_bundles(file_path, checksum)
+
+
+def _fetch_remote(remote, dirname=None, n_connections=None, store=None,
+                  cancel=None):
     """Helper function to download a remote dataset into path
 
     Fetch a dataset pointed by remote's url, save into path using remote's
     filename and ensure its integrity based on the SHA256 Checksum of the
     downloaded file.
 
+    The data are first written to a partial file (the filename with
+    :data:`PARTIAL_SUFFIX` appended). If the download is interrupted, the
+    next call resumes from the end of the partial file with an HTTP
+    ``Range`` request (or starts from scratch if the server does not
+    support ranges). Only the complete file is checked against the
+    checksum and then renamed to its final name. The checksum is
+    computed on the data while they are downloaded so that the file
+    does not have to be read again.
+
+    Files of at least :data:`PARALLEL_MIN_SIZE` bytes are split into byte
+    ranges that are downloaded over `n_connections` concurrent
+    connections if the server supports ranges (see
+    :func:`_download_ranges`).
+
+    Concurrent calls for the same file from different threads or
+    processes are serialized with a lock file (see :class:`_FileLock`);
+    if the file has been replaced by another process while waiting for
+    the lock, it is used without downloading it again. Because the
+    verified file is renamed into place, other processes never see a
+    partially written file under its final name. The checksum of the
+    new file is recorded in the :data:`MANIFEST` of `dirname`.
+
+    If a `store` (see :func:`get_blob_store`) is given, a file with the
+    same checksum in the store is hardlinked instead of downloaded and a
+    downloaded file is added to the store.
+
+    The file is downloaded from the fastest of its URL, its mirrors and
+    the mirrors configured by the user (see :func:`get_mirrors`); other
+    sources are tried if a download fails (see :func:`_retrieve`).
+
+    Setting the `cancel` event stops the download within one chunk of
+    data: :exc:`_Cancelled` is raised, the locks are released and the
+    partial file is kept for resuming.
+
+    A file with the same checksum in an attached bundle (see
+    :func:`MDAnalysisData.bundle.attach_bundle`) is copied out of the
+    bundle instead of downloaded.
+
     Parameters
     -----------
     remote : RemoteFileMetadata
@@ -167,6 +758,13 @@ def _fetch_remote(remote, dirname=None):
         and checksum
     dirname : string
         Directory to save the file to.
+    n_connections : int | None
+        Maximum number of concurrent connections for a single file; the
+        default is taken from :func:`get_connections`.
+    store : str | None
+        content-addressed store of downloaded files
+    cancel : threading.Event | None
+        event that cancels the download when it is set
 
     Returns
     -------
@@ -176,19 +774,891 @@ def _fetch_remote(remote, dirname=None):
 
     file_path = (remote.filename if dirname is None
                  else join(dirname, remote.filename))
-    with TqdmUpTo(unit='B', unit_scale=True, miniters=1,
-                  desc=remote.filename) as t:
-        urlretrieve(remote.url, filename=file_path,
-                    reporthook=t.update_to, data=None)
-    checksum = _sha256(file_path)
+    before = _stat_signature(file_path) if exists(file_path) else None
+    with _FileLock(_lock_path(file_path)):
+        if exists(file_path) and _stat_signature(file_path) != before:
+            logger.info("{} was downloaded by another process".format(
+                file_path))
+            return file_path
+        if store is not None and _link_from_store(store, file_path,
+                                                  remote.checksum):
+            _record_checksum(file_path, remote.checksum)
+            return file_path
+        if not _copy_from_bundles(file_path, remote.checksum):
+            _retrieve(remote, file_path, n_connections=n_connections,
+                      cancel=cancel)
+        if store is not None:
+            _add_to_store(store, file_path, remote.checksum)
+    return file_path
+
+
+def get_mirrors(mirrors=None):
+    """Return the mirrors configured by the user.
+
+    A mirror is a URL template for any file of any dataset, e.g., of an
+    internal HTTP server or an object store gateway. The placeholders
+    ``{filename}`` and ``{checksum}`` (the SHA256) are replaced by the
+    values of the file; a template without placeholders is a directory
+    to which the filename is appended. Every file is verified with its
+    checksum, no matter where it was downloaded from.
+
+    Parameters
+    ----------
+    mirrors : str or list of str or None
+        URL templates, separated by whitespace or commas if given as a
+        string; ``None`` uses the environment variable
+        :envvar:`MDANALYSIS_DATA_MIRRORS`.
+
+    Returns
+    -------
+    mirrors : list of str
+
+    Example
+    -------
+    .. code-block:: bash
+
+       export MDANALYSIS_DATA_MIRRORS="http://data.example.org/MDAnalysisData https://s3.example.org/blobs/{checksum}"
+    """
+    if mirrors is None:
+        mirrors = environ.get('MDANALYSIS_DATA_MIRRORS', '')
+    if isinstance(mirrors, str):
+        mirrors = re.split(r'[\s,]+', mirrors)
+    return [mirror for mirror in mirrors if mirror]
+
+
+def _remote_urls(remote):
+    """Return all URLs of `remote`: user mirrors, url and its mirrors."""
+    urls = []
+    for mirror in get_mirrors():
+        if '{' not in mirror:
+            mirror = mirror.rstrip('/') + '/{filename}'
+        urls.append(mirror.format(filename=remote.filename,
+                                  checksum=remote.checksum))
+    urls.append(remote.url)
+    urls.extend(remote.mirrors)
+    return list(dict.fromkeys(urls))
+
+
+def _probe(url, timeout=PROBE_TIMEOUT):
+    """Return the time until the first byte of `url` arrives.
+
+    Returns ``None`` if the request fails.
+    """
+    start = time.perf_counter()
+    try:
+        with get_session().open(url, headers={'Range': 'bytes=0-0'},
+                                timeout=timeout, retries=0) as response:
+            response.read(1)
+    except (OSError, HTTPException) as err:
+        logger.debug("Probing {0} failed: {1}".format(url, err))
+        return None
+    return time.perf_counter() - start
+
+
+def _rank_urls(urls):
+    """Order `urls` by latency, fastest first.
+
+    All URLs are probed at the same time with a request for their first
+    byte (see :func:`_probe`). URLs whose probe failed are kept at the
+    end so that they are still tried if all others fail.
+    """
+    if len(urls) < 2:
+        return list(urls)
+    with ThreadPoolExecutor(max_workers=len(urls)) as pool:
+        latencies = list(pool.map(_probe, urls))
+    ranked = sorted(zip(urls, latencies),
+                    key=lambda item: (item[1] is None, item[1] or 0))
+    logger.debug("Sources ranked by latency: {}".format(ranked))
+    return [url for url, latency in ranked]
+
+
+def _retrieve(remote, file_path, n_connections=None, cancel=None):
+    """Download `remote` to `file_path` through a verified partial file.
+
+    The file is downloaded from the fastest of its sources (see
+    :func:`_remote_urls` and :func:`_rank_urls`); if a download fails or
+    the data have the wrong checksum, the next source is tried. A partial
+    file left by a failed source is resumed from the next one.
+
+    See :func:`_fetch_remote` (which holds the lock on `file_path` while
+    calling this function) for details.
+    """
+    urls = _rank_urls(_remote_urls(remote))
+    for url in urls:
+        _check_cancelled(cancel, url)
+        try:
+            _retrieve_from(remote, url, file_path,
+                           n_connections=n_connections, cancel=cancel)
+            return
+        except (OSError, HTTPException) as err:
+            if url == urls[-1]:
+                raise
+            logger.warning("Downloading {0} from {1} failed ({2}); "
+                           "trying another source".format(remote.filename,
+                                                          url, err))
+
+
+def _retrieve_from(remote, url, file_path, n_connections=None, cancel=None):
+    """Download `remote` from `url` (see :func:`_retrieve`)."""
+    part_path = file_path + PARTIAL_SUFFIX
+    n_connections = get_connections(n_connections)
+    response = None
+    if exists(part_path + _RANGES_SUFFIX):
+        # resume an interrupted parallel download
+        checksum = _download_ranges(url, part_path, getsize(part_path),
+                                    n_connections=n_connections,
+                                    desc=remote.filename, cancel=cancel)
+    else:
+        size = None
+        if n_connections > 1 and not exists(part_path):
+            # decide from the headers of the response if the file is
+            # large and the server supports ranges; otherwise the same
+            # response is used for a single-stream download
+            response = get_session().open(url)
+            size = _parallel_size(response)
+        if size is not None:
+            response.close()
+            checksum = _download_ranges(url, part_path, size,
+                                        n_connections=n_connections,
+                                        desc=remote.filename, cancel=cancel)
+        else:
+            checksum = _download(url, part_path, desc=remote.filename,
+                                 response=response, cancel=cancel)
     if remote.checksum != checksum:
+        # a corrupted partial file cannot be resumed
+        remove(part_path)
         raise IOError("{} has an SHA256 checksum ({}) "
                       "differing from expected ({}), "
                       "file may be corrupted.".format(file_path, checksum,
                                                       remote.checksum))
+    replace(part_path, file_path)
+    _record_checksum(file_path, checksum)
+
+
+def _parallel_size(response):
+    """Return the size of the remote file if it should be downloaded in parallel.
+
+    Parameters
+    ----------
+    response : MDAnalysisData.session._Response
+        response to a plain (non-range) request for the file
+
+    Returns
+    -------
+    size : int | None
+        size of the remote file in bytes if it is at least
+        :data:`PARALLEL_MIN_SIZE` and the server accepts byte ranges,
+        ``None`` otherwise
+    """
+    length = response.headers.get('Content-Length')
+    if (response.headers.get('Accept-Ranges', '').lower() != 'bytes'
+            or length is None or int(length) < PARALLEL_MIN_SIZE):
+        return None
+    return int(length)
+
+
+def _download(url, path, desc=None, response=None, cancel=None):
+    """Download `url` to `path`, resuming if `path` already exists.
+
+    If `path` exists, only the missing bytes are requested with a
+    ``Range`` header and appended. A server that ignores the range
+    (responds with 200 instead of 206) causes the whole file to be
+    downloaded again.
+
+    Parameters
+    ----------
+    url : str
+        URL of the remote file
+    path : str
+        local file to write to (typically a partial file)
+    desc : str
+        label for the progress bar
+    response : MDAnalysisData.session._Response
+        already opened response for the complete file (only used if
+        `path` does not exist)
+    cancel : threading.Event | None
+        event that stops the download (see :func:`_fetch_remote`)
+
+    Returns
+    -------
+    checksum : str
+        SHA256 of the complete file, computed while downloading (only
+        the already existing part of a resumed file is read from disk)
+    """
+    offset = getsize(path) if exists(path) else 0
+    if offset or response is None:
+        headers = {'Range': 'bytes={}-'.format(offset)} if offset else {}
+        try:
+            response = get_session().open(url, headers=headers)
+        except HTTPError as err:
+            if offset and err.code == 416:
+                # Range Not Satisfiable: nothing left to download; the
+                # checksum decides if the partial file is actually complete
+                return _sha256(path)
+            raise
+
+    with response:
+        if offset and _content_range_start(response) != offset:
+            offset = 0
+        sha256hash = hashlib.sha256()
+        if offset:
+            with open(path, 'rb') as f:
+                sha256hash = hashlib.file_digest(f, "sha256")
+        length = response.headers.get('Content-Length')
+        total = offset + int(length) if length is not None else None
+        received = offset
+        with open(path, 'ab' if offset else 'wb') as f, \
+             TqdmUpTo(unit='B', unit_scale=True, miniters=1, desc=desc,
+                      initial=offset, total=total) as t:
+            while True:
+                _check_cancelled(cancel, url)
+                buffer = response.read(_CHUNK_SIZE)
+                if not buffer:
+                    break
+                f.write(buffer)
+                sha256hash.update(buffer)
+                received += len(buffer)
+                t.update(len(buffer))
+    if total is not None and received != total:
+        # the partial file is kept so that the next attempt can resume
+        raise IOError("Download of {} interrupted after {} of {} bytes; "
+                      "run again to resume.".format(url, received, total))
+    return sha256hash.hexdigest()
+
+
+#: Suffix of the file next to a partial file that records the byte
+#: ranges that a parallel download has already completed.
+_RANGES_SUFFIX = '.ranges'
+
+
+def _download_ranges(url, path, size, n_connections=DEFAULT_CONNECTIONS,
+                     desc=None, cancel=None):
+    """Download `url` to `path` in byte ranges over several connections.
+
+    The file at `path` is preallocated to `size` bytes and split into
+    segments of :data:`_SEGMENT_SIZE` bytes, which are fetched with
+    ``Range`` requests by `n_connections` worker threads and written at
+    their offsets. Completed segments are recorded next to `path` so
+    that an interrupted download only fetches the missing segments when
+    it is restarted.
+
+    Because segments complete out of order, the checksum is computed in
+    the calling thread over the contiguous completed prefix of the file
+    while the remaining segments are still downloading; these reads are
+    normally served from the page cache.
+
+    Parameters
+    ----------
+    url : str
+        URL of the remote file; the server must support byte ranges
+    path : str
+        local file to write to (typically a partial file)
+    size : int
+        size of the remote file in bytes
+    n_connections : int
+        number of concurrent connections
+    desc : str
+        label for the progress bar
+    cancel : threading.Event | None
+        event that stops the download (see :func:`_fetch_remote`)
+
+    Returns
+    -------
+    checksum : str
+        SHA256 of the complete file
+    """
+    state_path = path + _RANGES_SUFFIX
+    done = set()
+    if exists(state_path) and exists(path) and getsize(path) == size:
+        with open(state_path) as f:
+            done = set(json.load(f))
+    else:
+        with open(path, 'wb') as f:
+            f.truncate(size)
+    segments = [(start, min(start + _SEGMENT_SIZE, size) - 1)
+                for start in range(0, size, _SEGMENT_SIZE)
+                if start not in done]
+    lock = threading.Lock()
+
+    def save_state():
+        with open(state_path + '.tmp', 'w') as f:
+            json.dump(sorted(done), f)
+        replace(state_path + '.tmp', state_path)
+
+    def fetch_segment(start, end, t):
+        headers = {'Range': 'bytes={}-{}'.format(start, end)}
+        with get_session().open(url, headers=headers) as response, \
+             open(path, 'r+b') as f:
+            if _content_range_start(response) != start:
+                raise IOError("Server did not honor the range request for "
+                              "bytes {}-{} of {}.".format(start, end, url))
+            f.seek(start)
+            position = start
+            while position <= end:
+                _check_cancelled(cancel, url)
+                buffer = response.read(min(_CHUNK_SIZE, end + 1 - position))
+                if not buffer:
+                    break
+                f.write(buffer)
+                position += len(buffer)
+                with lock:
+                    t.update(len(buffer))
+        if position != end + 1:
+            raise IOError("Download of bytes {}-{} of {} interrupted; "
+                          "run again to resume.".format(start, end, url))
+        with lock:
+            done.add(start)
+            save_state()
+
+    save_state()
+    completed = size - sum(end + 1 - start for start, end in segments)
+    with TqdmUpTo(unit='B', unit_scale=True, miniters=1, desc=desc,
+                  initial=completed, total=size) as t, \
+         ThreadPoolExecutor(max_workers=n_connections) as pool:
+        futures = [pool.submit(fetch_segment, start, end, t)
+                   for start, end in segments]
+        sha256hash = hashlib.sha256()
+        hashed = 0
+        try:
+            with open(path, 'rb') as f:
+                for future in as_completed(futures):
+                    future.result()
+                    while hashed < size:
+                        with lock:
+                            if hashed not in done:
+                                break
+                        length = min(_SEGMENT_SIZE, size - hashed)
+                        sha256hash.update(f.read(length))
+                        hashed += length
+        except BaseException:
+            for future in futures:
+                future.cancel()
+            raise
+    if hashed < size:
+        # all segments were already complete
+        with open(path, 'rb') as f:
+            sha256hash = hashlib.file_digest(f, "sha256")
+    remove(state_path)
+    return sha256hash.hexdigest()
+
+
+def _content_range_start(response):
+    """Return the first byte position of a partial (206) response.
+
+    Returns ``None`` if the response does not contain a byte range, i.e.,
+    the server sent the complete file.
+    """
+    if response.status != 206:
+        return None
+    match = re.match(r'bytes\s+(\d+)-', response.headers.get('Content-Range', ''))
+    return int(match.group(1)) if match else None
+
+
+def _extract_tar(archive_path, path, members=None):
+    """Unpack the tar archive `archive_path` into the directory `path`.
+
+    The members are first unpacked into a temporary directory inside
+    `path` and the top-level entries are then renamed into place
+    (replacing existing entries with the same name). Other processes
+    therefore never see a partially unpacked directory.
+
+    If only selected `members` are unpacked, the archive is read as a
+    stream that is abandoned as soon as all of them were found, and each
+    file is renamed into place on its own so that files unpacked earlier
+    are kept.
+
+    Parameters
+    ----------
+    archive_path : str
+        tar file (with any compression supported by :mod:`tarfile`)
+    path : str
+        directory to unpack into
+    members : list of str | None
+        names of the members to unpack; ``None`` unpacks all members
+
+    Returns
+    -------
+    names : list of str
+        names of all members of the archive if all were unpacked, else
+        `members`
+
+    Raises
+    ------
+    IOError
+        if some of the `members` are not contained in the archive
+    """
+    tmpdir = tempfile.mkdtemp(prefix='.unpack-', dir=path)
+    try:
+        if members is None:
+            with _open_tar(archive_path) as tar:
+                tar.extractall(path=tmpdir)
+                names = tar.getnames()
+            _move_into_place(tmpdir, path)
+            return names
+        wanted = set(members)
+        with _open_tar(archive_path) as tar:
+            for member in tar:
+                if member.name in wanted:
+                    tar.extract(member, path=tmpdir)
+                    wanted.discard(member.name)
+                    if not wanted:
+                        break
+        if wanted:
+            raise IOError("Archive {0} does not contain {1}".format(
+                archive_path, ", ".join(sorted(wanted))))
+        for root, dirs, files in os.walk(tmpdir):
+            for filename in files:
+                source = join(root, filename)
+                target = join(path, os.path.relpath(source, tmpdir))
+                makedirs(dirname(target), exist_ok=True)
+                replace(source, target)
+        return members
+    finally:
+        shutil.rmtree(tmpdir, ignore_errors=True)
+
+
+def _tar_members(archive_path, checksum):
+    """Return the names of all members of the tar archive `archive_path`.
+
+    Listing the members of a compressed archive requires decompressing
+    all of it. The names are therefore stored in a hidden index file next
+    to the archive (see :func:`_read_tar_members`), which remains valid
+    for the archive with the SHA256 `checksum` even if the archive itself
+    is removed.
+    """
+    names = _read_tar_members(archive_path, checksum)
+    if names is None:
+        logger.info("Indexing {}...".format(archive_path))
+        with _open_tar(archive_path) as tar:
+            names = [member.name for member in tar]
+        _write_tar_members(archive_path, checksum, names)
+    return names
+
+
+def _write_tar_members(archive_path, checksum, names):
+    """Store the member `names` of an archive in its index file."""
+    index_path = _members_path(archive_path)
+    with open(index_path + '.tmp', 'w') as f:
+        json.dump({'sha256': checksum, 'members': names}, f)
+    replace(index_path + '.tmp', index_path)
+
+
+def _read_tar_members(archive_path, checksum):
+    """Return the cached member names of an archive or ``None``."""
+    try:
+        with open(_members_path(archive_path)) as f:
+            index = json.load(f)
+    except (IOError, ValueError):
+        return None
+    return index['members'] if index.get('sha256') == checksum else None
+
+
+def _members_path(archive_path):
+    """Return the name of the index file of `archive_path`."""
+    head, tail = os.path.split(archive_path)
+    return join(head, '.' + tail + '.members.json')
+
+
+@contextmanager
+def _open_tar(archive_path, fileobj=None):
+    """Open a tar archive for reading as a stream.
+
+    The archive is decompressed with the backend that
+    :func:`~MDAnalysisData.decompress.open_decompressed` selects for the
+    suffix of `archive_path` (a multi-core implementation if one is
+    installed).
+
+    Parameters
+    ----------
+    archive_path : str
+        name of the archive
+    fileobj : file-like | None
+        read the archive from this (not seekable) stream instead of
+        from the file `archive_path`
+
+    Yields
+    ------
+    tar : tarfile.TarFile
+        archive opened in streaming mode (members can only be read in
+        order)
+    """
+    compression = get_compression(archive_path)
+    # let tarfile detect an unknown compression
+    mode = 'r|' if compression else 'r|*'
+    with ExitStack() as stack:
+        seekable = fileobj is None
+        if seekable:
+            fileobj = stack.enter_context(open(archive_path, 'rb'))
+        stream = stack.enter_context(
+            open_decompressed(fileobj, compression, seekable=seekable))
+        yield stack.enter_context(
+            tarfile.open(fileobj=stream, mode=mode, bufsize=_CHUNK_SIZE))
+
+
+def _move_into_place(tmpdir, path):
+    """Rename all entries of `tmpdir` into `path`, replacing existing ones."""
+    for entry in listdir(tmpdir):
+        target = join(path, entry)
+        if isdir(target):
+            shutil.rmtree(target)
+        elif exists(target):
+            remove(target)
+        replace(join(tmpdir, entry), target)
+
+
+def _fetch_remote_tar(remote, dirname, keep_archive=True, store=None):
+    """Download a remote tar archive and unpack it into `dirname`.
+
+    A new download is unpacked while it arrives: the response is read
+    once, hashed, decompressed and unpacked as a stream (see
+    :func:`_stream_tar`) so that the network transfer and the
+    decompression run at the same time. If `keep_archive` is ``True``,
+    the data are also written to the partial archive file, which is
+    renamed into place once the checksum is verified (and from which an
+    interrupted download is resumed and unpacked with
+    :func:`_extract_tar` on the next call). With ``keep_archive=False``
+    the archive never touches the disk.
+
+    Parameters
+    ----------
+    remote : RemoteFileMetadata
+        archive to download
+    dirname : str
+        directory to save the archive to and to unpack it into
+    keep_archive : bool
+        keep the verified archive in `dirname`
+    store : str | None
+        content-addressed store of downloaded files: an archive in the
+        store is linked and unpacked instead of downloaded and a kept
+        archive is added to the store (see :func:`_fetch_remote`); an
+        archive in an attached bundle is copied instead of downloaded
+
+    Returns
+    -------
+    file_path : str
+        full path of the archive (which only exists if `keep_archive`
+        is ``True``)
+
+    Raises
+    ------
+    IOError
+        if the checksum of the archive differs from the expected one;
+        nothing is unpacked in this case
+    """
+    file_path = join(dirname, remote.filename)
+    part_path = file_path + PARTIAL_SUFFIX
+    before = _stat_signature(file_path) if exists(file_path) else None
+    with _FileLock(_lock_path(file_path)):
+        if exists(file_path) and _stat_signature(file_path) != before:
+            logger.info("{} was downloaded by another process".format(
+                file_path))
+            names = _extract_tar(file_path, dirname)
+        elif store is not None and _link_from_store(store, file_path,
+                                                    remote.checksum):
+            _record_checksum(file_path, remote.checksum)
+            names = _extract_tar(file_path, dirname)
+        elif _copy_from_bundles(file_path, remote.checksum):
+            names = _extract_tar(file_path, dirname)
+        elif exists(part_path):
+            _retrieve(remote, file_path)
+            names = _extract_tar(file_path, dirname)
+        else:
+            names = _stream_tar_failover(
+                remote, dirname,
+                archive_path=part_path if keep_archive else None)
+            if keep_archive:
+                replace(part_path, file_path)
+                _record_checksum(file_path, remote.checksum)
+        # index for unpacking selected members (see _fetch_tar_members())
+        _write_tar_members(file_path, remote.checksum, names)
+        if store is not None and exists(file_path):
+            _add_to_store(store, file_path, remote.checksum)
     return file_path
 
 
+def _fetch_tar(remote, dirname, unpacked, download_if_missing=True,
+               verify=None, keep_archive=True, store=None, layers=()):
+    """Make sure that the contents of a remote tar archive are unpacked.
+
+    The archive is downloaded and unpacked into `dirname` (see
+    :func:`_fetch_remote_tar`) unless its contents are already unpacked
+    in one of the read-only `layers` or in `dirname`. With
+    `keep_archive`, a missing or invalid archive is downloaded again even
+    if the contents are unpacked. An archive that is present but not
+    unpacked (e.g., downloaded by :func:`~MDAnalysisData.batch.fetch_many`)
+    is unpacked. Only one process downloads and unpacks, the others wait
+    for it.
+
+    Parameters
+    ----------
+    remote : RemoteFileMetadata
+        archive to download
+    dirname : str
+        directory to save the archive to and to unpack it into
+    unpacked : callable
+        ``unpacked(location)`` returns ``True`` if all contents of the
+        archive exist in the directory `location`
+    download_if_missing : bool
+        If ``False``, raise a :exc:`IOError` if the data are not locally
+        available.
+    verify : str or None
+        how to check the cached archive (see :func:`get_verify`)
+    keep_archive : bool
+        keep the archive in `dirname` after unpacking
+    store : str | None
+        content-addressed store of downloaded files (see
+        :func:`_fetch_remote`)
+    layers : list of str
+        read-only directories that are searched first (see
+        :func:`get_data_path`)
+
+    Returns
+    -------
+    location : str
+        directory that holds the unpacked contents
+    """
+    for layer in layers:
+        if unpacked(layer):
+            return layer
+    file_path = join(dirname, remote.filename)
+    valid = exists(file_path) and _verify(file_path, remote.checksum,
+                                          verify=verify)
+    if (not unpacked(dirname)
+            or (not valid if keep_archive else exists(file_path))):
+        before = _stat_signature(file_path) if exists(file_path) else None
+        with _FileLock(_lock_path(dirname)):
+            # replaced (and unpacked) by another process while waiting?
+            replaced = (exists(file_path)
+                        and _stat_signature(file_path) != before)
+            if (not (valid or replaced)
+                    and (keep_archive or not unpacked(dirname))):
+                if not download_if_missing:
+                    raise IOError("Data {0}={1} not found or invalid and "
+                                  "`download_if_missing` is "
+                                  "False".format("tarfile", file_path))
+                logger.info("Downloading and unpacking {0}: {1} -> "
+                            "{2}...".format("tarfile", remote.url, dirname))
+                _fetch_remote_tar(remote, dirname, keep_archive=keep_archive,
+                                  store=store)
+            elif not unpacked(dirname):
+                logger.info("Unpacking {}...".format(file_path))
+                _write_tar_members(file_path, remote.checksum,
+                                   _extract_tar(file_path, dirname))
+            if not keep_archive and exists(file_path):
+                remove(file_path)
+    return dirname
+
+
+def _fetch_tar_members(remote, dirname, select, download_if_missing=True,
+                       verify=None, keep_archive=True, store=None,
+                       layers=()):
+    """Unpack only selected members of a remote tar archive into `dirname`.
+
+    The archive is downloaded into `dirname` (unless a valid copy exists)
+    and its member names are indexed once (see :func:`_tar_members`).
+    Only those selected members that are not yet present are then
+    unpacked with :func:`_extract_tar`. If all selected members already
+    exist (in `dirname` or in one of the read-only `layers` that holds an
+    index of the archive), neither the network nor the archive are
+    touched.
+
+    Parameters
+    ----------
+    remote : RemoteFileMetadata
+        archive to download
+    dirname : str
+        directory to save the archive to and to unpack it into
+    select : callable
+        ``select(names)`` returns the list of member names to unpack out
+        of the list `names` of all member names of the archive
+    download_if_missing : bool
+        If ``False``, raise a :exc:`IOError` if the archive is needed but
+        not locally available.
+    verify : str or None
+        how to check the cached archive (see :func:`get_verify`)
+    keep_archive : bool
+        keep the archive in `dirname` after unpacking
+    store : str | None
+        content-addressed store of downloaded files (see
+        :func:`_fetch_remote`)
+    layers : list of str
+        read-only directories that are searched first (see
+        :func:`get_data_path`)
+
+    Returns
+    -------
+    location : str
+        directory that holds the selected members
+    members : list of str
+        names of the selected members
+    """
+    file_path = join(dirname, remote.filename)
+
+    def valid():
+        return exists(file_path) and _verify(file_path, remote.checksum,
+                                             verify=verify)
+
+    def missing(members, location=dirname):
+        return [name for name in members if not exists(join(location, name))]
+
+    for layer in layers:
+        names = _read_tar_members(join(layer, remote.filename),
+                                  remote.checksum)
+        if names is not None and not missing(select(names), layer):
+            return layer, select(names)
+    names = _read_tar_members(file_path, remote.checksum)
+    if names is not None:
+        members = select(names)
+        if not missing(members) and (valid() if keep_archive
+                                     else not exists(file_path)):
+            return dirname, members
+    with _FileLock(_lock_path(dirname)):
+        if not valid():
+            if not download_if_missing:
+                raise IOError("Data {0}={1} not found or invalid and "
+                              "`download_if_missing` is False".format(
+                                  "tarfile", file_path))
+            logger.info("Downloading {0}: {1} -> {2}...".format(
+                "tarfile", remote.url, file_path))
+            _fetch_remote(remote, dirname=dirname, store=store)
+        members = select(_tar_members(file_path, remote.checksum))
+        todo = missing(members)
+        if todo:
+            logger.info("Unpacking {0} members of {1}...".format(
+                len(todo), file_path))
+            _extract_tar(file_path, dirname, members=todo)
+        if not keep_archive:
+            remove(file_path)
+    return dirname, members
+
+
+def _stream_tar_failover(remote, dirname, archive_path=None):
+    """Stream the remote tar archive from the fastest source that works.
+
+    The sources are tried in the order of :func:`_rank_urls` with
+    :func:`_stream_tar`, each one from the start.
+    """
+    urls = _rank_urls(_remote_urls(remote))
+    for url in urls:
+        try:
+            return _stream_tar(remote, dirname, archive_path=archive_path,
+                               url=url)
+        except Exception as err:
+            # truncated or corrupted data also raise the errors of the
+            # decompressor (e.g., EOFError)
+            if url == urls[-1]:
+                raise
+            logger.warning("Downloading {0} from {1} failed ({2}); "
+                           "trying another source".format(remote.filename,
+                                                          url, err))
+
+
+def _stream_tar(remote, dirname, archive_path=None, url=None):
+    """Unpack the remote tar archive into `dirname` while downloading it.
+
+    The archive is read with :func:`_open_tar` in streaming mode from a
+    reader that hashes all bytes and optionally also
+    writes them to `archive_path`. Members are unpacked into a
+    temporary directory as they arrive and only moved into place after
+    the checksum of the complete archive was verified.
+
+    Parameters
+    ----------
+    remote : RemoteFileMetadata
+        archive to download
+    dirname : str
+        directory to unpack into
+    archive_path : str | None
+        also save the archive to this file
+    url : str | None
+        download from this URL instead of ``remote.url``
+
+    Returns
+    -------
+    names : list of str
+        names of all members of the archive
+    """
+    url = remote.url if url is None else url
+    tmpdir = tempfile.mkdtemp(prefix='.unpack-', dir=dirname)
+    try:
+        with get_session().open(url) as response, \
+             TqdmUpTo(unit='B', unit_scale=True, miniters=1,
+                      desc=remote.filename) as t:
+            length = response.headers.get('Content-Length')
+            if length is not None:
+                t.total = int(length)
+            reader = _HashingReader(response, archive_path=archive_path,
+                                    progress=t)
+            try:
+                with _open_tar(remote.filename, fileobj=reader) as tar:
+                    tar.extractall(path=tmpdir)
+                    names = tar.getnames()
+                # include the padding after the end of the tar archive
+                reader.drain()
+            finally:
+                reader.close()
+        checksum = reader.hexdigest()
+        if length is not None and reader.size != int(length):
+            raise IOError("Download of {} interrupted after {} of {} "
+                          "bytes.".format(url, reader.size, length))
+        if remote.checksum != checksum:
+            if archive_path is not None:
+                # a corrupted partial file cannot be resumed
+                remove(archive_path)
+            raise IOError("{} has an SHA256 checksum ({}) "
+                          "differing from expected ({}), "
+                          "file may be corrupted.".format(
+                              join(dirname, remote.filename), checksum,
+                              remote.checksum))
+        _move_into_place(tmpdir, dirname)
+        return names
+    finally:
+        shutil.rmtree(tmpdir, ignore_errors=True)
+
+
+class _HashingReader(object):
+    """Read-only file-like wrapper that hashes (and saves) what is read.
+
+    Parameters
+    ----------
+    fileobj : file-like
+        stream to read from (e.g., an HTTP response)
+    archive_path : str | None
+        if given, all data are also written to this file
+    progress : tqdm | None
+        progress bar that is updated with the number of bytes read
+    """
+
+    def __init__(self, fileobj, archive_path=None, progress=None):
+        self._fileobj = fileobj
+        self._hash = hashlib.sha256()
+        self._copy = open(archive_path, 'wb') if archive_path else None
+        self._progress = progress
+        self.size = 0
+
+    def read(self, size=-1):
+        buffer = self._fileobj.read(size)
+        self._hash.update(buffer)
+        if self._copy is not None:
+            self._copy.write(buffer)
+        if self._progress is not None:
+            self._progress.update(len(buffer))
+        self.size += len(buffer)
+        return buffer
+
+    def drain(self):
+        """Read the rest of the stream."""
+        while self.read(_CHUNK_SIZE):
+            pass
+
+    def close(self):
+        if self._copy is not None:
+            self._copy.close()
+
+    def hexdigest(self):
+        return self._hash.hexdigest()
+
+
 def _read_description(filename, description_dir='descr'):
     """Read the description from restructured text file.
 
@@ -204,12 +1674,18 @@ def _read_description(filename, description_dir='descr'):
     the :mod:`MDAnalysisData.base` module file. All descriptions are
     assumed to be in restructured text format and in UTF-8 encoding.
 
+    Every description is only read once per process.
+
     """
-    # The descr directory should be in the same directory as this file base.py.
-    # `resource_string` returns bytes, which we need to decode to UTF-8
-    path = importlib.resources.files('MDAnalysisData') / description_dir / filename
-    DESCR = path.read_bytes().decode("utf-8")
-    return DESCR
+    # descriptions do not change while the package is installed
+    key = (description_dir, filename)
+    if key not in _descriptions:
+        # The descr directory should be in the same directory as this file
+        # base.py. `read_bytes` returns bytes, which we need to decode to UTF-8
+        path = (importlib.resources.files('MDAnalysisData') / description_dir
+                / filename)
+        _descriptions[key] = path.read_bytes().decode("utf-8")
+    return _descriptions[key]
 
 
 class TqdmUpTo(tqdm):
@@ -0,0 +1,190 @@
+# -*- coding: utf-8 -*-
+
+"""Fetch several datasets at once.
+
+The ``fetch_*`` functions download the files of a single dataset one
+after another. :func:`fetch_many` instead schedules all missing files of
+all requested datasets on one shared pool of workers and then assembles
+the datasets, so that fetching many (or all) datasets is limited by the
+network and not by waiting for one file at a time.
+"""
+
+from os.path import exists, join
+from os import makedirs
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, wait
+
+import logging
+
+from .base import get_blob_store, get_data_home, get_verify
+from .base import _fetch_remote, _use_lock, _verify
+from .base import _dataset_layers, _find_file
+from .registry import DATASETS as REGISTRY, fetcher
+from .registry import _unpacked
+
+#: Default number of files that :func:`fetch_many` downloads at the same
+#: time.
+DEFAULT_MAX_WORKERS = 4
+
+#: A dataset that can be fetched with :func:`fetch_many` is described by
+#: a :class:`DatasetMetadata`, which is a :func:`~collections.namedtuple`
+#: with fields
+#:
+#: - *fetch*: the ``fetch_*`` function of the dataset
+#: - *name*: name of the directory of the dataset under the data home
+#: - *archive*: dictionary of the
+#:   :class:`~MDAnalysisData.base.RemoteFileMetadata` for all files that
+#:   the dataset downloads
+#:
+DatasetMetadata = namedtuple('DatasetMetadata', ['fetch', 'name', 'archive'])
+
+#: All datasets, keyed by the name of their ``fetch_*`` function without
+#: the ``fetch_`` prefix (see :data:`MDAnalysisData.registry.DATASETS`).
+DATASETS = {
+    name: DatasetMetadata(fetcher(name), dataset.directory, dataset.files)
+    for name, dataset in REGISTRY.items()
+}
+
+logger = logging.getLogger(__name__)
+
+
+def fetch_many(names=None, data_home=None, download_if_missing=True,
+               verify=None, max_workers=None):
+    """Load several datasets, downloading their files concurrently
+
+    Parameters
+    ----------
+    names : list of str or None, default: None
+        Names of the datasets, i.e., the names of the ``fetch_*``
+        functions without the ``fetch_`` prefix such as
+        ``"adk_equilibrium"`` or ``"yiip_equilibrium_long"`` (see
+        :data:`DATASETS`). ``None`` fetches all datasets.
+    data_home : optional, default: None
+        Specify another download and cache folder for the datasets. By default
+        all MDAnalysisData data is stored in '~/MDAnalysis_data' subfolders.
+    download_if_missing : optional, default=True
+        If ``False``, raise a :exc:`IOError` if the data is not locally available
+        instead of trying to download the data from the source site.
+    verify : optional, default: None
+        How to check cached files: ``"exists"``, ``"stat"`` or ``"full"``
+        (see :func:`~MDAnalysisData.base.get_verify`). Files that fail the
+        check are downloaded again. Files are checked concurrently.
+    max_workers : int or None, default: None
+        Maximum number of files that are downloaded (and datasets that are
+        unpacked) at the same time; ``None`` uses
+        :data:`DEFAULT_MAX_WORKERS`.
+
+    Returns
+    -------
+    datasets : dict
+        The :class:`~MDAnalysisData.base.Bunch` of each dataset (as
+        returned by its ``fetch_*`` function), keyed by the name of the
+        dataset.
+
+    Raises
+    ------
+    ValueError
+        if a dataset name is not known
+
+    Note
+    ----
+    Files that are shared between datasets (such as the topology of the
+    short and long YiiP trajectories) are only checked and downloaded
+    once.
+    """
+    if names is None:
+        names = list(DATASETS)
+    unknown = [name for name in names if name not in DATASETS]
+    if unknown:
+        raise ValueError("Unknown datasets {0}; choose from {1}".format(
+            ", ".join(unknown), ", ".join(DATASETS)))
+    if max_workers is None:
+        max_workers = DEFAULT_MAX_WORKERS
+    home = get_data_home(data_home=data_home)
+    verify = get_verify(verify)
+    store = get_blob_store(data_home)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as downloads, \
+         ThreadPoolExecutor(max_workers=max_workers) as assembly:
+        # one download per missing file, shared by all datasets that need it
+        scheduled = {}
+        results = {}
+        for name in names:
+            dataset = DATASETS[name]
+            data_location = join(home, dataset.name)
+            if not exists(data_location):
+                makedirs(data_location)
+            layers = _dataset_layers(dataset.name, data_home=data_home)
+            files, options = _missing(name, data_location, layers)
+            pending = []
+            if download_if_missing:
+                for meta in files.values():
+                    local_path = join(data_location, meta.filename)
+                    if local_path not in scheduled:
+                        scheduled[local_path] = downloads.submit(
+                            _ensure, meta, data_location, verify=verify,
+                            store=store, layers=layers)
+                    pending.append(scheduled[local_path])
+            # files were just verified (and recorded in the manifest)
+            results[name] = assembly.submit(
+                _assemble, dataset, pending, data_home=data_home,
+                download_if_missing=download_if_missing,
+                verify='exists' if verify == 'exists' else 'stat', **options)
+        return {name: future.result() for name, future in results.items()}
+
+
+def _missing(name, data_location, layers=()):
+    """Return the files that dataset `name` may have to download.
+
+    The archive of a dataset is not downloaded again if it was removed
+    after its contents were unpacked in `data_location` or one of the
+    read-only `layers`.
+
+    Returns
+    -------
+    files : dict
+        :class:`~MDAnalysisData.base.RemoteFileMetadata` of the files
+    options : dict
+        arguments for the ``fetch_*`` function of the dataset
+    """
+    dataset = REGISTRY[name]
+    if (dataset.contents is None
+            or exists(join(data_location, dataset.files['tarfile'].filename))
+            or not any(_unpacked(dataset, location)
+                       for location in list(layers) + [data_location])):
+        # a kept archive is checked as usual
+        return dataset.files, {}
+    # use the unpacked contents without downloading the archive again
+    return {}, {'keep_archive': False}
+
+
+def _ensure(meta, data_location, verify=None, store=None, layers=(),
+            cancel=None):
+    """Download `meta` into `data_location` unless a valid copy exists.
+
+    Copies in the read-only `layers` of the data path are used first.
+    Setting the `cancel` event stops the download (see
+    :func:`~MDAnalysisData.base._fetch_remote`).
+    """
+    shared_path = _find_file(meta, layers, verify=verify)
+    if shared_path is not None:
+        return shared_path
+    local_path = join(data_location, meta.filename)
+    if exists(local_path) and _verify(local_path, meta.checksum,
+                                      verify=verify):
+        return local_path
+    # keep other processes from evicting the dataset during the download
+    with _use_lock(data_location):
+        makedirs(data_location, exist_ok=True)
+        logger.info("Downloading {0} -> {1}...".format(meta.url, local_path))
+        return _fetch_remote(meta, dirname=data_location, store=store,
+                             cancel=cancel)
+
+
+def _assemble(dataset, pending, **kwargs):
+    """Call the ``fetch_*`` function of `dataset` once `pending` are done."""
+    wait(pending)
+    for future in pending:
+        # re-raise download errors instead of trying again
+        future.result()
+    return dataset.fetch(**kwargs)
@@ -0,0 +1,425 @@
+# -*- coding: utf-8 -*-
+
+"""Offline bundles of datasets.
+
+A bundle packs datasets from a data home into a single file, e.g., to
+set up compute nodes without internet access with one bulk copy instead
+of thousands of small files. A bundle is an uncompressed tar file whose
+first member :data:`INDEX` lists the datasets and the SHA256 checksum
+and size of every file; the files themselves are optionally compressed
+one by one with zstd (requires the :mod:`zstandard` package) so that
+each can still be read on its own.
+
+A bundle can be
+
+- unpacked into a data home with :func:`import_bundle`, or
+- attached with :func:`attach_bundle` (or the environment variable
+  :envvar:`MDANALYSIS_DATA_BUNDLES`), in which case the ``fetch_*``
+  functions copy missing files out of the bundle (found by their
+  checksum) instead of downloading them.
+
+Bundles are also created and imported from the command line::
+
+  python -m MDAnalysisData.bundle export datasets.bundle adk_equilibrium
+  python -m MDAnalysisData.bundle import datasets.bundle
+"""
+
+from os.path import (commonpath, dirname, exists, getmtime, getsize, isabs,
+                     isdir, join, realpath, splitdrive)
+from os import environ, makedirs, remove, replace
+import argparse
+import hashlib
+import io
+import json
+import os
+import tarfile
+import tempfile
+import threading
+
+import logging
+
+from .base import get_blob_store, get_data_home
+from .base import (MANIFEST, PARTIAL_SUFFIX, _add_to_store, _read_manifest,
+                   _record_checksum, _sha256, _stat_signature)
+from .cache import ACCESS_STAMP, PIN, list_datasets, _record_access
+from .variants import VARIANTS_DIRECTORY
+
+logger = logging.getLogger(__name__)
+
+#: Name of the index member of a bundle.
+INDEX = 'MDAnalysisData-bundle.json'
+
+#: Version of the bundle format.
+BUNDLE_VERSION = 1
+
+#: Bundles attached with :func:`attach_bundle`.
+_attached = []
+
+#: Cache of the indices of bundles, keyed by path.
+_indices = {}
+_indices_lock = threading.Lock()
+
+_CHUNK_SIZE = 2**20
+
+# files in dataset directories that are not exported; frame offsets are
+# only valid for the trajectory file they were made for (its ctime)
+_EXCLUDE = (ACCESS_STAMP, PIN, MANIFEST)
+_EXCLUDE_SUFFIXES = ('.lock', PARTIAL_SUFFIX, '.ranges', '.tmp', '.link',
+                     '_offsets.npz', '.dcd.npy')
+_EXCLUDE_DIRECTORIES = ('.chunks', '.chunks.tmp')
+
+
+def _zstandard():
+    try:
+        import zstandard
+    except ImportError:
+        raise ImportError("zstd compressed bundles require the zstandard "
+                          "package (pip install zstandard)")
+    return zstandard
+
+
+def _checksum(path):
+    """Return the SHA256 checksum of `path`, from the manifest if possible."""
+    head, tail = os.path.split(path)
+    entry = _read_manifest(head).get(tail)
+    if entry is not None and entry['stat'] == _stat_signature(path):
+        return entry['sha256']
+    return _sha256(path)
+
+
+def _dataset_files(data_home, name):
+    """Return the files of the dataset `name` as ``(member, path)`` pairs."""
+    location = join(data_home, name)
+    if not isdir(location):
+        raise ValueError("Dataset {0} not found in {1}".format(name,
+                                                               data_home))
+    files = []
+    for root, dirs, filenames in os.walk(location):
+        # derived coordinate stores and variants are not part of the dataset
+        dirs[:] = [d for d in dirs if not d.startswith('.unpack-')
+                   and not d.endswith(_EXCLUDE_DIRECTORIES)
+                   and not (root == location and d == VARIANTS_DIRECTORY)]
+        for filename in filenames:
+            if filename in _EXCLUDE or filename.endswith(_EXCLUDE_SUFFIXES):
+                continue
+            path = join(root, filename)
+            member = os.path.relpath(path, data_home).replace(os.sep, '/')
+            files.append((member, path))
+    return sorted(files)
+
+
+def export_bundle(path, names=None, data_home=None, compress=False):
+    """Pack datasets from the data home into the bundle file `path`.
+
+    Parameters
+    ----------
+    path : str
+        name of the bundle file
+    names : list of str or None
+        names of the dataset directories (see
+        :func:`~MDAnalysisData.cache.list_datasets`); ``None`` packs all
+        datasets in the data home
+    data_home : str | None
+        The path to MDAnalysisData data dir.
+    compress : bool
+        compress each file with zstd
+
+    Returns
+    -------
+    index : dict
+        the index of the bundle
+    """
+    data_home = get_data_home(data_home)
+    if names is None:
+        names = [dataset.name for dataset in list_datasets(data_home)]
+    if compress:
+        compressor = _zstandard().ZstdCompressor()
+    files = [item for name in names for item in _dataset_files(data_home,
+                                                                name)]
+    index = {
+        'version': BUNDLE_VERSION,
+        'compression': 'zstd' if compress else None,
+        'datasets': list(names),
+        'files': {member: {'sha256': _checksum(source),
+                           'size': getsize(source)}
+                  for member, source in files},
+    }
+    part_path = path + PARTIAL_SUFFIX
+    with tarfile.open(part_path, 'w', format=tarfile.PAX_FORMAT) as tar:
+        data = json.dumps(index, indent=1, sort_keys=True).encode()
+        info = tarfile.TarInfo(INDEX)
+        info.size = len(data)
+        tar.addfile(info, io.BytesIO(data))
+        for member, source in files:
+            logger.info("Adding {}".format(member))
+            info = tar.gettarinfo(source, arcname=member)
+            # files that are hardlinks of each other (e.g. through the
+            # store) are added as regular files, see _member_target()
+            info.type = tarfile.REGTYPE
+            info.linkname = ''
+            if not compress:
+                info.size = getsize(source)
+                with open(source, 'rb') as f:
+                    tar.addfile(info, f)
+                continue
+            with tempfile.TemporaryFile(dir=dirname(part_path) or '.') as tmp:
+                with open(source, 'rb') as f:
+                    compressor.copy_stream(f, tmp)
+                info.size = tmp.tell()
+                tmp.seek(0)
+                tar.addfile(info, tmp)
+    replace(part_path, path)
+    return index
+
+
+def read_index(path):
+    """Return the index of the bundle `path`.
+
+    Raises
+    ------
+    IOError
+        if `path` is not a bundle
+    """
+    with tarfile.open(path, 'r:') as tar:
+        member = tar.next()
+        if member is None or member.name != INDEX:
+            raise IOError("{} is not an MDAnalysisData bundle".format(path))
+        index = json.load(tar.extractfile(member))
+    if index.get('version') != BUNDLE_VERSION:
+        raise IOError("Bundle {0} has unsupported version {1}".format(
+            path, index.get('version')))
+    return index
+
+
+def _open_member(tar, member, compression):
+    """Return a file object with the (decompressed) data of `member`."""
+    stream = tar.extractfile(member)
+    if compression == 'zstd':
+        stream = _zstandard().ZstdDecompressor().stream_reader(stream)
+    return stream
+
+
+def _copy_verified(stream, target, checksum):
+    """Copy `stream` to `target` if the data have the SHA256 `checksum`.
+
+    Returns
+    -------
+    copied : bool
+    """
+    # not PARTIAL_SUFFIX, which may hold an interrupted download
+    part_path = target + '.tmp'
+    sha = hashlib.sha256()
+    with open(part_path, 'wb') as f:
+        while True:
+            buffer = stream.read(_CHUNK_SIZE)
+            if not buffer:
+                break
+            sha.update(buffer)
+            f.write(buffer)
+    if sha.hexdigest() != checksum:
+        logger.warning("{0} has an SHA256 checksum ({1}) differing from "
+                       "expected ({2})".format(target, sha.hexdigest(),
+                                               checksum))
+        remove(part_path)
+        return False
+    replace(part_path, target)
+    _record_checksum(target, checksum)
+    return True
+
+
+def import_bundle(path, names=None, data_home=None):
+    """Unpack the datasets in the bundle `path` into the data home.
+
+    Every file is verified against the checksum in the index of the
+    bundle and added to the store of downloaded files (see
+    :func:`~MDAnalysisData.base.get_blob_store`).
+
+    Parameters
+    ----------
+    path : str
+        name of the bundle file
+    names : list of str or None
+        names of the datasets to unpack; ``None`` unpacks all datasets in
+        the bundle
+    data_home : str | None
+        The path to MDAnalysisData data dir.
+
+    Returns
+    -------
+    names : list of str
+        names of the unpacked datasets
+
+    Raises
+    ------
+    IOError
+        if a file in the bundle is corrupted
+    ValueError
+        if a dataset is not in the bundle
+    """
+    index = read_index(path)
+    if names is None:
+        names = index['datasets']
+    unknown = [name for name in names if name not in index['datasets']]
+    if unknown:
+        raise ValueError("Datasets {0} are not in bundle {1}".format(
+            ", ".join(unknown), path))
+    data_home = get_data_home(data_home)
+    store = get_blob_store(data_home)
+    with tarfile.open(path, 'r:') as tar:
+        for member in tar:
+            entry = index['files'].get(member.name)
+            if entry is None or member.name.split('/')[0] not in names:
+                continue
+            target = _member_target(data_home, member, path)
+            makedirs(dirname(target), exist_ok=True)
+            logger.info("Unpacking {}".format(target))
+            with _open_member(tar, member, index['compression']) as stream:
+                if not _copy_verified(stream, target, entry['sha256']):
+                    raise IOError("{0} in bundle {1} is corrupted".format(
+                        member.name, path))
+            if store is not None:
+                _add_to_store(store, target, entry['sha256'])
+    for name in names:
+        # the recorded sizes of the datasets are out of date
+        _record_access(join(data_home, name), written=True)
+    return list(names)
+
+
+def _member_target(data_home, member, path):
+    """Return the file in `data_home` that `member` is unpacked to.
+
+    Raises
+    ------
+    IOError
+        if `member` is not a regular file or its name is absolute or
+        contains empty, ``.`` or ``..`` components, so that it could be
+        unpacked outside of the data home
+    """
+    parts = member.name.split('/')
+    if (not member.isreg() or len(parts) < 2 or isabs(member.name)
+            or any(part in ('', '.', '..') or os.sep in part
+                   or (os.altsep and os.altsep in part) or splitdrive(part)[0]
+                   for part in parts)):
+        raise IOError("{0} in bundle {1} is not a file of a dataset".format(
+            member.name, path))
+    target = join(data_home, *parts)
+    root = realpath(data_home)
+    if commonpath([root, realpath(target)]) != root:
+        raise IOError("{0} in bundle {1} is outside of the data home".format(
+            member.name, path))
+    return target
+
+
+def attach_bundle(path):
+    """Use the bundle `path` as a source of files for the ``fetch_*`` functions.
+
+    Files that are missing in the data home are copied from an attached
+    bundle instead of downloaded if the bundle contains a file with the
+    same checksum.
+
+    Parameters
+    ----------
+    path : str
+        name of the bundle file
+    """
+    path = os.path.abspath(path)
+    _bundle_index(path)
+    if path not in _attached:
+        _attached.append(path)
+
+
+def detach_bundle(path):
+    """Stop using the bundle `path` (see :func:`attach_bundle`)."""
+    path = os.path.abspath(path)
+    if path in _attached:
+        _attached.remove(path)
+
+
+def get_bundles():
+    """Return the attached bundles.
+
+    These are the bundles in the environment variable
+    :envvar:`MDANALYSIS_DATA_BUNDLES` (separated by :data:`os.pathsep`)
+    followed by the bundles attached with :func:`attach_bundle`.
+    """
+    bundles = [os.path.abspath(os.path.expanduser(path)) for path in
+               environ.get('MDANALYSIS_DATA_BUNDLES', '').split(os.pathsep)
+               if path]
+    return bundles + [path for path in _attached if path not in bundles]
+
+
+def _bundle_index(path):
+    """Return the index of `path` by checksum: ``{sha256: (TarInfo, compression)}``."""
+    key = (path, getmtime(path))
+    with _indices_lock:
+        if key not in _indices:
+            index = read_index(path)
+            by_checksum = {}
+            with tarfile.open(path, 'r:') as tar:
+                for member in tar:
+                    entry = index['files'].get(member.name)
+                    if entry is not None:
+                        by_checksum[entry['sha256']] = member
+            _indices[key] = (by_checksum, index['compression'])
+        return _indices[key]
+
+
+def _copy_from_bundles(file_path, checksum):
+    """Copy the file with `checksum` from an attached bundle to `file_path`.
+
+    Returns
+    -------
+    copied : bool
+        ``True`` if `file_path` was copied from a bundle
+    """
+    for path in get_bundles():
+        if not exists(path):
+            logger.warning("Attached bundle {} does not exist".format(path))
+            continue
+        by_checksum, compression = _bundle_index(path)
+        member = by_checksum.get(checksum)
+        if member is None:
+            continue
+        with open(path, 'rb') as f:
+            # reuses the member found when the bundle was indexed
+            tar = tarfile.TarFile(fileobj=f, mode='r')
+            with _open_member(tar, member, compression) as stream:
+                if _copy_verified(stream, file_path, checksum):
+                    logger.info("{0} copied from bundle {1}".format(
+                        file_path, path))
+                    return True
+    return False
+
+
+def main(args=None):
+    """Create or import bundles from the command line."""
+    parser = argparse.ArgumentParser(
+        prog="python -m MDAnalysisData.bundle",
+        description="Pack MDAnalysisData datasets into a single bundle file "
+        "or unpack a bundle into the data directory.")
+    parser.add_argument("--data-home", default=None,
+                        help="data directory (default: see get_data_home())")
+    commands = parser.add_subparsers(dest="command", required=True)
+    export = commands.add_parser("export", help="create a bundle")
+    export.add_argument("bundle", help="bundle file")
+    export.add_argument("datasets", nargs="*",
+                        help="dataset directories (default: all)")
+    export.add_argument("--zstd", action="store_true",
+                        help="compress the files with zstd")
+    unpack = commands.add_parser("import", help="unpack a bundle")
+    unpack.add_argument("bundle", help="bundle file")
+    unpack.add_argument("datasets", nargs="*",
+                        help="datasets to unpack (default: all)")
+    args = parser.parse_args(args)
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    if args.command == "export":
+        export_bundle(args.bundle, names=args.datasets or None,
+                      data_home=args.data_home, compress=args.zstd)
+    else:
+        import_bundle(args.bundle, names=args.datasets or None,
+                      data_home=args.data_home)
+
+
+if __name__ == "__main__":
+    main()
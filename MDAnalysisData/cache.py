@@ -0,0 +1,299 @@
+# -*- coding: utf-8 -*-
+
+"""Limit the size of the data home by evicting unused datasets.
+
+Every ``fetch_*`` function records when its dataset was last used in a
+hidden stamp file in the directory of the dataset. The stamp also holds
+the size of the dataset, so that only datasets whose files were written
+since their size was last determined have to be walked. If a maximum size for
+the data home is set (with the environment variable
+:envvar:`MDANALYSIS_DATA_MAX_SIZE` or with :func:`evict_datasets`), the
+least recently used datasets are removed until the data home fits. Pinned
+datasets (see :func:`pin_dataset`) and datasets that are being fetched
+by another process are never evicted.
+"""
+
+from os.path import basename, dirname, exists, getmtime, isdir, join
+from os import environ, listdir
+from collections import namedtuple
+from contextlib import ExitStack
+import os
+import re
+import shutil
+
+import logging
+
+from .base import get_blob_store, get_data_home
+from .base import _FileLock, _lock_path, _prune_store, _use_lock
+from .base import _read_manifest, _unlink_from_store
+
+logger = logging.getLogger(__name__)
+
+#: Name of the file in a dataset directory whose modification time is the
+#: last time the dataset was used. It contains the size of the dataset in
+#: bytes or nothing if the size is not known.
+ACCESS_STAMP = '.last_access'
+
+#: Name of the file that marks a dataset directory as pinned.
+PIN = '.pinned'
+
+#: A dataset in the data home as listed by :func:`list_datasets` is a
+#: :func:`~collections.namedtuple` with fields
+#:
+#: - *name*: name of the dataset directory
+#: - *size*: size of all files in bytes
+#: - *last_access*: time of the last use (seconds since the epoch)
+#: - *pinned*: ``True`` if the dataset is never evicted
+#:
+CachedDataset = namedtuple('CachedDataset',
+                           ['name', 'size', 'last_access', 'pinned'])
+
+_UNITS = {'': 1, 'K': 2**10, 'M': 2**20, 'G': 2**30, 'T': 2**40}
+
+
+def get_max_size(max_size=None):
+    """Return the maximum size of the data home in bytes.
+
+    Parameters
+    ----------
+    max_size : int or str or None
+        Size in bytes or a string with a unit such as ``"500M"``, ``"20G"``
+        or ``"1.5T"`` (powers of 1024). ``None`` uses the environment
+        variable :envvar:`MDANALYSIS_DATA_MAX_SIZE`.
+
+    Returns
+    -------
+    max_size : int or None
+        ``None`` if the size is not limited
+
+    Raises
+    ------
+    ValueError
+        if `max_size` cannot be understood
+    """
+    if max_size is None:
+        max_size = environ.get('MDANALYSIS_DATA_MAX_SIZE')
+        if not max_size:
+            return None
+    if isinstance(max_size, str):
+        match = re.match(r'\s*(\d+(?:\.\d*)?)\s*([KMGT]?)I?B?\s*$',
+                         max_size.upper())
+        if match is None:
+            raise ValueError("max_size must be a size such as 500M or 20G, "
+                             "not {}".format(max_size))
+        return int(float(match.group(1)) * _UNITS[match.group(2)])
+    return int(max_size)
+
+
+def _record_access(data_location, written=False):
+    """Mark the dataset in `data_location` as used now.
+
+    If files of the dataset were `written`, its recorded size is
+    discarded (see :func:`_dataset_size`). Nothing is recorded if
+    `data_location` is not writable.
+    """
+    stamp = join(data_location, ACCESS_STAMP)
+    try:
+        with open(stamp, 'w' if written else 'a'):
+            pass
+        os.utime(stamp)
+    except OSError as err:
+        logger.debug("Cannot record access to {0}: {1}".format(
+            data_location, err))
+
+
+def _size(path):
+    """Return the size of all files under `path` in bytes.
+
+    Files with several hardlinks are only counted once and symbolic links
+    are not followed. The :data:`ACCESS_STAMP`, which records the size, is
+    not counted.
+    """
+    seen = set()
+    size = 0
+    for root, dirs, files in os.walk(path):
+        for filename in files:
+            if filename == ACCESS_STAMP:
+                continue
+            try:
+                stat = os.lstat(join(root, filename))
+            except FileNotFoundError:
+                continue
+            if (stat.st_dev, stat.st_ino) not in seen:
+                seen.add((stat.st_dev, stat.st_ino))
+                size += stat.st_size
+    return size
+
+
+def _dataset_size(path):
+    """Return the size of the dataset in `path` in bytes.
+
+    The size is read from the :data:`ACCESS_STAMP` of the dataset. If it
+    is not recorded there, the dataset is walked (see :func:`_size`) and
+    the size is recorded without changing the time of the last access.
+    """
+    stamp = join(path, ACCESS_STAMP)
+    try:
+        with open(stamp) as f:
+            return int(f.read())
+    except (OSError, ValueError):
+        pass
+    try:
+        before = os.stat(stamp)
+    except OSError:
+        # no stamp to record the size in
+        return _size(path)
+    size = _size(path)
+    try:
+        if os.stat(stamp).st_mtime_ns == before.st_mtime_ns:
+            # not used in the meantime; the stamp is rewritten in place so
+            # that the directory of the dataset does not change
+            with open(stamp, 'w') as f:
+                f.write(str(size))
+            os.utime(stamp, ns=(before.st_atime_ns, before.st_mtime_ns))
+    except OSError as err:
+        logger.debug("Cannot record the size of {0}: {1}".format(path, err))
+    return size
+
+
+def _last_access(path):
+    stamp = join(path, ACCESS_STAMP)
+    return getmtime(stamp) if exists(stamp) else getmtime(path)
+
+
+def list_datasets(data_home=None):
+    """List the datasets in the data home, least recently used first.
+
+    Parameters
+    ----------
+    data_home : str | None
+        The path to MDAnalysisData data dir.
+
+    Returns
+    -------
+    datasets : list of CachedDataset
+    """
+    data_home = get_data_home(data_home)
+    datasets = []
+    for name in listdir(data_home):
+        path = join(data_home, name)
+        if name.startswith('.') or not isdir(path):
+            continue
+        datasets.append(CachedDataset(name, _dataset_size(path),
+                                      _last_access(path),
+                                      exists(join(path, PIN))))
+    return sorted(datasets, key=lambda dataset: dataset.last_access)
+
+
+def pin_dataset(name, data_home=None):
+    """Never evict the dataset directory `name` from the data home.
+
+    Parameters
+    ----------
+    name : str
+        name of the dataset directory, e.g., ``"adk_transitions_DIMS"``
+    data_home : str | None
+        The path to MDAnalysisData data dir.
+    """
+    path = join(get_data_home(data_home), name)
+    os.makedirs(path, exist_ok=True)
+    with open(join(path, PIN), 'a'):
+        pass
+
+
+def unpin_dataset(name, data_home=None):
+    """Allow the dataset directory `name` to be evicted again.
+
+    Parameters
+    ----------
+    name : str
+        name of the dataset directory
+    data_home : str | None
+        The path to MDAnalysisData data dir.
+    """
+    pin = join(get_data_home(data_home), name, PIN)
+    if exists(pin):
+        os.remove(pin)
+
+
+def evict_datasets(max_size=None, data_home=None, keep=()):
+    """Remove least recently used datasets until the data home fits.
+
+    Datasets that are pinned, listed in `keep` or that are currently
+    downloaded or unpacked by another process are not removed. Files in
+    the store of downloaded files (see
+    :func:`~MDAnalysisData.base.get_blob_store`) that are no longer used
+    by any dataset are removed, too.
+
+    Parameters
+    ----------
+    max_size : int or str or None
+        Maximum size of the data home (see :func:`get_max_size`); nothing
+        is removed if no maximum size is set.
+    data_home : str | None
+        The path to MDAnalysisData data dir.
+    keep : list of str
+        names of datasets that must not be removed
+
+    Returns
+    -------
+    evicted : list of str
+        names of the removed datasets
+    """
+    max_size = get_max_size(max_size)
+    if max_size is None:
+        return []
+    data_home = get_data_home(data_home)
+    store = get_blob_store(data_home)
+    datasets = list_datasets(data_home)
+    total = sum(dataset.size for dataset in datasets)
+    evicted = []
+    for dataset in datasets:
+        if total <= max_size:
+            break
+        if dataset.pinned or dataset.name in keep:
+            continue
+        path = join(data_home, dataset.name)
+        with ExitStack() as stack:
+            # unpacked or used by a fetch in another process or thread
+            locks = [_FileLock(_lock_path(path)),
+                     _use_lock(path, shared=False)]
+            if not all(_acquire(stack, lock) for lock in locks):
+                continue
+            if _last_access(path) != dataset.last_access:
+                # used since it was listed
+                continue
+            logger.info("Evicting {0} ({1} bytes) from {2}".format(
+                dataset.name, dataset.size, data_home))
+            if store is not None:
+                # keep the frame offsets of links in other data homes valid
+                for filename, entry in _read_manifest(path).items():
+                    _unlink_from_store(store, join(path, filename),
+                                       entry['sha256'])
+            shutil.rmtree(path)
+            if store is not None and exists(store):
+                _prune_store(store)
+        total -= dataset.size
+        evicted.append(dataset.name)
+    if total > max_size:
+        logger.warning("Data home {0} uses {1} bytes, more than the maximum "
+                       "of {2} bytes".format(data_home, total, max_size))
+    return evicted
+
+
+def _acquire(stack, lock):
+    """Acquire `lock` without blocking and release it with `stack`."""
+    if not lock.acquire(blocking=False):
+        return False
+    stack.callback(lock.release)
+    return True
+
+
+def _evict(data_location):
+    """Enforce the maximum size of the data home of `data_location`.
+
+    The dataset in `data_location` itself is kept.
+    """
+    if get_max_size() is not None:
+        evict_datasets(data_home=dirname(data_location),
+                       keep=[basename(data_location)])
@@ -0,0 +1,456 @@
+# -*- coding: utf-8 -*-
+
+"""Chunked and compressed coordinate stores.
+
+Reading a subset of the atoms or frames of an XTC or DCD trajectory
+still decodes every frame in order on a single core. :func:`convert`
+instead re-encodes the coordinates of a trajectory once into a *chunked
+store*: a directory next to the trajectory in the data home (see
+:func:`chunks_filename`) in which blocks of frames × atoms are
+compressed independently. A :class:`ChunkedTrajectory` then only reads
+the chunks of the requested frames and atoms and decompresses them on
+many threads::
+
+    >>> nhaa = datasets.fetch_nhaa_equilibrium(chunked=True)
+    >>> traj = ChunkedTrajectory(nhaa.trajectory_chunks)
+    >>> xyz = traj[::10, :3000]   # every 10th frame of the first 3000 atoms
+
+The ``fetch_*`` functions of datasets with XTC or DCD trajectories
+convert them with ``chunked=True``.
+
+The store has the layout of a `Zarr`_ (version 2) array of shape
+``(n_frames, n_atoms, 3)``: the chunks ``{i}.{j}.0`` and the metadata in
+``.zarray`` (and ``.zattrs``). The coordinates are stored either
+losslessly as ``float32`` or, with `decimals`, as integers of fixed
+precision; the bytes are shuffled and compressed with zstd (if the
+:mod:`zstandard` package is installed) or zlib.
+
+Converting and reading requires NumPy; converting trajectories in
+formats other than DCD requires MDAnalysis.
+
+.. _Zarr: https://zarr.readthedocs.io/
+"""
+
+from os.path import exists, join
+from os import makedirs, replace
+from concurrent.futures import ThreadPoolExecutor
+from collections import deque
+import json
+import os
+import shutil
+import zlib
+
+import logging
+
+from .base import _FileLock, _lock_path
+from .materialize import _dcd_blocks, _derived_filename, _numpy
+from .materialize import read_dcd_header
+
+logger = logging.getLogger(__name__)
+
+#: Suffix of the directory of the chunked store of a trajectory.
+CHUNKS_SUFFIX = '.chunks'
+
+#: Default number of frames and of atoms in a chunk.
+DEFAULT_CHUNKS = (100, 10000)
+
+#: Compression level of zstd and zlib.
+COMPRESSION_LEVEL = 3
+
+_ZARRAY = '.zarray'
+_ZATTRS = '.zattrs'
+
+
+def _zstandard():
+    try:
+        import zstandard
+    except ImportError:
+        raise ImportError("zstd compressed stores require the zstandard "
+                          "package (pip install zstandard)")
+    return zstandard
+
+
+def _default_compressor():
+    try:
+        _zstandard()
+    except ImportError:
+        return 'zlib'
+    return 'zstd'
+
+
+def _codec(compressor):
+    """Return the compress and decompress functions of `compressor`."""
+    if compressor == 'zlib':
+        return (lambda data: zlib.compress(data, COMPRESSION_LEVEL),
+                zlib.decompress)
+    if compressor == 'zstd':
+        zstandard = _zstandard()
+        # (de)compressors are not thread-safe, but cheap to create
+        return (lambda data: zstandard.ZstdCompressor(
+                    level=COMPRESSION_LEVEL).compress(data),
+                lambda data: zstandard.ZstdDecompressor().decompress(data))
+    raise ValueError("Unknown compressor {0}; choose from zstd, "
+                     "zlib".format(compressor))
+
+
+def chunks_filename(filename, data_location=None):
+    """Return the directory of the chunked store of `filename`.
+
+    It is stored next to the trajectory, unless the trajectory is not in
+    `data_location` (e.g., in a read-only layer of the data path); then
+    it is stored in `data_location`.
+    """
+    return _derived_filename(filename, CHUNKS_SUFFIX, data_location)
+
+
+def convert(filename, path=None, chunks=DEFAULT_CHUNKS, decimals=None,
+            compressor=None, max_workers=None):
+    """Convert the coordinates of trajectory `filename` into a chunked store.
+
+    An existing store is used if it was converted from the current
+    trajectory (same size and modification time) with the same options.
+
+    Parameters
+    ----------
+    filename : str
+        trajectory; DCD trajectories are read directly, all other formats
+        with MDAnalysis
+    path : str or None
+        directory of the store; ``None`` uses :func:`chunks_filename`
+    chunks : tuple of int
+        number of frames and of atoms in a chunk
+    decimals : int or None
+        ``None`` stores the coordinates losslessly as ``float32``; an
+        integer stores them rounded to this number of decimals as
+        ``int32`` (e.g., ``2`` keeps the precision of an XTC trajectory in
+        Å)
+    compressor : str or None
+        ``"zstd"`` or ``"zlib"``; ``None`` uses zstd if the
+        :mod:`zstandard` package is installed
+    max_workers : int or None
+        number of threads that compress chunks
+
+    Returns
+    -------
+    path : str
+        directory of the store, which can be read with
+        :class:`ChunkedTrajectory`
+
+    Raises
+    ------
+    ImportError
+        if NumPy (or, for formats other than DCD, MDAnalysis) is not
+        installed
+    ValueError
+        if the compressor is unknown
+    """
+    np = _numpy()
+    if path is None:
+        path = chunks_filename(filename)
+    if compressor is None:
+        compressor = _default_compressor()
+    compress = _codec(compressor)[0]
+    chunks = tuple(int(n) for n in chunks)
+    source = _source(filename)
+    with _FileLock(_lock_path(path)):
+        try:
+            attrs = _read_json(join(path, _ZATTRS))
+        except (OSError, ValueError):
+            attrs = None
+        if attrs == dict(source, decimals=decimals, compressor=compressor,
+                         chunks=list(chunks)):
+            return path
+        logger.info("Converting coordinates of {0} -> {1}...".format(
+            filename, path))
+        tmp_path = path + '.tmp'
+        if exists(tmp_path):
+            shutil.rmtree(tmp_path)
+        makedirs(tmp_path)
+        try:
+            shape, sizes = _write_chunks(np, filename, tmp_path, chunks,
+                                         decimals, compress, max_workers)
+            _write_json(join(tmp_path, _ZARRAY), _zarray(
+                shape, sizes, decimals, compressor))
+            _write_json(join(tmp_path, _ZATTRS), dict(
+                source, decimals=decimals, compressor=compressor,
+                chunks=list(chunks)))
+            if exists(path):
+                shutil.rmtree(path)
+            replace(tmp_path, path)
+        except BaseException:
+            shutil.rmtree(tmp_path, ignore_errors=True)
+            raise
+    return path
+
+
+def _source(filename):
+    """Return the size and modification time of trajectory `filename`."""
+    stat = os.stat(filename)
+    return {'source_size': stat.st_size, 'source_mtime': stat.st_mtime_ns}
+
+
+def _blocks(np, filename):
+    """Return the shape of trajectory `filename` and a reader of its blocks.
+
+    The reader yields the first frame and the coordinates of blocks of
+    `n_frames` (see :func:`MDAnalysisData.materialize._dcd_blocks`).
+    """
+    if filename.lower().endswith('.dcd'):
+        header = read_dcd_header(filename)
+        return ((header.n_frames, header.n_atoms, 3),
+                lambda n_frames: _dcd_blocks(np, filename, header,
+                                             n_frames=n_frames))
+    try:
+        from MDAnalysis.coordinates.core import reader
+    except ImportError:
+        raise ImportError("converting {0} requires the MDAnalysis package "
+                          "(pip install MDAnalysis)".format(filename))
+    trajectory = reader(filename)
+
+    def blocks(n_frames):
+        try:
+            for start in range(0, trajectory.n_frames, n_frames):
+                stop = min(start + n_frames, trajectory.n_frames)
+                block = np.empty((stop - start, trajectory.n_atoms, 3),
+                                 np.float32)
+                for i, ts in enumerate(trajectory[start:stop]):
+                    block[i] = ts.positions
+                yield start, block
+        finally:
+            trajectory.close()
+
+    return (trajectory.n_frames, trajectory.n_atoms, 3), blocks
+
+
+def _write_chunks(np, filename, path, chunks, decimals, compress,
+                  max_workers):
+    """Write the compressed chunks of trajectory `filename` into `path`.
+
+    Blocks of frames are read one after another while the chunks of the
+    previous blocks are compressed on `max_workers` threads. Returns the
+    shape of the coordinates and the size of the chunks, which are not
+    larger than the trajectory.
+    """
+    shape, blocks = _blocks(np, filename)
+    chunks = (max(1, min(chunks[0], shape[0])),
+              max(1, min(chunks[1], shape[1])))
+    pending = deque()
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        for start, block in blocks(chunks[0]):
+            i = start // chunks[0]
+            if len(block) < chunks[0]:
+                # chunks at the edges have the full size (as in Zarr)
+                block = np.concatenate([block, np.zeros(
+                    (chunks[0] - len(block),) + block.shape[1:],
+                    np.float32)])
+            data = _encode(np, block, decimals)
+            pending.append([
+                pool.submit(_write_chunk, np,
+                            join(path, '{0}.{1}.0'.format(i, j)),
+                            data[:, atom:atom + chunks[1]], chunks[1],
+                            compress)
+                for j, atom in enumerate(range(0, shape[1], chunks[1]))])
+            # do not read much further than the chunks are compressed
+            while len(pending) > 2:
+                for future in pending.popleft():
+                    future.result()
+        for futures in pending:
+            for future in futures:
+                future.result()
+    return shape, chunks
+
+
+def _encode(np, block, decimals):
+    """Return the coordinates of `block` in the dtype of the store."""
+    if decimals is None:
+        return block.astype('<f4')
+    return np.around(block * 10.0 ** decimals).astype('<i4')
+
+
+def _write_chunk(np, path, data, n_atoms, compress):
+    """Write the shuffled and compressed `data` of a chunk into `path`."""
+    if data.shape[1] < n_atoms:
+        data = np.concatenate([data, np.zeros(
+            (data.shape[0], n_atoms - data.shape[1], 3), data.dtype)],
+            axis=1)
+    # the first, second, ... bytes of all values are stored together
+    shuffled = np.ascontiguousarray(data).view(np.uint8).reshape(
+        -1, data.dtype.itemsize).T.tobytes()
+    with open(path, 'wb') as f:
+        f.write(compress(shuffled))
+
+
+def _zarray(shape, chunks, decimals, compressor):
+    """Return the metadata of a store in the format of Zarr."""
+    filters = [{'id': 'shuffle', 'elementsize': 4}]
+    if decimals is not None:
+        filters.insert(0, {'id': 'fixedscaleoffset', 'offset': 0,
+                           'scale': 10 ** decimals, 'dtype': '<f4',
+                           'astype': '<i4'})
+    return {
+        'zarr_format': 2,
+        'shape': list(shape),
+        'chunks': list(chunks) + [3],
+        'dtype': '<f4',
+        'compressor': {'id': compressor, 'level': COMPRESSION_LEVEL},
+        'fill_value': 0.0,
+        'order': 'C',
+        'filters': filters,
+        'dimension_separator': '.',
+    }
+
+
+def _read_json(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+def _write_json(path, data):
+    with open(path, 'w') as f:
+        json.dump(data, f, indent=4, sort_keys=True)
+
+
+class ChunkedTrajectory(object):
+    """Coordinates of a trajectory in a chunked store.
+
+    The coordinates are read by indexing (like a NumPy array of shape
+    ``(n_frames, n_atoms, 3)``, with integers, slices or lists of indices
+    for frames and atoms) or with :meth:`read`. Only the chunks that
+    contain the requested frames and atoms are read, and they are
+    decompressed on several threads.
+
+    Parameters
+    ----------
+    path : str
+        directory of the store (see :func:`convert`)
+    max_workers : int or None
+        number of threads that read and decompress chunks
+
+    Raises
+    ------
+    IOError
+        if `path` is not a chunked store
+    """
+
+    def __init__(self, path, max_workers=None):
+        self._np = _numpy()
+        try:
+            meta = _read_json(join(path, _ZARRAY))
+        except (OSError, ValueError) as err:
+            raise IOError("{0} is not a chunked store: {1}".format(path, err))
+        self.path = path
+        self.max_workers = max_workers
+        #: ``(n_frames, n_atoms, 3)``
+        self.shape = tuple(meta['shape'])
+        #: number of frames and of atoms in a chunk
+        self.chunks = tuple(meta['chunks'][:2])
+        self._decompress = _codec(meta['compressor']['id'])[1]
+        self._scale = None
+        self._dtype = self._np.dtype('<f4')
+        for codec in meta['filters']:
+            if codec['id'] == 'fixedscaleoffset':
+                self._scale = codec['scale']
+                self._dtype = self._np.dtype(codec['astype'])
+
+    @property
+    def n_frames(self):
+        return self.shape[0]
+
+    @property
+    def n_atoms(self):
+        return self.shape[1]
+
+    def __len__(self):
+        return self.n_frames
+
+    def __repr__(self):
+        return "<ChunkedTrajectory {0} with {1} frames of {2} atoms>".format(
+            self.path, self.n_frames, self.n_atoms)
+
+    def __getitem__(self, index):
+        if not isinstance(index, tuple):
+            index = (index,)
+        if len(index) > 2:
+            raise IndexError("only frames and atoms can be indexed")
+        return self.read(*index)
+
+    def read(self, frames=None, atoms=None):
+        """Read the coordinates of some frames and atoms.
+
+        Parameters
+        ----------
+        frames, atoms : int, slice, list of int or None
+            frames and atoms to read; ``None`` reads all of them
+
+        Returns
+        -------
+        coordinates : numpy.ndarray
+            ``(n_frames, n_atoms, 3)`` array of ``float32`` (without the
+            frame or atom axis if `frames` or `atoms` is an integer)
+        """
+        np = self._np
+        frames, squeeze_frames = self._indices(frames, self.n_frames)
+        atoms, squeeze_atoms = self._indices(atoms, self.n_atoms)
+        out = np.empty((len(frames), len(atoms), 3), np.float32)
+        frame_chunks = frames // self.chunks[0]
+        atom_chunks = atoms // self.chunks[1]
+        tasks = []
+        for i in np.unique(frame_chunks):
+            rows = np.nonzero(frame_chunks == i)[0]
+            for j in np.unique(atom_chunks):
+                columns = np.nonzero(atom_chunks == j)[0]
+                tasks.append((i, j, rows, columns))
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            for future in [pool.submit(self._read_chunk, out, frames, atoms,
+                                       *task) for task in tasks]:
+                future.result()
+        if squeeze_atoms:
+            out = out[:, 0]
+        if squeeze_frames:
+            out = out[0]
+        return out
+
+    def _indices(self, selection, n):
+        """Return the indices of `selection` and whether it is an integer."""
+        np = self._np
+        if selection is None:
+            return np.arange(n), False
+        indices = np.arange(n)[selection]
+        return np.atleast_1d(indices), indices.ndim == 0
+
+    def _read_chunk(self, out, frames, atoms, i, j, rows, columns):
+        """Decompress chunk (`i`, `j`) into `rows` and `columns` of `out`."""
+        np = self._np
+        with open(join(self.path, '{0}.{1}.0'.format(i, j)), 'rb') as f:
+            data = self._decompress(f.read())
+        chunk = np.frombuffer(data, np.uint8).reshape(
+            self._dtype.itemsize, -1).T.copy().view(self._dtype).reshape(
+                self.chunks[0], self.chunks[1], 3)
+        values = chunk[_index(np, frames[rows] - i * self.chunks[0],
+                              atoms[columns] - j * self.chunks[1])]
+        if self._scale is not None:
+            values = values / self._scale
+        out[_index(np, rows, columns)] = values
+
+
+def _index(np, rows, columns):
+    """Return the index of the `rows` and `columns` of an array.
+
+    Evenly spaced indices become slices, which are much faster than
+    indexing with arrays.
+    """
+    rows, columns = _slice(np, rows), _slice(np, columns)
+    if isinstance(rows, slice) or isinstance(columns, slice):
+        return rows, columns
+    return np.ix_(rows, columns)
+
+
+def _slice(np, indices):
+    """Return evenly spaced (increasing) `indices` as a slice."""
+    if len(indices) == 1:
+        return slice(indices[0], indices[0] + 1)
+    if len(indices) > 1:
+        steps = np.diff(indices)
+        if steps[0] > 0 and (steps == steps[0]).all():
+            return slice(indices[0], indices[-1] + 1, steps[0])
+    return indices
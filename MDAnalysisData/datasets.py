@@ -1,33 +1,92 @@
 """Access to all datasets via ``fetch_*()`` functions.
 
+The functions are imported from their modules on first use so that
+importing :mod:`MDAnalysisData.datasets` does not load the download
+machinery (and its dependencies) until a dataset is actually fetched.
 """
-# import load_* and fetch_* functions from modules
-
-from .base import get_data_home, clear_data_home
-from .adk_equilibrium import fetch_adk_equilibrium
-from .adk_transitions import (fetch_adk_transitions_DIMS,
-                              fetch_adk_transitions_FRODA)
-from .nhaa_equilibrium import fetch_nhaa_equilibrium
-from .ifabp_water import fetch_ifabp_water
-from .vesicles import fetch_vesicle_lib
-from .CG_fiber import fetch_CG_fiber
-from .PEG_1chain import fetch_PEG_1chain
-from .membrane_peptide import fetch_membrane_peptide
-from .yiip_equilibrium import (fetch_yiip_equilibrium_short,
-                               fetch_yiip_equilibrium_long)
+# import load_* and fetch_* functions from modules on first access
+
+import importlib
+
+#: Module (relative to the package) of each public name
+_MODULES = {
+    'get_data_home': 'base',
+    'clear_data_home': 'base',
+    'list_datasets': 'cache',
+    'pin_dataset': 'cache',
+    'unpin_dataset': 'cache',
+    'evict_datasets': 'cache',
+    'fetch_adk_equilibrium': 'adk_equilibrium',
+    'fetch_adk_transitions_DIMS': 'adk_transitions',
+    'fetch_adk_transitions_FRODA': 'adk_transitions',
+    'fetch_nhaa_equilibrium': 'nhaa_equilibrium',
+    'fetch_ifabp_water': 'ifabp_water',
+    'fetch_vesicle_lib': 'vesicles',
+    'fetch_CG_fiber': 'CG_fiber',
+    'fetch_PEG_1chain': 'PEG_1chain',
+    'fetch_membrane_peptide': 'membrane_peptide',
+    'fetch_yiip_equilibrium_short': 'yiip_equilibrium',
+    'fetch_yiip_equilibrium_long': 'yiip_equilibrium',
+    'fetch_many': 'batch',
+    'async_fetch_adk_equilibrium': 'aio',
+    'async_fetch_adk_transitions_DIMS': 'aio',
+    'async_fetch_adk_transitions_FRODA': 'aio',
+    'async_fetch_nhaa_equilibrium': 'aio',
+    'async_fetch_ifabp_water': 'aio',
+    'async_fetch_vesicle_lib': 'aio',
+    'async_fetch_CG_fiber': 'aio',
+    'async_fetch_PEG_1chain': 'aio',
+    'async_fetch_membrane_peptide': 'aio',
+    'async_fetch_yiip_equilibrium_short': 'aio',
+    'async_fetch_yiip_equilibrium_long': 'aio',
+    'async_fetch_many': 'aio',
+}
 
 __all__ = [
     'get_data_home',
     'clear_data_home',
+    'list_datasets',
+    'pin_dataset',
+    'unpin_dataset',
+    'evict_datasets',
     'fetch_adk_equilibrium',
     'fetch_adk_transitions_DIMS',
     'fetch_adk_transitions_FRODA',
     'fetch_ifabp_water',
-    'fetch_vesicle_lib'
+    'fetch_vesicle_lib',
     'fetch_nhaa_equilibrium',
     'fetch_CG_fiber',
     'fetch_PEG_1chain',
     'fetch_membrane_peptide',
     'fetch_yiip_equilibrium_short',
     'fetch_yiip_equilibrium_long',
+    'fetch_many',
+    'async_fetch_adk_equilibrium',
+    'async_fetch_adk_transitions_DIMS',
+    'async_fetch_adk_transitions_FRODA',
+    'async_fetch_ifabp_water',
+    'async_fetch_vesicle_lib',
+    'async_fetch_nhaa_equilibrium',
+    'async_fetch_CG_fiber',
+    'async_fetch_PEG_1chain',
+    'async_fetch_membrane_peptide',
+    'async_fetch_yiip_equilibrium_short',
+    'async_fetch_yiip_equilibrium_long',
+    'async_fetch_many',
 ]
+
+
+def __getattr__(name):
+    try:
+        module = _MODULES[name]
+    except KeyError:
+        raise AttributeError("module {0!r} has no attribute {1!r}".format(
+            __name__, name))
+    value = getattr(importlib.import_module('.' + module, __package__), name)
+    # later accesses do not go through __getattr__
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,261 @@
+# -*- coding: utf-8 -*-
+
+"""Decompression backends for dataset archives.
+
+The ``.tar.gz`` and ``.tar.bz2`` archives of the datasets are unpacked
+through :func:`open_decompressed`, which picks the first available
+backend for the compression of the archive from :data:`DECOMPRESSORS`.
+Multi-core implementations are preferred when they are installed:
+
+- ``rapidgzip`` (Python package, multi-threaded gzip)
+- ``indexed_bzip2`` (Python package, block-parallel bzip2)
+- ``pigz``, ``lbzip2`` and ``pbzip2`` (command line tools)
+
+Otherwise the :mod:`gzip` and :mod:`bz2` modules of the standard library
+(backend ``"python"``) are used. Further backends can be added with
+:func:`register_decompressor`; the environment variable
+:envvar:`MDANALYSIS_DATA_DECOMPRESSOR` selects a backend by name (e.g.,
+``python`` to always use the standard library).
+"""
+
+from os import environ
+from os.path import basename
+from collections import namedtuple
+from contextlib import contextmanager
+import bz2
+import gzip
+import importlib
+import io
+import os
+import shutil
+import signal
+import subprocess
+import threading
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+#: Size of the blocks that are piped into decompression commands.
+_CHUNK_SIZE = 2**20
+
+#: A decompression backend is a :func:`~collections.namedtuple` with fields
+#:
+#: - *name*: name of the backend
+#: - *open*: ``open(fileobj)`` returns a context manager for a binary file
+#:   object with the decompressed data of the compressed `fileobj`
+#: - *available*: ``available()`` returns ``True`` if the backend can be
+#:   used (e.g., if the required package or command is installed)
+#: - *seekable*: ``True`` if the backend can only read from seekable files
+#:   (and not from a download stream)
+#:
+Decompressor = namedtuple('Decompressor',
+                          ['name', 'open', 'available', 'seekable'])
+
+
+def _threads():
+    return os.cpu_count() or 1
+
+
+def _importable(module):
+    def available():
+        try:
+            importlib.import_module(module)
+        except ImportError:
+            return False
+        return True
+    return available
+
+
+def _installed(command):
+    def available():
+        return shutil.which(command) is not None
+    return available
+
+
+def _package(module):
+    def open_(fileobj):
+        return importlib.import_module(module).open(
+            fileobj, parallelization=_threads())
+    return open_
+
+
+@contextmanager
+def _command(args, fileobj):
+    """Decompress `fileobj` with the command `args` in a subprocess.
+
+    Files are passed directly as standard input of the process; other
+    streams are copied into its standard input by a thread.
+    """
+    try:
+        stdin = fileobj.fileno()
+    except (AttributeError, io.UnsupportedOperation):
+        stdin = subprocess.PIPE
+    process = subprocess.Popen(args, stdin=stdin, stdout=subprocess.PIPE)
+    errors = []
+
+    def feed():
+        try:
+            while True:
+                buffer = fileobj.read(_CHUNK_SIZE)
+                if not buffer:
+                    break
+                process.stdin.write(buffer)
+        except BrokenPipeError:
+            # the reader stopped early
+            pass
+        except Exception as err:
+            errors.append(err)
+        finally:
+            try:
+                process.stdin.close()
+            except BrokenPipeError:
+                pass
+
+    feeder = None
+    if stdin == subprocess.PIPE:
+        feeder = threading.Thread(target=feed, daemon=True)
+        feeder.start()
+    try:
+        yield process.stdout
+    finally:
+        # a process that is still writing is stopped by SIGPIPE
+        process.stdout.close()
+        if feeder is not None:
+            feeder.join()
+        returncode = process.wait()
+    if errors:
+        raise errors[0]
+    if returncode not in (0, -getattr(signal, 'SIGPIPE', 0)):
+        raise IOError("{0} failed with exit code {1}".format(
+            " ".join(args), returncode))
+
+
+def _commands(*args):
+    def open_(fileobj):
+        return _command(list(args), fileobj)
+    return open_
+
+
+#: Backends for each compression, in order of preference.
+DECOMPRESSORS = {
+    'gz': [
+        Decompressor('rapidgzip', _package('rapidgzip'),
+                     _importable('rapidgzip'), True),
+        Decompressor('pigz', _commands('pigz', '-dc'),
+                     _installed('pigz'), False),
+        Decompressor('python', lambda fileobj: gzip.open(fileobj, 'rb'),
+                     lambda: True, False),
+    ],
+    'bz2': [
+        Decompressor('indexed_bzip2', _package('indexed_bzip2'),
+                     _importable('indexed_bzip2'), True),
+        Decompressor('lbzip2', _commands('lbzip2', '-dc'),
+                     _installed('lbzip2'), False),
+        Decompressor('pbzip2', _commands('pbzip2', '-dc'),
+                     _installed('pbzip2'), False),
+        Decompressor('python', lambda fileobj: bz2.open(fileobj, 'rb'),
+                     lambda: True, False),
+    ],
+}
+
+
+def register_decompressor(compression, decompressor):
+    """Add a backend for `compression` that is preferred over the others.
+
+    Parameters
+    ----------
+    compression : str
+        ``"gz"`` or ``"bz2"`` (or a new compression)
+    decompressor : Decompressor
+        the backend
+    """
+    DECOMPRESSORS.setdefault(compression, []).insert(0, decompressor)
+
+
+def get_compression(filename):
+    """Return the compression of the archive `filename` from its suffix.
+
+    Returns ``"gz"``, ``"bz2"`` or ``None`` (uncompressed or unknown).
+    """
+    name = basename(filename)
+    if name.endswith(('.gz', '.tgz')):
+        return 'gz'
+    if name.endswith(('.bz2', '.tbz', '.tbz2')):
+        return 'bz2'
+    return None
+
+
+def get_decompressor(compression, seekable=True, backend=None):
+    """Return the decompression backend for `compression`.
+
+    Parameters
+    ----------
+    compression : str
+        ``"gz"`` or ``"bz2"``
+    seekable : bool
+        ``False`` if the input is a stream that cannot seek, which excludes
+        backends that need a file
+    backend : str or None
+        name of the backend; ``None`` uses the environment variable
+        :envvar:`MDANALYSIS_DATA_DECOMPRESSOR` or else the first
+        available backend
+
+    Returns
+    -------
+    decompressor : Decompressor
+
+    Raises
+    ------
+    ValueError
+        if there is no backend for `compression` (a requested `backend`
+        that is not available is replaced by ``"python"``)
+    """
+    if backend is None:
+        backend = environ.get('MDANALYSIS_DATA_DECOMPRESSOR')
+    candidates = [decompressor for decompressor
+                  in DECOMPRESSORS.get(compression, [])
+                  if (seekable or not decompressor.seekable)
+                  and (backend is None or decompressor.name == backend)]
+    for decompressor in candidates:
+        if decompressor.available():
+            return decompressor
+    if backend is not None and backend != 'python':
+        # fall back to the standard library
+        logger.info("Decompressor {0} not available for {1}, using "
+                    "python".format(backend, compression))
+        return get_decompressor(compression, seekable=seekable,
+                                backend='python')
+    raise ValueError("No decompressor {0} for compression {1}".format(
+        backend if backend is not None else "available", compression))
+
+
+@contextmanager
+def open_decompressed(fileobj, compression, seekable=True, backend=None):
+    """Decompress the binary file object `fileobj`.
+
+    Parameters
+    ----------
+    fileobj : file-like
+        compressed data
+    compression : str or None
+        ``"gz"``, ``"bz2"`` or ``None`` (`fileobj` is used as it is)
+    seekable : bool
+        ``False`` if `fileobj` is a stream that cannot seek
+    backend : str or None
+        name of the backend (see :func:`get_decompressor`)
+
+    Yields
+    ------
+    stream : file-like
+        decompressed data
+    """
+    if compression is None:
+        yield fileobj
+        return
+    decompressor = get_decompressor(compression, seekable=seekable,
+                                    backend=backend)
+    logger.debug("Decompressing {0} with {1}".format(compression,
+                                                     decompressor.name))
+    with decompressor.open(fileobj) as stream:
+        yield stream
@@ -0,0 +1,227 @@
+# -*- coding: utf-8 -*-
+
+"""Memory-mapped coordinate arrays of DCD trajectories.
+
+Every analysis of a DCD trajectory decodes it frame by frame. The
+``fetch_*`` functions of datasets with DCD trajectories instead convert
+the coordinates once into a NumPy ``.npy`` file with a
+``(n_frames, n_atoms, 3)`` ``float32`` array when they are called with
+``materialize=True`` (see :func:`materialize`). The file is stored next
+to the trajectory in the data home and can be memory-mapped::
+
+    >>> import numpy as np
+    >>> adk = datasets.fetch_adk_equilibrium(materialize=True)
+    >>> xyz = np.load(adk.trajectory_npy, mmap_mode='r')
+
+so that parallel workers share the coordinates through the page cache
+of the operating system instead of decoding their own copy. Unit cells
+are not included.
+
+Converting trajectories requires NumPy (``pip install numpy``).
+"""
+
+from os.path import basename, exists, getmtime, getsize, join
+from os import remove, replace
+from collections import namedtuple
+import struct
+
+import logging
+
+from .base import _FileLock, _lock_path
+
+logger = logging.getLogger(__name__)
+
+#: Suffix of the ``.npy`` file with the coordinates of a trajectory.
+NPY_SUFFIX = '.npy'
+
+#: Number of frames that are converted at a time.
+_CHUNK_FRAMES = 256
+
+#: The header of a DCD trajectory is described by a
+#: :func:`~collections.namedtuple` with fields
+#:
+#: - *n_frames*: number of (complete) frames in the file
+#: - *n_atoms*: number of atoms
+#: - *endian*: byte order, ``'<'`` or ``'>'``
+#: - *unitcell*: ``True`` if every frame starts with a unit cell record
+#: - *four_dims*: ``True`` if every frame ends with a fourth coordinate
+#: - *offset*: size of the header in bytes, i.e., offset of the first frame
+#: - *frame_size*: size of a frame in bytes
+#:
+DCDHeader = namedtuple('DCDHeader',
+                       ['n_frames', 'n_atoms', 'endian', 'unitcell',
+                        'four_dims', 'offset', 'frame_size'])
+
+
+def _numpy():
+    try:
+        import numpy
+    except ImportError:
+        raise ImportError("materializing trajectories requires the numpy "
+                          "package (pip install numpy)")
+    return numpy
+
+
+def read_dcd_header(filename):
+    """Read the header of the CHARMM/NAMD DCD trajectory `filename`.
+
+    Returns
+    -------
+    header : DCDHeader
+
+    Raises
+    ------
+    IOError
+        if the file is not a DCD trajectory or has fixed atoms (which are
+        not supported)
+    """
+    with open(filename, 'rb') as f:
+        data = f.read(92)
+        for endian in '<>':
+            if (len(data) == 92 and
+                    struct.unpack_from(endian + 'i', data)[0] == 84 and
+                    data[4:8] == b'CORD'):
+                break
+        else:
+            raise IOError("{0} is not a DCD trajectory".format(filename))
+        icntrl = struct.unpack_from(endian + '20i', data, 8)
+        charmm = icntrl[19] != 0
+        if icntrl[8] != 0:
+            raise IOError("{0} has fixed atoms, which are not "
+                          "supported".format(filename))
+        # title block
+        (length,) = struct.unpack(endian + 'i', f.read(4))
+        f.seek(length + 4, 1)
+        # number of atoms
+        marker, n_atoms, _ = struct.unpack(endian + '3i', f.read(12))
+        if marker != 4:
+            raise IOError("{0} is not a DCD trajectory".format(filename))
+        offset = f.tell()
+    unitcell = charmm and icntrl[10] != 0
+    four_dims = charmm and icntrl[11] != 0
+    frame_size = ((3 + four_dims) * (4 * n_atoms + 8) +
+                  unitcell * (6 * 8 + 8))
+    n_frames = (getsize(filename) - offset) // frame_size
+    return DCDHeader(n_frames, n_atoms, endian, unitcell, four_dims, offset,
+                     frame_size)
+
+
+def npy_filename(filename, data_location=None):
+    """Return the ``.npy`` file with the coordinates of `filename`.
+
+    It is stored next to the trajectory, unless the trajectory is not in
+    `data_location` (e.g., in a read-only layer of the data path); then
+    it is stored in `data_location`.
+    """
+    return _derived_filename(filename, NPY_SUFFIX, data_location)
+
+
+def _derived_filename(filename, suffix, data_location=None):
+    """Return the file with `suffix` that is derived from `filename`."""
+    if data_location is not None and \
+            not filename.startswith(join(data_location, '')):
+        return join(data_location, basename(filename) + suffix)
+    return filename + suffix
+
+
+def materialize(filename, path=None):
+    """Convert the coordinates of DCD trajectory `filename` into a ``.npy`` file.
+
+    The file holds a ``(n_frames, n_atoms, 3)`` array of ``float32``
+    (in the units of the trajectory). An existing file is used if it is
+    newer than the trajectory and has the right shape.
+
+    Parameters
+    ----------
+    filename : str
+        DCD trajectory
+    path : str or None
+        ``.npy`` file to write; ``None`` uses :func:`npy_filename`
+
+    Returns
+    -------
+    path : str
+        ``.npy`` file, which can be loaded with ``numpy.load(path,
+        mmap_mode='r')``
+
+    Raises
+    ------
+    ImportError
+        if NumPy is not installed
+    IOError
+        if `filename` is not a DCD trajectory
+    """
+    np = _numpy()
+    if path is None:
+        path = npy_filename(filename)
+    header = read_dcd_header(filename)
+    shape = (header.n_frames, header.n_atoms, 3)
+    with _FileLock(_lock_path(path)):
+        if _valid(np, path, filename, shape):
+            return path
+        logger.info("Converting coordinates of {0} -> {1}...".format(
+            filename, path))
+        _convert(np, filename, header, path + '.tmp')
+        replace(path + '.tmp', path)
+    return path
+
+
+def _valid(np, path, filename, shape):
+    """Return ``True`` if `path` has the current coordinates of `filename`."""
+    if not exists(path) or getmtime(path) < getmtime(filename):
+        return False
+    try:
+        return np.load(path, mmap_mode='r').shape == shape
+    except (OSError, ValueError):
+        return False
+
+
+def _convert(np, filename, header, path):
+    """Write the coordinates of DCD trajectory `filename` into `path`."""
+    if header.n_frames == 0:
+        # nothing to memory-map
+        with open(path, 'wb') as f:
+            np.save(f, np.zeros((0, header.n_atoms, 3), np.float32))
+        return
+    try:
+        out = np.lib.format.open_memmap(
+            path, mode='w+', dtype=np.float32,
+            shape=(header.n_frames, header.n_atoms, 3))
+        for start, block in _dcd_blocks(np, filename, header):
+            out[start:start + len(block)] = block
+        out.flush()
+        del out
+    except BaseException:
+        if exists(path):
+            remove(path)
+        raise
+
+
+def _dcd_blocks(np, filename, header, n_frames=_CHUNK_FRAMES):
+    """Yield the first frame and the coordinates of blocks of `n_frames`.
+
+    The coordinates of every block are a ``(n, n_atoms, 3)`` array of
+    ``float32``.
+    """
+    if header.n_frames == 0:
+        return
+    e = header.endian
+    fields = []
+    if header.unitcell:
+        fields += [('cell_start', e + 'i4'), ('cell', e + 'f8', 6),
+                   ('cell_end', e + 'i4')]
+    for axis in 'xyzw'[:3 + header.four_dims]:
+        fields += [(axis + '_start', e + 'i4'),
+                   (axis, e + 'f4', header.n_atoms),
+                   (axis + '_end', e + 'i4')]
+    frames = np.memmap(filename, dtype=np.dtype(fields), mode='r',
+                       offset=header.offset, shape=(header.n_frames,))
+    try:
+        for start in range(0, header.n_frames, n_frames):
+            chunk = frames[start:start + n_frames]
+            block = np.empty((len(chunk), header.n_atoms, 3), np.float32)
+            for i, axis in enumerate('xyz'):
+                block[:, :, i] = chunk[axis]
+            yield start, block
+    finally:
+        del frames
@@ -0,0 +1,281 @@
+# -*- coding: utf-8 -*-
+
+"""Frame offsets of XTC trajectories.
+
+Random access to a frame of an XTC trajectory requires the byte offset
+of every frame, which a reader can only find by scanning the whole file
+once. The ``fetch_*`` functions of datasets with XTC trajectories build
+this index when the trajectory is downloaded (see :func:`get_offsets`)
+and store it next to the trajectory in the format of the
+:mod:`MDAnalysis.coordinates.XTC` reader, a hidden file
+``.{trajectory}_offsets.npz`` (see :func:`offsets_filename`). MDAnalysis
+then uses the stored offsets and can seek to any frame from the first
+time it opens the trajectory.
+
+An offsets file is only valid for the ctime of its trajectory, which
+changes whenever a hardlink to the trajectory is added or removed. When
+a data home that shares the store of downloaded files (see
+:func:`~MDAnalysisData.base.get_blob_store`) links or evicts the same
+trajectory, the offsets files of the other links are updated.
+
+The index is built by only reading the header of every frame, which
+does not require NumPy or MDAnalysis; :func:`load_offsets` reads it
+back without NumPy.
+"""
+
+from os.path import exists, getctime, getsize, join, split
+from os import remove, replace
+import ast
+import struct
+import sys
+import zipfile
+from array import array
+
+import logging
+
+from .base import _FileLock
+
+logger = logging.getLogger(__name__)
+
+#: Magic numbers of XTC frames: the original format and the format with
+#: 64-bit sizes of the compressed coordinates (GROMACS 2023).
+XTC_MAGIC = (1995, 2023)
+
+# magic, natoms, step, time, box (9 floats), natoms
+_HEADER = struct.Struct('>ii')
+_HEADER_SIZE = 4 * 4 + 9 * 4 + 4
+# precision, minint (3), maxint (3), smallidx
+_COMPRESSED_HEADER_SIZE = 4 + 3 * 4 + 3 * 4 + 4
+
+_NPY_MAGIC = b'\x93NUMPY\x01\x00'
+_NPY_TYPES = {'<i8': 'q', '<f8': 'd'}
+
+
+def offsets_filename(filename, ending='npz'):
+    """Return the name of the offsets file (or its lock) of `filename`.
+
+    This is the name that the XTC reader of MDAnalysis uses, a hidden file
+    ``.{filename}_offsets.{ending}`` in the directory of the trajectory.
+    """
+    head, tail = split(filename)
+    return join(head, '.{0}_offsets.{1}'.format(tail, ending))
+
+
+def read_xtc_offsets(filename):
+    """Scan an XTC trajectory and return the offsets of its frames.
+
+    Only the header of every frame is read; the compressed coordinates
+    are skipped.
+
+    Parameters
+    ----------
+    filename : str
+        XTC trajectory
+
+    Returns
+    -------
+    offsets : list of int
+        byte offset of every frame
+    n_atoms : int
+        number of atoms
+
+    Raises
+    ------
+    IOError
+        if the file is not an XTC trajectory or the last frame is
+        incomplete
+    """
+    offsets = []
+    n_atoms = 0
+    size = getsize(filename)
+    with open(filename, 'rb') as f:
+        offset = 0
+        while offset < size:
+            f.seek(offset)
+            header = f.read(_HEADER_SIZE + _COMPRESSED_HEADER_SIZE + 8)
+            if len(header) < _HEADER_SIZE:
+                raise IOError("Incomplete XTC frame at byte {0} of "
+                              "{1}".format(offset, filename))
+            magic, natoms = _HEADER.unpack_from(header)
+            if magic not in XTC_MAGIC:
+                raise IOError("{0} is not an XTC trajectory (no frame at "
+                              "byte {1})".format(filename, offset))
+            if natoms <= 9:
+                # coordinates are not compressed
+                frame_size = _HEADER_SIZE + 3 * 4 * natoms
+            else:
+                start = _HEADER_SIZE + _COMPRESSED_HEADER_SIZE
+                if magic == 1995:
+                    (n_bytes,) = struct.unpack_from('>i', header, start)
+                    start += 4
+                else:
+                    (n_bytes,) = struct.unpack_from('>q', header, start)
+                    start += 8
+                # compressed coordinates are padded to multiples of 4 bytes
+                frame_size = start + n_bytes + (-n_bytes % 4)
+            if offset + frame_size > size:
+                raise IOError("Incomplete XTC frame at byte {0} of "
+                              "{1}".format(offset, filename))
+            offsets.append(offset)
+            n_atoms = natoms
+            offset += frame_size
+    return offsets, n_atoms
+
+
+def get_offsets(filename):
+    """Return the offsets file of XTC trajectory `filename`.
+
+    The offsets are read from the trajectory (see
+    :func:`read_xtc_offsets`) and stored in :func:`offsets_filename`
+    unless a file with offsets for the current trajectory (same size and
+    :func:`~os.path.getctime`, as checked by MDAnalysis) exists.
+
+    Concurrent calls from different threads and processes are serialized
+    with a :class:`~MDAnalysisData.base._FileLock` on the lock file of
+    the offsets (``.{filename}_offsets.lock``). This lock does not
+    necessarily exclude MDAnalysis, which locks the same file with its
+    own locking library, but the offsets are written to a temporary file
+    that is renamed, so a reader never sees an incomplete file.
+
+    Returns
+    -------
+    path : str or None
+        offsets file or ``None`` if it could not be written (e.g., in a
+        read-only directory)
+    """
+    path = offsets_filename(filename)
+    try:
+        with _FileLock(offsets_filename(filename, ending='lock')):
+            if _valid(path, filename):
+                return path
+            logger.info("Indexing frames of {0}...".format(filename))
+            offsets, n_atoms = read_xtc_offsets(filename)
+            _write_npz(path, [
+                ('offsets', array('q', offsets)),
+                ('size', getsize(filename)),
+                ('ctime', getctime(filename)),
+                ('n_atoms', n_atoms),
+            ])
+    except OSError as err:
+        if _valid(path, filename):
+            return path
+        logger.debug("Cannot index frames of {0}: {1}".format(
+            filename, err))
+        return None
+    return path
+
+
+def _update_ctime(filename, ctime):
+    """Update the offsets file of `filename` after its ctime changed.
+
+    The ctime of a file changes when a hardlink to it is added or removed
+    (see :func:`MDAnalysisData.base._links_changed`). Offsets that were
+    valid for the previous `ctime` are written with the current ctime of
+    `filename` instead of scanning the trajectory again.
+    """
+    path = offsets_filename(filename)
+    if not exists(path):
+        return
+    try:
+        with _FileLock(offsets_filename(filename, ending='lock')):
+            data = load_offsets(path)
+            if (data['size'] != getsize(filename)
+                    or data['ctime'] != ctime):
+                return
+            _write_npz(path, [
+                ('offsets', array('q', data['offsets'])),
+                ('size', data['size']),
+                ('ctime', getctime(filename)),
+                ('n_atoms', data['n_atoms']),
+            ])
+    except (OSError, KeyError) as err:
+        logger.debug("Cannot update offsets of {0}: {1}".format(
+            filename, err))
+
+
+def load_offsets(path):
+    """Read an offsets file.
+
+    Returns
+    -------
+    offsets : dict
+        ``offsets`` (list of the byte offsets of all frames), ``size`` (size
+        of the trajectory), ``ctime`` (ctime of the trajectory) and
+        ``n_atoms``
+
+    Raises
+    ------
+    IOError
+        if the file cannot be read
+    """
+    data = {}
+    try:
+        with zipfile.ZipFile(path) as z:
+            for name in z.namelist():
+                key = name[:-len('.npy')] if name.endswith('.npy') else name
+                data[key] = _read_npy(z.read(name))
+    except (zipfile.BadZipFile, ValueError, SyntaxError, KeyError) as err:
+        raise IOError("Cannot read offsets file {0}: {1}".format(path, err))
+    return data
+
+
+def _valid(path, filename):
+    """Return ``True`` if `path` has the offsets of the current `filename`."""
+    try:
+        data = load_offsets(path)
+        return (data['size'] == getsize(filename)
+                and data['ctime'] == getctime(filename))
+    except (OSError, KeyError):
+        return False
+
+
+def _npy(value):
+    """Return the content of a ``.npy`` file for an int, float or array."""
+    if isinstance(value, array):
+        shape = "({},)".format(len(value))
+        descr = {'q': '<i8', 'd': '<f8'}[value.typecode]
+        if sys.byteorder == 'big':
+            value = array(value.typecode, value)
+            value.byteswap()
+        data = value.tobytes()
+    elif isinstance(value, float):
+        shape, descr, data = "()", '<f8', struct.pack('<d', value)
+    else:
+        shape, descr, data = "()", '<i8', struct.pack('<q', value)
+    header = "{{'descr': '{0}', 'fortran_order': False, 'shape': {1}, }}".format(
+        descr, shape)
+    # the header ends with a newline and the data are aligned to 64 bytes
+    padding = -(len(_NPY_MAGIC) + 2 + len(header) + 1) % 64
+    header = (header + " " * padding + "\n").encode('latin1')
+    return _NPY_MAGIC + struct.pack('<H', len(header)) + header + data
+
+
+def _read_npy(content):
+    """Return the int, float or list in the content of a ``.npy`` file."""
+    if not content.startswith(_NPY_MAGIC[:6]):
+        raise ValueError("not a .npy file")
+    (length,) = struct.unpack_from('<H', content, 8)
+    header = ast.literal_eval(content[10:10 + length].decode('latin1'))
+    values = array(_NPY_TYPES[header['descr']])
+    values.frombytes(content[10 + length:])
+    if sys.byteorder == 'big':
+        values.byteswap()
+    if header['shape'] == ():
+        return values[0]
+    return values.tolist()
+
+
+def _write_npz(path, items):
+    """Write the (name, value) `items` into the ``.npz`` file `path`."""
+    tmp_path = path + '.tmp'
+    try:
+        with zipfile.ZipFile(tmp_path, 'w') as z:
+            for name, value in items:
+                z.writestr(name + '.npy', _npy(value))
+        replace(tmp_path, path)
+    except BaseException:
+        try:
+            remove(tmp_path)
+        except OSError:
+            pass
+        raise
@@ -0,0 +1,1081 @@
+# -*- coding: utf-8 -*-
+
+"""Registry of all datasets and the generic fetch engine.
+
+Every dataset is described by a :class:`Dataset` in :data:`DATASETS`:
+the files to download, or the archive and its contents, and the
+directory and description of the dataset. A single engine,
+:func:`fetch_dataset`, fetches any registered dataset, and the
+``fetch_*`` functions of the dataset modules are generated from the
+registry with :func:`fetcher`.
+
+Adding a dataset therefore only requires an entry in :data:`DATASETS`,
+a description file in ``MDAnalysisData/descr``, a module with the
+generated ``fetch_*`` function and its documentation.
+"""
+
+from os.path import basename, dirname, exists, join, normpath
+from os import makedirs
+from collections import namedtuple
+import fnmatch
+import glob
+import inspect
+import os
+import textwrap
+import time
+
+import logging
+
+from .base import get_blob_store, get_data_home, get_data_path, get_verify
+from .base import MANIFEST
+from .base import _fetch_remote, _read_description, _verify
+from .base import _dataset_layers, _fetch_tar, _fetch_tar_members, _find_file
+from .base import _use_lock
+from .base import RemoteFileMetadata
+from .base import Bunch
+from .cache import _evict, _record_access
+from .offsets import get_offsets
+from .materialize import materialize as _materialize, npy_filename
+from .chunked import chunks_filename, convert as _convert
+from .variants import check_stride, stride_key, stride_trajectory
+from .variants import atoms_key, select_atoms, variant_location
+from .variants import TOPOLOGY_FORMATS
+
+logger = logging.getLogger(__name__)
+
+#: A registered dataset is a :func:`~collections.namedtuple` with fields
+#:
+#: - *name*: name of the dataset; its fetch function is ``fetch_<name>``
+#: - *directory*: directory of the dataset in the data home
+#: - *description*: description file in ``MDAnalysisData/descr``
+#: - *files*: dictionary of the
+#:   :class:`~MDAnalysisData.base.RemoteFileMetadata` of all files to
+#:   download; the keys are the keys of the returned
+#:   :class:`~MDAnalysisData.base.Bunch` (or ``'tarfile'`` for an archive)
+#: - *contents*: ``None`` for individual files; for an archive, a
+#:   dictionary of the keys of the returned Bunch and their paths in the
+#:   archive (a path, a :class:`Glob` or a :class:`Labeled`)
+#: - *module*: module of the fetch function
+#: - *title*: one-line summary of the fetch function
+#: - *reference*: Sphinx label of the documentation of the dataset
+#: - *size*: approximate download size
+#: - *docs*: descriptions of the keys of the returned Bunch (optional)
+#:
+Dataset = namedtuple('Dataset',
+                     ['name', 'directory', 'description', 'files',
+                      'contents', 'module', 'title', 'reference', 'size',
+                      'docs'],
+                     defaults=(None, {}))
+
+#: Files in an archive that match the glob `pattern`; there must be
+#: `count` of them. If `keyword` is given, the fetch function takes an
+#: argument of this name with the indices (in the order of the sorted
+#: filenames) of the files to unpack.
+Glob = namedtuple('Glob', ['pattern', 'count', 'keyword'], defaults=(None,))
+
+#: Files in an archive at `paths` with the `labels` (same order). If
+#: `keyword` is given, the fetch function takes an argument of this name
+#: with the labels of the files to unpack; all files in the directory of
+#: a selected file are unpacked.
+Labeled = namedtuple('Labeled', ['paths', 'labels', 'keyword'],
+                     defaults=(None,))
+
+#: All datasets, keyed by the name of their ``fetch_*`` function without
+#: the ``fetch_`` prefix.
+DATASETS = {dataset.name: dataset for dataset in [
+    Dataset(
+        name='adk_equilibrium',
+        directory='adk_equilibrium',
+        description='adk_equilibrium.rst',
+        files={
+            'topology': RemoteFileMetadata(
+                filename='adk4AKE.psf',
+                url='https://ndownloader.figshare.com/files/8672230',
+                checksum='1aa947d58fb41b6805dc1e7be4dbe65c6a8f4690f0bd7fc2ae03e7bd437085f4',
+            ),
+            'trajectory': RemoteFileMetadata(
+                filename='1ake_007-nowater-core-dt240ps.dcd',
+                url='https://ndownloader.figshare.com/files/8672074',
+                checksum='598fcbcfcc425f6eafbe9997238320fcacc6a4613ecce061e1521732bab734bf',
+            ),
+        },
+        contents=None,
+        module='MDAnalysisData.adk_equilibrium',
+        title="Load the AdK 1us equilibrium trajectory (without water)",
+        reference='adk-equilibrium-dataset',
+        size='161 MB'),
+    Dataset(
+        name='adk_transitions_DIMS',
+        directory='adk_transitions_DIMS',
+        description='adk_transitions_DIMS.rst',
+        files={
+            'tarfile': RemoteFileMetadata(
+                filename='DIMS.tar.gz',
+                url='https://ndownloader.figshare.com/files/13182490',
+                checksum='81dfd247da7084bc7f47889c098069978b61f8f8b4f7706841266d284bfd3b55',
+            ),
+        },
+        contents={
+            'topology': "DIMS/topologies/adk4ake.psf",
+            'trajectories': Glob("DIMS/trajectories/dims*_fit-core.dcd",
+                                 200, keyword='trajectories'),
+        },
+        module='MDAnalysisData.adk_transitions',
+        title="Load the AdK DIMS transitions dataset",
+        reference='adk-transitions-DIMS-dataset',
+        size='757 MB',
+        docs={'trajectories': "list with filenames of the trajectory "
+                              "ensemble"}),
+    Dataset(
+        name='adk_transitions_FRODA',
+        directory='adk_transitions_FRODA',
+        description='adk_transitions_FRODA.rst',
+        files={
+            'tarfile': RemoteFileMetadata(
+                filename='FRODA.tar.gz',
+                url='https://ndownloader.figshare.com/files/13182493',
+                checksum='fc2c90b9819fd07720e7effada033d4045663919ba7d2c8bd84f548dfbeee73c',
+            ),
+        },
+        contents={
+            'topology': "FRODA/topologies/1ake.pdb",
+            'trajectories': Glob("FRODA/trajectories/pathway*_fit-core.dcd",
+                                 200, keyword='trajectories'),
+        },
+        module='MDAnalysisData.adk_transitions',
+        title="Load the AdK FRODA transitions dataset",
+        reference='adk-transitions-FRODA-dataset',
+        size='539 MB',
+        docs={'trajectories': "list with filenames of the trajectory "
+                              "ensemble"}),
+    Dataset(
+        name='nhaa_equilibrium',
+        directory='nhaa_equilibrium',
+        description='nhaa_equilibrium.rst',
+        files={
+            'topology': RemoteFileMetadata(
+                filename='NhaA_non_water.gro',
+                url='https://ndownloader.figshare.com/files/13222709',
+                checksum='ae42f4cfcfe312476f9e5121fe47764a11aff962197799671c0c5a8f83637420',
+            ),
+            'trajectory': RemoteFileMetadata(
+                filename='NhaA_non_water.xtc',
+                url='https://ndownloader.figshare.com/files/13222712',
+                checksum='c9ab7ba8c9c271d535cfadebc33da1d90fbf00d9a01f48afedd0f7a703128eaf',
+            ),
+        },
+        contents=None,
+        module='MDAnalysisData.nhaa_equilibrium',
+        title="Load the NhaA 500 ns equilibrium trajectory (without water)",
+        reference='nhaa-equilibrium-dataset',
+        size='1.07 GB'),
+    Dataset(
+        name='ifabp_water',
+        directory='ifabp_water',
+        description='ifabp_water.rst',
+        files={
+            'topology': RemoteFileMetadata(
+                filename='ifabp_water.psf',
+                url='https://ndownloader.figshare.com/files/12980639',
+                checksum='ba40714318aabec537015dc550fe5bd5ac1ac0b853f5abdd2f0ae63af9cfcafa',
+            ),
+            'structure': RemoteFileMetadata(
+                filename='ifabp_water_0.pdb',
+                url='https://ndownloader.figshare.com/files/12980636',
+                checksum='8ccf5f75fd85385921c0cb77f00281a93b933fc1261c42fc9492f43983448a72',
+            ),
+            'trajectory': RemoteFileMetadata(
+                filename='rmsfit_ifabp_water_1.dcd',
+                url='https://ndownloader.figshare.com/files/12980642',
+                checksum='cebb48e58015abc8ff2f5bb7ba3eb7a289047f256351a8252bf1f29f9aaacf0e',
+            ),
+        },
+        contents=None,
+        module='MDAnalysisData.ifabp_water',
+        title="Load the I-FABP with water 0.5 ns equilibrium trajectory",
+        reference='ifabp-water-dataset',
+        size='74 MB',
+        docs={'structure': "Filename of a structure file in PDB format"}),
+    Dataset(
+        name='vesicle_lib',
+        directory='vesicle_library',
+        description='vesicle_lib.rst',
+        files={
+            'tarfile': RemoteFileMetadata(
+                filename='vesicles_1.0.tar.bz2',
+                url='https://ndownloader.figshare.com/files/5320846',
+                checksum='cba5a6221df664c79229a27d82faf779f63dee608f96a7b3b64ef209b93ec0d0',
+            ),
+        },
+        contents={
+            'structures': Labeled(["vesicles/1_75M/system.gro",
+                                   "vesicles/3_5M/system.gro",
+                                   "vesicles/10M/system.gro"],
+                                  ["1_75M", "3_5M", "10M"],
+                                  keyword='labels'),
+        },
+        module='MDAnalysisData.vesicles',
+        title="Load the vesicle library dataset",
+        reference='vesicle-library-dataset',
+        size='807 MB',
+        docs={'structures': "list with filenames of the different vesicle "
+                            "systems (in GRO format)",
+              'labels': "descriptors of the files in `dataset.structures` "
+                        "(same order), giving their approximate sizes in "
+                        "number of particles"}),
+    Dataset(
+        name='CG_fiber',
+        directory='CG_fiber',
+        description='CG_fiber.rst',
+        files={
+            'topology': RemoteFileMetadata(
+                filename='126chains.psf',
+                url='https://ndownloader.figshare.com/files/13374146',
+                checksum='3ddb654b68549ac2ad5107a4282899f41fad233d09ea572446031711af4e57da',
+            ),
+            'trajectory': RemoteFileMetadata(
+                filename='126chains.dcd',
+                url='https://ndownloader.figshare.com/files/13375838',
+                checksum='e0b47d422f31ec209ea810edcf6cf3830da04bb2e1540f520477c27f4433d849',
+            ),
+        },
+        contents=None,
+        module='MDAnalysisData.CG_fiber',
+        title="Load the CG fiber self-assembly trajectory",
+        reference='CG_fiber-dataset',
+        size='213 MB'),
+    Dataset(
+        name='PEG_1chain',
+        directory='PEG_1chain',
+        description='PEG_1chain.rst',
+        files={
+            'topology': RemoteFileMetadata(
+                filename='PEG.prmtop',
+                url='https://ndownloader.figshare.com/files/13532462',
+                checksum='2d7955b9a8cb6e008171e0c5a1c31e3e458246ea3ee7302281eafefafa7cede9',
+            ),
+            'trajectory': RemoteFileMetadata(
+                filename='PEG_03_prod.nc',
+                url='https://ndownloader.figshare.com/files/13532465',
+                checksum='b978714ec2f93d1cbe99564cb257959f0cb38872359aa745c8eba720a7d85225',
+            ),
+        },
+        contents=None,
+        module='MDAnalysisData.PEG_1chain',
+        title="Load the PEG polymer trajectory",
+        reference='PEG_1chain-dataset',
+        size='10 MB'),
+    Dataset(
+        name='membrane_peptide',
+        directory='membrane_peptide',
+        description='membrane_peptide.rst',
+        files={
+            'topology': RemoteFileMetadata(
+                filename='memb_pept.tpr',
+                url='https://ndownloader.figshare.com/files/14993171',
+                checksum='677a3ae55e35c24f37f2610eafa92d19285d1774731d6ffb9a99dfde39b8c437',
+            ),
+            'trajectory': RemoteFileMetadata(
+                filename='memb_pept.xtc',
+                url='https://ndownloader.figshare.com/files/14993174',
+                checksum='f9bdfee4e1aa69ccfeef21cb74703202f6728f514543c4125382bd5250773eb7',
+            ),
+        },
+        contents=None,
+        module='MDAnalysisData.membrane_peptide',
+        title="Load the helical peptide in DMPC membrane equilibrium "
+              "trajectory",
+        reference='membrane-peptide-dataset',
+        size='67 MB'),
+    Dataset(
+        name='yiip_equilibrium_short',
+        directory='yiip_equilibrium',
+        description='yiip_equilibrium.rst',
+        files={
+            'topology': RemoteFileMetadata(
+                filename='YiiP_system.pdb',
+                url='https://ndownloader.figshare.com/files/15286808',
+                checksum='3c2b96bbd2f95105e1a4f37140132ee073a947df8fe209a8170f09ca5b73e6cf',
+            ),
+            'trajectory': RemoteFileMetadata(
+                filename='YiiP_system_9ns_center.xtc',
+                url='https://ndownloader.figshare.com/files/15285461',
+                checksum='97f6a93acc1e330915338b290625d81d84928a7e4c1e5aed63d209881fbe268b',
+            ),
+        },
+        contents=None,
+        module='MDAnalysisData.yiip_equilibrium',
+        title="Load the YiiP 9 ns equilibrium trajectory",
+        reference='yiip-equilibrium-dataset'),
+    Dataset(
+        name='yiip_equilibrium_long',
+        directory='yiip_equilibrium',
+        description='yiip_equilibrium.rst',
+        files={
+            'topology': RemoteFileMetadata(
+                filename='YiiP_system.pdb',
+                url='https://ndownloader.figshare.com/files/15286808',
+                checksum='3c2b96bbd2f95105e1a4f37140132ee073a947df8fe209a8170f09ca5b73e6cf',
+            ),
+            'trajectory': RemoteFileMetadata(
+                filename='YiiP_system_90ns_center.xtc',
+                url='https://ndownloader.figshare.com/files/15294914',
+                checksum='de16552ad0eb46144a7fe980424b4f3b89bf6ae553512a246d5015e5a361033c',
+            ),
+        },
+        contents=None,
+        module='MDAnalysisData.yiip_equilibrium',
+        title="Load the YiiP 90 ns equilibrium trajectory",
+        reference='yiip-equilibrium-dataset',
+        size='3.82 GB'),
+]}
+
+#: Time (in seconds) after which a fetch that is answered from the
+#: in-process memo of results records the use of the dataset again (see
+#: :func:`~MDAnalysisData.cache.list_datasets`).
+ACCESS_INTERVAL = 60
+
+_fetchers = {}
+
+# results of fetch_dataset(), see _memoized()
+_results = {}
+
+# suffixes of the keys of files that are derived from the files of a
+# dataset (frame offsets, .npy coordinates and chunked stores)
+_DERIVED = ('_offsets', '_npy', '_chunks')
+
+
+def get_dataset(name):
+    """Return the registered :class:`Dataset` `name`.
+
+    Raises
+    ------
+    ValueError
+        if the dataset is not registered
+    """
+    try:
+        return DATASETS[name]
+    except KeyError:
+        raise ValueError("Unknown dataset {0}; choose from {1}".format(
+            name, ", ".join(DATASETS)))
+
+
+def _keywords(dataset):
+    """Return the selection keywords of `dataset` and their contents keys."""
+    return {entry.keyword: key
+            for key, entry in (dataset.contents or {}).items()
+            if isinstance(entry, (Glob, Labeled)) and entry.keyword}
+
+
+def fetch_dataset(name, data_home=None, download_if_missing=True,
+                  verify=None, keep_archive=True, stride=None, atoms=None,
+                  materialize=False, chunked=False, **selection):
+    """Fetch the registered dataset `name`.
+
+    This is the engine behind all ``fetch_*`` functions, which take the
+    same arguments.
+
+    Parameters
+    ----------
+    name : str
+        name of the dataset (see :data:`DATASETS`)
+    data_home : optional, default: None
+        Specify another download and cache folder for the datasets. By default
+        all MDAnalysisData data is stored in '~/MDAnalysis_data' subfolders.
+    download_if_missing : optional, default=True
+        If ``False``, raise a :exc:`IOError` if the data is not locally available
+        instead of trying to download the data from the source site.
+    verify : optional, default: None
+        How to check cached files: ``"exists"``, ``"stat"`` or ``"full"``
+        (see :func:`~MDAnalysisData.base.get_verify`). Files that fail the
+        check are downloaded again.
+    keep_archive : optional, default=True
+        Only for datasets that are downloaded as an archive: if ``False``,
+        the archive is not kept after it was unpacked.
+    stride : optional, default=None
+        Only for datasets with XTC or DCD trajectories: if an integer > 1,
+        every `stride`-th frame of every trajectory is written once into
+        a variant of the dataset (see :mod:`MDAnalysisData.variants`),
+        which is returned instead of the full trajectory.
+    atoms : optional, default=None
+        Only for datasets with XTC or DCD trajectories: a MDAnalysis
+        selection string or a list of atom indices. The selected atoms of
+        the topology, of every trajectory and of other coordinate files
+        (such as a PDB structure) are written once into a
+        variant of the dataset (see
+        :func:`~MDAnalysisData.variants.select_atoms`), which is returned
+        instead. This requires MDAnalysis.
+    materialize : optional, default=False
+        Only for datasets with DCD trajectories: if ``True``, the
+        coordinates of every trajectory are converted into a ``.npy`` file
+        that can be memory-mapped (see :mod:`MDAnalysisData.materialize`),
+        which is returned as ``<key>_npy``. This requires NumPy.
+    chunked : optional, default=False
+        Only for datasets with XTC or DCD trajectories: if ``True``, the
+        coordinates of every trajectory are converted into a chunked and
+        compressed store (see :mod:`MDAnalysisData.chunked`), which is
+        returned as ``<key>_chunks``. This requires NumPy (and MDAnalysis
+        for XTC trajectories).
+    **selection
+        Only for datasets that are downloaded as an archive: the
+        members to unpack (see :class:`Glob` and :class:`Labeled`).
+
+    Returns
+    -------
+    dataset : Bunch
+        the files of the dataset and its description ``DESCR``
+
+    Raises
+    ------
+    ValueError
+        if the dataset is not registered, a selection is invalid or the
+        dataset has no (DCD) trajectories to convert
+
+    Note
+    ----
+    The result is remembered for the rest of the process. As long as the
+    cached files are only checked for existence (``verify="exists"``, the
+    default), a repeated fetch of the same dataset and selection from the
+    same data path returns a copy of the remembered result after a few
+    :func:`os.stat` calls, unless files of the dataset were added,
+    removed or replaced in the meantime (see :func:`clear_results`).
+    """
+    dataset = get_dataset(name)
+    unknown = set(selection) - set(_keywords(dataset))
+    if unknown:
+        raise TypeError("fetch_{0}() got unexpected keyword arguments "
+                        "{1}".format(name, ", ".join(sorted(unknown))))
+    # selections are used several times, so iterators must be read once
+    selection = {keyword: None if value is None else list(value)
+                 for keyword, value in selection.items()}
+    if atoms is not None and not isinstance(atoms, str):
+        try:
+            atoms = list(atoms)
+        except TypeError:
+            # rejected by atoms_key()
+            pass
+    if materialize and not _materialized(dataset):
+        raise ValueError("Dataset {0} has no DCD trajectories to "
+                         "materialize".format(name))
+    if ((chunked or stride is not None or atoms is not None)
+            and not _trajectories(dataset)):
+        raise ValueError("Dataset {0} has no trajectories to "
+                         "convert".format(name))
+    if stride is not None:
+        check_stride(stride)
+    selected = None if atoms is None else atoms_key(atoms)
+    data_location = join(get_data_home(data_home=data_home),
+                         dataset.directory)
+    key = (name, tuple(get_data_path(data_home)), keep_archive, stride,
+           selected, materialize, chunked,
+           tuple(sorted((keyword, None if value is None else tuple(value))
+                        for keyword, value in selection.items())))
+    if get_verify(verify) == 'exists':
+        records = _memoized(key, dataset, data_location)
+        if records is not None:
+            return records
+
+    # keep other processes from evicting the dataset in the meantime
+    with _use_lock(data_location):
+        if not exists(data_location):
+            makedirs(data_location)
+        _record_access(data_location)
+
+        if dataset.contents is None:
+            records = _fetch_files(dataset, data_location,
+                                   data_home=data_home,
+                                   download_if_missing=download_if_missing,
+                                   verify=verify)
+        else:
+            records = _fetch_archive(dataset, data_location,
+                                     data_home=data_home,
+                                     download_if_missing=download_if_missing,
+                                     verify=verify, keep_archive=keep_archive,
+                                     selection=selection)
+
+        variant = []
+        if stride is not None and stride != 1:
+            variant.append(stride_key(stride))
+            location = variant_location(data_location, '-'.join(variant))
+            _derive(records, _trajectories(dataset), '',
+                    lambda path: stride_trajectory(
+                        path, stride, join(location, basename(path))))
+        if atoms is not None:
+            variant.append(selected)
+            _select_atoms(records,
+                          _trajectories(dataset) + _structures(dataset),
+                          atoms,
+                          variant_location(data_location, '-'.join(variant)))
+        if variant:
+            for file_type in _indexed(dataset):
+                records[file_type + '_offsets'] = get_offsets(
+                    records[file_type])
+        if materialize:
+            _derive(records, _materialized(dataset), '_npy',
+                    lambda path: _materialize(
+                        path, npy_filename(path, data_location)))
+        if chunked:
+            _derive(records, _trajectories(dataset), '_chunks',
+                    lambda path: _convert(
+                        path, chunks_filename(path, data_location)))
+
+    # files may have been written, so the size of the dataset is measured
+    # again when it is needed
+    _record_access(data_location, written=True)
+    _evict(data_location)
+    # every description is only read once per process
+    records.DESCR = _read_description(dataset.description)
+
+    _results[key] = (records, _signature(dataset, data_location, records),
+                     time.monotonic())
+    return _copy(records)
+
+
+def clear_results():
+    """Forget the results of all earlier fetches in this process.
+
+    :func:`fetch_dataset` remembers what it returned and returns it again
+    as long as the directories of the dataset have not changed; this
+    function makes the next fetch of every dataset check its files.
+    """
+    _results.clear()
+
+
+def _memoized(key, dataset, data_location):
+    """Return the remembered result of a fetch or ``None``.
+
+    A result is only used if the modification times of the dataset
+    directory, of its :data:`~MDAnalysisData.base.MANIFEST` and of the
+    directories of all its files are unchanged, i.e., no file was added,
+    removed or replaced since it was fetched.
+    """
+    try:
+        records, signature, accessed = _results[key]
+    except KeyError:
+        return None
+    if _signature(dataset, data_location, records) != signature:
+        del _results[key]
+        return None
+    now = time.monotonic()
+    if now - accessed > ACCESS_INTERVAL:
+        _record_access(data_location)
+        _results[key] = (records, signature, now)
+    return _copy(records)
+
+
+def _signature(dataset, data_location, records):
+    """Return the stat signature of the directories of a fetched dataset.
+
+    These are the directories of all returned files, including the files
+    that were derived from them. Directories that
+    do not exist (anymore) have the signature ``None``.
+    """
+    keys = list(dataset.files if dataset.contents is None
+                else dataset.contents)
+    directories = {data_location}
+    for key in keys + [key + suffix for key in keys for suffix in _DERIVED]:
+        paths = records.get(key)
+        if paths is None:
+            continue
+        for path in ([paths] if isinstance(paths, str) else paths):
+            directories.add(dirname(path))
+            if key.endswith('_chunks'):
+                # a chunked store is a directory itself
+                directories.add(path)
+    signature = []
+    for path in sorted(directories) + [join(data_location, MANIFEST)]:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            signature.append(None)
+        else:
+            signature.append((stat.st_ino, stat.st_size, stat.st_mtime_ns))
+    return signature
+
+
+def _copy(records):
+    """Return a copy of `records` that can be changed by the caller."""
+    return Bunch(**{key: list(value) if isinstance(value, list) else value
+                    for key, value in records.items()})
+
+
+def _fetch_files(dataset, data_location, data_home=None,
+                 download_if_missing=True, verify=None):
+    """Download the individual files of `dataset` (see :func:`fetch_dataset`)."""
+    records = Bunch()
+    layers = _dataset_layers(dataset.directory, data_home=data_home)
+    for file_type, meta in dataset.files.items():
+        shared_path = _find_file(meta, layers, verify=verify)
+        if shared_path is not None:
+            # verified copy in a read-only layer of the data path
+            records[file_type] = shared_path
+            continue
+        local_path = join(data_location, meta.filename)
+        records[file_type] = local_path
+
+        if (not exists(local_path)
+                or not _verify(local_path, meta.checksum, verify=verify)):
+            if not download_if_missing:
+                raise IOError("Data {0}={1} not found or invalid and "
+                              "`download_if_missing` is "
+                              "False".format(file_type, local_path))
+            logger.info("Downloading {0}: {1} -> {2}...".format(
+                file_type, meta.url, local_path))
+            _fetch_remote(meta, dirname=data_location,
+                          store=get_blob_store(data_home))
+    for file_type in _indexed(dataset):
+        records[file_type + '_offsets'] = get_offsets(records[file_type])
+    return records
+
+
+def _indexed(dataset):
+    """Return the keys of the XTC trajectories of `dataset`.
+
+    Their frame offsets are stored next to them (see
+    :func:`MDAnalysisData.offsets.get_offsets`).
+    """
+    return [file_type for file_type, meta in dataset.files.items()
+            if meta.filename.endswith('.xtc')]
+
+
+def _materialized(dataset):
+    """Return the keys of the DCD trajectories of `dataset`.
+
+    Their coordinates can be converted into ``.npy`` files (see
+    :func:`MDAnalysisData.materialize.materialize`).
+    """
+    if dataset.contents is None:
+        return [file_type for file_type, meta in dataset.files.items()
+                if meta.filename.endswith('.dcd')]
+    return [key for key, entry in dataset.contents.items()
+            if (entry if isinstance(entry, str) else
+                getattr(entry, 'pattern', '')).endswith('.dcd')]
+
+
+def _trajectories(dataset):
+    """Return the keys of the XTC and DCD trajectories of `dataset`."""
+    return _indexed(dataset) + _materialized(dataset)
+
+
+def _structures(dataset):
+    """Return the keys of the other coordinate files of `dataset`.
+
+    These are the files besides the topology and the trajectories in a
+    format that MDAnalysis can write (see
+    :data:`~MDAnalysisData.variants.TOPOLOGY_FORMATS`), e.g., the PDB
+    structure of ``ifabp_water``.
+    """
+    if dataset.contents is not None:
+        return []
+    return [file_type for file_type, meta in dataset.files.items()
+            if file_type != 'topology'
+            and file_type not in _trajectories(dataset)
+            and meta.filename.lower().endswith(TOPOLOGY_FORMATS)]
+
+
+def _derive(records, keys, suffix, convert):
+    """Add the files that `convert` derives from the files of `keys`.
+
+    They are stored in `records` under the keys with `suffix`.
+    """
+    for key in keys:
+        paths = records[key]
+        records[key + suffix] = (convert(paths) if isinstance(paths, str)
+                                 else [convert(path) for path in paths])
+
+
+def _select_atoms(records, keys, atoms, location):
+    """Replace the topology and the files of `keys` by selected atoms.
+
+    See :func:`MDAnalysisData.variants.select_atoms`.
+    """
+    trajectories = []
+    for key in keys:
+        paths = records[key]
+        trajectories += [paths] if isinstance(paths, str) else paths
+    records['topology'], trajectories = select_atoms(
+        records['topology'], trajectories, atoms, location)
+    for key in keys:
+        if isinstance(records[key], str):
+            records[key] = trajectories.pop(0)
+        else:
+            n = len(records[key])
+            records[key], trajectories = trajectories[:n], trajectories[n:]
+
+
+def _fetch_archive(dataset, data_location, data_home=None,
+                   download_if_missing=True, verify=None, keep_archive=True,
+                   selection=None):
+    """Download and unpack the archive of `dataset` (see :func:`fetch_dataset`)."""
+    meta = dataset.files['tarfile']
+    layers = _dataset_layers(dataset.directory, data_home=data_home)
+    store = get_blob_store(data_home)
+    keywords = _keywords(dataset)
+    selected = {keywords[keyword]: list(value)
+                for keyword, value in (selection or {}).items()
+                if value is not None}
+
+    if selected:
+        chosen = {}
+
+        def select(names):
+            chosen.update(_select(dataset, names, selected))
+            return [member for members in chosen.values()
+                    for member in members]
+
+        location, _ = _fetch_tar_members(
+            meta, data_location, select,
+            download_if_missing=download_if_missing, verify=verify,
+            keep_archive=keep_archive, store=store, layers=layers)
+        records = Bunch()
+        for key, entry in dataset.contents.items():
+            if isinstance(entry, str):
+                records[key] = join(location, entry)
+                continue
+            if isinstance(entry, Labeled):
+                labels = selected.get(key, entry.labels)
+                paths = dict(zip(entry.labels, entry.paths))
+                records[key] = [join(location, paths[label])
+                                for label in labels]
+            else:
+                records[key] = [normpath(join(location, member))
+                                for member in chosen[key]]
+            records['N_' + key] = len(records[key])
+            if isinstance(entry, Labeled):
+                records.labels = list(labels)
+        return records
+
+    location = _fetch_tar(meta, data_location,
+                          lambda location: _unpacked(dataset, location),
+                          download_if_missing=download_if_missing,
+                          verify=verify, keep_archive=keep_archive,
+                          store=store, layers=layers)
+
+    records = Bunch()
+    for key, entry in dataset.contents.items():
+        if isinstance(entry, str):
+            records[key] = join(location, entry)
+            if not exists(records[key]):
+                # should not happen...
+                raise RuntimeError("{0} file {1} is missing".format(
+                    key, records[key]))
+            continue
+        if isinstance(entry, Glob):
+            pattern = join(location, entry.pattern)
+            records[key] = sorted(glob.glob(pattern))
+            expected = entry.count
+        else:
+            pattern = entry.paths
+            records[key] = [join(location, path) for path in entry.paths
+                            if exists(join(location, path))]
+            expected = len(entry.paths)
+        records['N_' + key] = expected
+        if isinstance(entry, Labeled):
+            records.labels = entry.labels
+        if len(records[key]) != expected:
+            # should not happen...
+            raise RuntimeError("{0} files in {1} are incomplete: only {2} "
+                               "but should be {3}.".format(
+                                   key, pattern, len(records[key]),
+                                   expected))
+    return records
+
+
+def _unpacked(dataset, location):
+    """Return ``True`` if the contents of the archive of `dataset` exist.
+
+    Parameters
+    ----------
+    dataset : Dataset
+        dataset that is downloaded as an archive
+    location : str
+        directory that the archive is unpacked into
+    """
+    for entry in dataset.contents.values():
+        if isinstance(entry, str):
+            if not exists(join(location, entry)):
+                return False
+        elif isinstance(entry, Glob):
+            if len(glob.glob(join(location, entry.pattern))) != entry.count:
+                return False
+        elif not all(exists(join(location, path)) for path in entry.paths):
+            return False
+    return True
+
+
+def _select(dataset, names, selected):
+    """Return the members of the archive to unpack for a selection.
+
+    Parameters
+    ----------
+    dataset : Dataset
+        dataset that is downloaded as an archive
+    names : list of str
+        names of all members of the archive
+    selected : dict
+        selected indices (:class:`Glob`) or labels (:class:`Labeled`) for
+        keys of the contents of `dataset`
+
+    Returns
+    -------
+    members : dict
+        names of the members to unpack for each key of the contents
+    """
+    # member names may start with "./"
+    paths = {normpath(name): name for name in names}
+    members = {}
+    for key, entry in dataset.contents.items():
+        if isinstance(entry, str):
+            members[key] = [paths.get(entry, entry)]
+        elif isinstance(entry, Glob):
+            # numbered in the order of the sorted names
+            matching = sorted(fnmatch.filter(paths, entry.pattern))
+            try:
+                members[key] = [paths[matching[i]]
+                                for i in selected.get(key,
+                                                      range(len(matching)))]
+            except IndexError:
+                raise ValueError("{0} must be indices between 0 and "
+                                 "{1}".format(entry.keyword,
+                                              len(matching) - 1))
+        else:
+            labels = selected.get(key, entry.labels)
+            structures = dict(zip(entry.labels, entry.paths))
+            unknown = [label for label in labels if label not in structures]
+            if unknown:
+                raise ValueError("Unknown {0} {1}; choose from {2}".format(
+                    entry.keyword, ", ".join(unknown),
+                    ", ".join(entry.labels)))
+            # everything in the directories of the selected files
+            directories = tuple(dirname(structures[label]) + "/"
+                                for label in labels)
+            members[key] = [name for name in names
+                            if normpath(name).startswith(directories)]
+    return members
+
+
+def _indent(text):
+    """Return the lines of a wrapped and indented description."""
+    return textwrap.wrap(text, width=76, initial_indent="    ",
+                         subsequent_indent="    ")
+
+
+def _docstring(dataset):
+    """Return the docstring of the fetch function of `dataset`."""
+    size = " (about {})".format(dataset.size) if dataset.size else ""
+    lines = [
+        dataset.title,
+        "",
+        "Parameters",
+        "----------",
+        "data_home : optional, default: None",
+        "    Specify another download and cache folder for the datasets. By default",
+        "    all MDAnalysisData data is stored in '~/MDAnalysis_data' subfolders.",
+        "    This dataset is stored in ``<data_home>/{0}``{1}.".format(
+            dataset.directory, size),
+        "download_if_missing : optional, default=True",
+        "    If ``False``, raise a :exc:`IOError` if the data is not locally available",
+        "    instead of trying to download the data from the source site.",
+        "verify : optional, default: None",
+        "    How to check cached files: ``\"exists\"``, ``\"stat\"`` or ``\"full\"``",
+        "    (see :func:`~MDAnalysisData.base.get_verify`). Files that fail the",
+        "    check are downloaded again.",
+    ]
+    if dataset.contents is not None:
+        lines += [
+            "keep_archive : optional, default=True",
+            "    If ``False``, the archive is not kept after it was unpacked (a new",
+            "    download is unpacked while it arrives and never written to disk);",
+            "    the unpacked files are used as long as they exist.",
+        ]
+    returns = []
+    for key, entry in (dataset.contents or dataset.files).items():
+        if dataset.contents is None or isinstance(entry, str):
+            returns += ["dataset.{0} : filename".format(key)] + _indent(
+                dataset.docs.get(key, "Filename of the {} file".format(key)))
+            if key in _indexed(dataset):
+                returns += [
+                    "dataset.{0}_offsets : filename".format(key),
+                    "    Filename of the frame offsets of the {0} (used by".format(key),
+                    "    MDAnalysis for random access, see",
+                    "    :mod:`MDAnalysisData.offsets`); ``None`` if they could",
+                    "    not be stored next to the {0}".format(key),
+                ]
+            if key in _materialized(dataset):
+                returns += [
+                    "dataset.{0}_npy : filename".format(key),
+                    "    Filename of the coordinates of the {0} (only with".format(key),
+                    "    ``materialize=True``)",
+                ]
+            if key in _trajectories(dataset):
+                returns += [
+                    "dataset.{0}_chunks : filename".format(key),
+                    "    Directory of the chunked store of the {0} (only with".format(key),
+                    "    ``chunked=True``)",
+                ]
+            continue
+        noun = key.replace('_', ' ')
+        if entry.keyword and isinstance(entry, Glob):
+            lines += [
+                "{0} : optional, default=None".format(entry.keyword),
+                "    Indices of the {0} to unpack from the archive, e.g.,".format(noun),
+                "    ``range(10)`` for the first ten (in the order of their sorted",
+                "    filenames). ``None`` unpacks all {0}.".format(noun),
+            ]
+        elif entry.keyword:
+            lines += [
+                "{0} : optional, default=None".format(entry.keyword),
+                "    Labels of the {0} to unpack from the archive, e.g.,".format(noun),
+                "    ``[{0!r}]`` (see ``dataset.labels`` for all labels).".format(
+                    entry.labels[0]),
+                "    ``None`` unpacks all {0}.".format(noun),
+            ]
+        returns += [
+            "dataset.{0} : list".format(key)] + _indent(
+                dataset.docs.get(key, "list with filenames of the "
+                                 "{}".format(noun))) + [
+            "dataset.N_{0} : int".format(key),
+            "    number of {0}{1}".format(
+                noun, " (or selected with `{}`)".format(entry.keyword)
+                if entry.keyword else ""),
+        ]
+        if key in _materialized(dataset):
+            returns += [
+                "dataset.{0}_npy : list".format(key),
+                "    Filenames of the coordinates of the {0} (same order; only".format(noun),
+                "    with ``materialize=True``)",
+            ]
+        if key in _trajectories(dataset):
+            returns += [
+                "dataset.{0}_chunks : list".format(key),
+                "    Directories of the chunked stores of the {0} (same order;".format(noun),
+                "    only with ``chunked=True``)",
+            ]
+        if isinstance(entry, Labeled):
+            returns += ["dataset.labels : list"] + _indent(
+                dataset.docs.get('labels', "labels of the files in "
+                                 "`dataset.{}` (same order)".format(key)))
+    if _trajectories(dataset):
+        lines += [
+            "stride : optional, default=None",
+            "    If an integer > 1, return a trajectory with every `stride`-th frame",
+            "    instead of the full trajectory; it is written once from the full",
+            "    trajectory and stored in ``variants/stride<stride>`` of the dataset",
+            "    (see :mod:`MDAnalysisData.variants`).",
+            "atoms : optional, default=None",
+            "    MDAnalysis selection string (e.g., ``\"protein\"``) or list of atom",
+            "    indices: return a topology and trajectories with only these atoms",
+            "    instead; they are written once and stored in a variant of the",
+            "    dataset that is identified by a hash of the selection (see",
+            "    :func:`~MDAnalysisData.variants.select_atoms`; requires",
+            "    MDAnalysis).",
+        ]
+    if _materialized(dataset):
+        lines += [
+            "materialize : optional, default=False",
+            "    If ``True``, convert the coordinates of the trajectories once into",
+            "    ``.npy`` files with ``(n_frames, n_atoms, 3)`` arrays that can be",
+            "    memory-mapped (see :mod:`MDAnalysisData.materialize`; requires",
+            "    NumPy).",
+        ]
+    if _trajectories(dataset):
+        lines += [
+            "chunked : optional, default=False",
+            "    If ``True``, convert the coordinates of the trajectories once into",
+            "    chunked and compressed stores that can be read in parallel with",
+            "    :class:`~MDAnalysisData.chunked.ChunkedTrajectory` (see",
+            "    :mod:`MDAnalysisData.chunked`; requires NumPy and, for XTC",
+            "    trajectories, MDAnalysis).",
+        ]
+    lines += [
+        "",
+        "Returns",
+        "-------",
+        "dataset : dict-like object with the following attributes:",
+    ] + returns + [
+        "dataset.DESCR : string",
+        "    Description of the dataset.",
+        "",
+        "",
+        "See :ref:`{0}` for description.".format(dataset.reference),
+    ]
+    return "\n    ".join(lines) + "\n    "
+
+
+def fetcher(name):
+    """Return the ``fetch_*`` function of the registered dataset `name`.
+
+    The function calls :func:`fetch_dataset` and has the signature and
+    docstring of a hand-written fetch function for the dataset; it is
+    created once and belongs to the module of the dataset.
+    """
+    if name in _fetchers:
+        return _fetchers[name]
+    dataset = get_dataset(name)
+    parameters = [
+        inspect.Parameter('data_home', inspect.Parameter.POSITIONAL_OR_KEYWORD,
+                          default=None),
+        inspect.Parameter('download_if_missing',
+                          inspect.Parameter.POSITIONAL_OR_KEYWORD,
+                          default=True),
+        inspect.Parameter('verify', inspect.Parameter.POSITIONAL_OR_KEYWORD,
+                          default=None),
+    ]
+    if dataset.contents is not None:
+        parameters += [
+            inspect.Parameter(keyword, inspect.Parameter.POSITIONAL_OR_KEYWORD,
+                              default=default)
+            for keyword, default in [('keep_archive', True)] +
+            [(keyword, None) for keyword in _keywords(dataset)]]
+    if _trajectories(dataset):
+        parameters.append(
+            inspect.Parameter('stride', inspect.Parameter.POSITIONAL_OR_KEYWORD,
+                              default=None))
+        parameters.append(
+            inspect.Parameter('atoms', inspect.Parameter.POSITIONAL_OR_KEYWORD,
+                              default=None))
+    if _materialized(dataset):
+        parameters.append(
+            inspect.Parameter('materialize',
+                              inspect.Parameter.POSITIONAL_OR_KEYWORD,
+                              default=False))
+    if _trajectories(dataset):
+        parameters.append(
+            inspect.Parameter('chunked',
+                              inspect.Parameter.POSITIONAL_OR_KEYWORD,
+                              default=False))
+    signature = inspect.Signature(parameters)
+
+    def fetch(*args, **kwargs):
+        arguments = signature.bind(*args, **kwargs).arguments
+        return fetch_dataset(name, **arguments)
+
+    fetch.__name__ = fetch.__qualname__ = 'fetch_' + name
+    fetch.__module__ = dataset.module
+    fetch.__doc__ = _docstring(dataset)
+    fetch.__signature__ = signature
+    _fetchers[name] = fetch
+    return fetch
+
+
+def metadata(name):
+    """Return the description of dataset `name` in the format of the old modules.
+
+    The dictionary has the keys ``NAME`` (directory), ``DESCRIPTION``,
+    ``ARCHIVE`` (the *files* of the :class:`Dataset` itself) and
+    ``CONTENTS``.
+    """
+    dataset = get_dataset(name)
+    contents = {}
+    for key, entry in (dataset.contents or {}).items():
+        if isinstance(entry, str):
+            contents[key] = entry
+        elif isinstance(entry, Glob):
+            contents[key] = entry.pattern
+            contents['N_' + key] = entry.count
+        else:
+            contents[key] = entry.paths
+            contents['labels'] = entry.labels
+            contents['N_' + key] = len(entry.paths)
+    return {'NAME': dataset.directory, 'DESCRIPTION': dataset.description,
+            'ARCHIVE': dataset.files, 'CONTENTS': contents}
@@ -0,0 +1,356 @@
+# -*- coding: utf-8 -*-
+
+"""Persistent HTTP connections shared by all downloads.
+
+All ``fetch_*`` functions of a process download through one
+:class:`Session` (see :func:`get_session`), which
+
+- keeps connections to each server open and reuses them for later
+  requests instead of opening a new connection (and doing a new TLS
+  handshake) for every file or byte range,
+- remembers where a URL was redirected to (e.g., from the figshare
+  download URL to the storage server) so that further requests for the
+  same URL go directly to the target,
+- gives up on unresponsive servers after a timeout (environment variable
+  :envvar:`MDANALYSIS_DATA_TIMEOUT`) and
+- retries failed requests with exponential backoff (environment
+  variable :envvar:`MDANALYSIS_DATA_RETRIES`).
+
+Requests that have to go through a proxy (configured with the usual
+environment variables such as :envvar:`https_proxy`) are passed to
+:func:`urllib.request.urlopen` and are not pooled.
+"""
+
+from http.client import HTTPConnection, HTTPException, HTTPSConnection
+from urllib.error import HTTPError
+from urllib.parse import urljoin, urlsplit
+from urllib.request import Request, getproxies, proxy_bypass, urlopen
+from os import environ
+import os
+import threading
+import time
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+#: Default time (in seconds) to wait for a server to connect or to send
+#: data. It can be changed by setting the environment variable
+#: :envvar:`MDANALYSIS_DATA_TIMEOUT`.
+DEFAULT_TIMEOUT = 60
+
+#: Default number of times a failed request is repeated. It can be
+#: changed by setting the environment variable
+#: :envvar:`MDANALYSIS_DATA_RETRIES`.
+DEFAULT_RETRIES = 3
+
+#: Wait (in seconds) before the first retry; every further retry waits
+#: twice as long as the one before.
+BACKOFF = 0.5
+
+#: Time (in seconds) for which a temporary redirect is reused; permanent
+#: redirects are reused for the lifetime of the session.
+REDIRECT_TTL = 60
+
+#: Maximum number of idle connections kept open per server.
+MAX_IDLE = 16
+
+#: HTTP status codes of responses that are retried.
+RETRY_STATUS = (429, 500, 502, 503, 504)
+
+_MAX_REDIRECTS = 10
+_PERMANENT_REDIRECTS = (301, 308)
+_REDIRECTS = (301, 302, 303, 307, 308)
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_timeout(timeout=None):
+    """Return the timeout of network operations in seconds.
+
+    Parameters
+    ----------
+    timeout : float or None
+        ``None`` uses the environment variable
+        :envvar:`MDANALYSIS_DATA_TIMEOUT` or :data:`DEFAULT_TIMEOUT`.
+    """
+    if timeout is None:
+        timeout = environ.get('MDANALYSIS_DATA_TIMEOUT', DEFAULT_TIMEOUT)
+    timeout = float(timeout)
+    if timeout <= 0:
+        raise ValueError("timeout must be positive, not {}".format(timeout))
+    return timeout
+
+
+def get_retries(retries=None):
+    """Return how often a failed request is repeated.
+
+    Parameters
+    ----------
+    retries : int or None
+        ``None`` uses the environment variable
+        :envvar:`MDANALYSIS_DATA_RETRIES` or :data:`DEFAULT_RETRIES`.
+    """
+    if retries is None:
+        retries = environ.get('MDANALYSIS_DATA_RETRIES', DEFAULT_RETRIES)
+    retries = int(retries)
+    if retries < 0:
+        raise ValueError("retries must be at least 0, not {}".format(
+            retries))
+    return retries
+
+
+def get_session():
+    """Return the :class:`Session` shared by all downloads of the process."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = Session()
+        return _session
+
+
+class Session(object):
+    """Pool of keep-alive HTTP connections with cached redirects and retries.
+
+    A session can be used from several threads at the same time; every
+    request takes an idle connection to its server from the pool (or
+    opens a new one) and puts it back once the response was read
+    completely.
+
+    Parameters
+    ----------
+    timeout : float or None
+        timeout of network operations in seconds (see :func:`get_timeout`)
+    retries : int or None
+        number of retries of a failed request (see :func:`get_retries`)
+    """
+
+    def __init__(self, timeout=None, retries=None):
+        self.timeout = get_timeout(timeout)
+        self.retries = get_retries(retries)
+        self._lock = threading.Lock()
+        self._idle = {}
+        self._redirects = {}
+        self._pid = os.getpid()
+
+    def open(self, url, headers=None, timeout=None, retries=None):
+        """Send a GET request for `url` and return the response.
+
+        Connection errors and the status codes in :data:`RETRY_STATUS`
+        are retried after waiting :data:`BACKOFF` seconds, doubling the
+        wait with every retry.
+
+        Parameters
+        ----------
+        url : str
+            URL to request
+        headers : dict or None
+            additional request headers, e.g., ``Range``
+        timeout : float or None
+            timeout for this request instead of the one of the session
+        retries : int or None
+            retries for this request instead of the ones of the session
+
+        Returns
+        -------
+        response : _Response
+            file-like response with attributes ``status``, ``headers``
+            and ``url``; it must be closed (or used as a context manager)
+
+        Raises
+        ------
+        urllib.error.HTTPError
+            if the server responds with an error status
+        OSError or http.client.HTTPException
+            if the request failed after all retries
+        """
+        headers = dict(headers or {})
+        timeout = self.timeout if timeout is None else timeout
+        retries = self.retries if retries is None else retries
+        if self._proxied(url):
+            return urlopen(Request(url, headers=headers), timeout=timeout)
+        attempt = 0
+        while True:
+            target = self._redirected(url)
+            try:
+                response = self._follow(target, headers, timeout)
+            except (OSError, HTTPException) as err:
+                self._forget(url)
+                if attempt >= retries:
+                    raise
+                logger.debug("Request for {0} failed ({1}), "
+                             "retrying".format(url, err))
+            else:
+                if response.status < 400:
+                    self._remember(url, target, response)
+                    return response
+                response.close()
+                self._forget(url)
+                if target != url:
+                    # the cached target may have expired; not a retry
+                    continue
+                if (response.status not in RETRY_STATUS
+                        or attempt >= retries):
+                    raise HTTPError(url, response.status, response.reason,
+                                    response.headers, None)
+                logger.debug("Request for {0} returned {1}, "
+                             "retrying".format(url, response.status))
+            time.sleep(BACKOFF * 2**attempt)
+            attempt += 1
+
+    def close(self):
+        """Close all idle connections."""
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for connections in idle.values():
+            for connection in connections:
+                connection.close()
+
+    def _proxied(self, url):
+        parts = urlsplit(url)
+        return (parts.scheme in getproxies()
+                and not proxy_bypass(parts.hostname or ''))
+
+    def _redirected(self, url):
+        with self._lock:
+            target, expires = self._redirects.get(url, (url, None))
+        if expires is not None and time.monotonic() > expires:
+            self._forget(url)
+            return url
+        return target
+
+    def _remember(self, url, target, response):
+        if target != url or response.url == url:
+            # already cached or not redirected
+            return
+        expires = (None if response.permanent
+                   else time.monotonic() + REDIRECT_TTL)
+        with self._lock:
+            self._redirects[url] = (response.url, expires)
+
+    def _forget(self, url):
+        with self._lock:
+            self._redirects.pop(url, None)
+
+    def _follow(self, url, headers, timeout):
+        """Request `url` and follow redirects."""
+        permanent = True
+        for _ in range(_MAX_REDIRECTS):
+            response = self._request(url, headers, timeout)
+            location = response.headers.get('Location')
+            if response.status not in _REDIRECTS or location is None:
+                response.permanent = permanent
+                return response
+            permanent &= response.status in _PERMANENT_REDIRECTS
+            response.close()
+            url = urljoin(url, location)
+        raise HTTPException("Too many redirects for {}".format(url))
+
+    def _request(self, url, headers, timeout):
+        """Send a single request, on a fresh connection if a pooled one is stale."""
+        parts = urlsplit(url)
+        key = (parts.scheme, parts.hostname, parts.port)
+        path = parts.path or '/'
+        if parts.query:
+            path += '?' + parts.query
+        headers = dict({'Accept-Encoding': 'identity',
+                        'User-Agent': 'MDAnalysisData'}, **headers)
+        connection, reused = self._connection(key, parts, timeout)
+        while True:
+            try:
+                connection.request('GET', path, headers=headers)
+                response = connection.getresponse()
+            except (OSError, HTTPException):
+                connection.close()
+                if not reused:
+                    raise
+                # the server closed the idle connection
+                connection, reused = self._new_connection(parts, timeout), False
+                continue
+            return _Response(self, key, connection, response, url)
+
+    def _connection(self, key, parts, timeout):
+        with self._lock:
+            if self._pid != os.getpid():
+                # connections must not be shared with a forked parent
+                self._idle, self._pid = {}, os.getpid()
+            idle = self._idle.get(key)
+            connection = idle.pop() if idle else None
+        if connection is None:
+            return self._new_connection(parts, timeout), False
+        connection.timeout = timeout
+        if connection.sock is not None:
+            connection.sock.settimeout(timeout)
+        return connection, True
+
+    def _new_connection(self, parts, timeout):
+        if parts.scheme == 'https':
+            return HTTPSConnection(parts.hostname, parts.port,
+                                   timeout=timeout)
+        if parts.scheme == 'http':
+            return HTTPConnection(parts.hostname, parts.port,
+                                  timeout=timeout)
+        raise ValueError("Unsupported URL scheme {}".format(parts.scheme))
+
+    def _release(self, key, connection):
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            if len(idle) < MAX_IDLE and self._pid == os.getpid():
+                idle.append(connection)
+                return
+        connection.close()
+
+
+class _Response(object):
+    """Response of a pooled connection.
+
+    The connection is returned to the pool of the session when the body
+    was read completely and closed otherwise.
+    """
+
+    def __init__(self, session, key, connection, response, url):
+        self._session = session
+        self._key = key
+        self._connection = connection
+        self._response = response
+        self.url = url
+        self.status = response.status
+        self.reason = response.reason
+        self.headers = response.headers
+        self.permanent = False
+
+    def read(self, size=-1):
+        return self._response.read(None if size is None or size < 0
+                                   else size)
+
+    def readable(self):
+        return True
+
+    def close(self):
+        if self._connection is None:
+            return
+        connection, self._connection = self._connection, None
+        response = self._response
+        complete = (response.isclosed() and not response.will_close
+                    and not response.length)
+        if not complete and response.length is not None \
+                and response.length <= 2**16 and not response.will_close:
+            # read the rest of a short body (e.g., of a redirect) so that
+            # the connection can be reused
+            try:
+                response.read()
+                complete = not response.length
+            except (OSError, HTTPException):
+                complete = False
+        response.close()
+        if complete:
+            self._session._release(self._key, connection)
+        else:
+            connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
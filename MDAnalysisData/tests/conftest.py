@@ -1,5 +1,271 @@
-# see also pyproject.toml pytest.markers
+# Fixtures: a local HTTP server with Range requests and tar/XTC/DCD builders.
+
+import hashlib
+import io
+import os
+import tarfile
+import re
+import struct
+import threading
+import time
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from MDAnalysisData import base
+from MDAnalysisData import adk_equilibrium
+from MDAnalysisData import vesicles
+from MDAnalysisData import yiip_equilibrium
+
+
 def pytest_configure(config):
     config.addinivalue_line(
         "markers", "online: will fetch remote files (deselect with with '-m \"not online\"')",
     )
+
+
+class RangeRequestHandler(SimpleHTTPRequestHandler):
+    """Serve files from a directory with support for ``Range`` requests.
+
+    The behavior can be changed through the `server` attributes
+    ``ranges`` (honor ``Range`` headers), ``fail_after`` (close the
+    connection after sending that many bytes of a body), ``delay``
+    (seconds to wait before responding), ``throttle`` (seconds to wait
+    before each block of 64 KiB of a body), ``redirects`` (dict of paths
+    that are redirected to other URLs), ``errors`` (list of status codes
+    that the next requests are answered with) and ``requests`` (list of
+    ``(method, path, range)`` of all received requests). The addresses of
+    all clients are collected in ``clients``. Connections are kept alive.
+    """
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def send_head(self):
+        self.server.requests.append((self.command, self.path,
+                                     self.headers.get('Range')))
+        self.server.clients.add(self.client_address)
+        time.sleep(self.server.delay)
+        if self.server.errors:
+            self.send_error(self.server.errors.pop(0))
+            return None
+        if self.path in self.server.redirects:
+            self.send_response(302)
+            self.send_header("Location", self.server.redirects[self.path])
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return None
+        path = self.translate_path(self.path)
+        if not os.path.isfile(path):
+            self.send_error(404, "File not found")
+            return None
+        size = os.path.getsize(path)
+        start, end = 0, size - 1
+        match = re.match(r'bytes=(\d*)-(\d*)', self.headers.get('Range', ''))
+        ranged = self.server.ranges and match is not None
+        if ranged:
+            if match.group(1):
+                start = int(match.group(1))
+                if match.group(2):
+                    end = min(int(match.group(2)), size - 1)
+            else:
+                start = max(size - int(match.group(2)), 0)
+            if start >= size:
+                self.send_response(416)
+                self.send_header("Content-Range", "bytes */{}".format(size))
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return None
+            self.send_response(206)
+            self.send_header("Content-Range",
+                             "bytes {}-{}/{}".format(start, end, size))
+        else:
+            self.send_response(200)
+        if self.server.ranges:
+            self.send_header("Accept-Ranges", "bytes")
+        self.send_header("Content-Type", "application/octet-stream")
+        self.send_header("Content-Length", str(end - start + 1))
+        self.end_headers()
+        f = open(path, 'rb')
+        f.seek(start)
+        self._remaining = end - start + 1
+        return f
+
+    def copyfile(self, source, outputfile):
+        remaining = self._remaining
+        limit = self.server.fail_after
+        if limit is not None:
+            remaining = min(remaining, limit)
+        while remaining > 0:
+            buffer = source.read(min(remaining, 64 * 1024))
+            if not buffer:
+                break
+            time.sleep(self.server.throttle)
+            outputfile.write(buffer)
+            remaining -= len(buffer)
+        if limit is not None:
+            # simulate a dropped connection
+            self.close_connection = True
+
+
+class LocalServer(object):
+    """Local HTTP server that serves the files in `root`."""
+
+    def __init__(self, root):
+        self.root = str(root)
+        handler = partial(RangeRequestHandler, directory=self.root)
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 0), handler)
+        self.httpd.daemon_threads = True
+        self.httpd.ranges = True
+        self.httpd.fail_after = None
+        self.httpd.delay = 0
+        self.httpd.throttle = 0
+        self.httpd.redirects = {}
+        self.httpd.errors = []
+        self.httpd.requests = []
+        self.httpd.clients = set()
+        self.thread = threading.Thread(target=self.httpd.serve_forever,
+                                       kwargs={'poll_interval': 0.01},
+                                       daemon=True)
+        self.thread.start()
+
+    @property
+    def requests(self):
+        return self.httpd.requests
+
+    def url(self, filename):
+        return "http://127.0.0.1:{}/{}".format(self.httpd.server_port,
+                                               filename)
+
+    def add_file(self, filename, content):
+        """Serve `content` (bytes) as `filename`.
+
+        Returns the :class:`~MDAnalysisData.base.RemoteFileMetadata`
+        that describes the served file.
+        """
+        with open(os.path.join(self.root, filename), 'wb') as f:
+            f.write(content)
+        return base.RemoteFileMetadata(
+            filename=filename, url=self.url(filename),
+            checksum=hashlib.sha256(content).hexdigest())
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+@pytest.fixture
+def local_server(tmp_path_factory):
+    server = LocalServer(tmp_path_factory.mktemp("remote"))
+    yield server
+    server.close()
+
+
+@pytest.fixture
+def mirror_server(tmp_path_factory):
+    server = LocalServer(tmp_path_factory.mktemp("mirror"))
+    yield server
+    server.close()
+
+
+@pytest.fixture
+def remote_content():
+    # a few MB of non-repetitive data so that downloads take several chunks
+    return b"".join(hashlib.sha256(str(i).encode()).digest()
+                    for i in range(3 * 2**16))
+
+
+def make_tar(members, mode="w:bz2"):
+    """Return a tar archive (bytes) with the files in dict `members`."""
+    data = io.BytesIO()
+    with tarfile.open(fileobj=data, mode=mode) as tar:
+        for name, content in members.items():
+            info = tarfile.TarInfo(name)
+            info.size = len(content)
+            tar.addfile(info, io.BytesIO(content))
+    return data.getvalue()
+
+
+def make_xtc(n_frames, n_atoms=20, magic=1995):
+    """Return an XTC trajectory (bytes) with headers and dummy coordinates."""
+    frames = []
+    for i in range(n_frames):
+        frame = struct.pack('>iiif9fi', magic, n_atoms, i, 10.0 * i,
+                            *([5.0] * 9), n_atoms)
+        if n_atoms <= 9:
+            frame += struct.pack('>{}f'.format(3 * n_atoms),
+                                 *range(3 * n_atoms))
+        else:
+            n_bytes = 40 + 3 * i
+            frame += struct.pack('>f7i', 1000.0, *range(7))
+            frame += struct.pack('>i' if magic == 1995 else '>q', n_bytes)
+            frame += bytes(range(n_bytes)) + b"\0" * (-n_bytes % 4)
+        frames.append(frame)
+    return b"".join(frames)
+
+
+def dcd_coordinates(frame, atom, axis):
+    """Coordinate of the trajectories written by :func:`make_dcd`."""
+    return 1000.0 * frame + 3 * atom + axis
+
+
+def make_dcd(n_frames, n_atoms=20, unitcell=True, endian='<'):
+    """Return a CHARMM DCD trajectory (bytes) with known coordinates."""
+    def record(fmt, *values):
+        data = struct.pack(endian + fmt, *values)
+        size = struct.pack(endian + 'i', len(data))
+        return size + data + size
+
+    # nframes, istart, nsavc, ..., delta, unit cell, 4 dims, ..., version
+    icntrl = [n_frames, 0, 1, 0, 0, 0, 0, 0, 0]
+    parts = [
+        record('4s9if10i', b'CORD', *icntrl, 0.1, int(unitcell), 0,
+               *([0] * 7), 24),
+        record('i80s', 1, b'* made by make_dcd'.ljust(80)),
+        record('i', n_atoms),
+    ]
+    for i in range(n_frames):
+        if unitcell:
+            parts.append(record('6d', 10.0, 90.0, 11.0, 90.0, 90.0, 12.0))
+        for axis in range(3):
+            parts.append(record('{}f'.format(n_atoms), *(
+                dcd_coordinates(i, j, axis) for j in range(n_atoms))))
+    return b"".join(parts)
+
+
+@pytest.fixture
+def local_datasets(local_server, monkeypatch):
+    """Serve adk_equilibrium, vesicle_lib and yiip_equilibrium locally."""
+    for file_type, meta in adk_equilibrium.ARCHIVE.items():
+        monkeypatch.setitem(
+            adk_equilibrium.ARCHIVE, file_type,
+            local_server.add_file(meta.filename, file_type.encode() * 1000))
+    for traj_len, archive in yiip_equilibrium.ARCHIVE.items():
+        for file_type, meta in archive.items():
+            content = (make_xtc(len(meta.filename))
+                       if meta.filename.endswith('.xtc')
+                       else meta.filename.encode() * 1000)
+            monkeypatch.setitem(
+                archive, file_type,
+                local_server.add_file(meta.filename, content))
+    metadata = vesicles.METADATA['vesicle_lib']
+    meta = metadata['ARCHIVE']['tarfile']
+    monkeypatch.setitem(
+        metadata['ARCHIVE'], 'tarfile',
+        local_server.add_file(meta.filename, make_tar(
+            {path: path.encode()
+             for path in metadata['CONTENTS']['structures']})))
+    return local_server
+
+
+@pytest.fixture
+def adk_dcd(local_datasets, monkeypatch):
+    """Serve adk_equilibrium with a DCD trajectory of 300 frames of 7 atoms."""
+    meta = adk_equilibrium.ARCHIVE['trajectory']
+    monkeypatch.setitem(
+        adk_equilibrium.ARCHIVE, 'trajectory',
+        local_datasets.add_file(meta.filename, make_dcd(300, n_atoms=7)))
+    return local_datasets
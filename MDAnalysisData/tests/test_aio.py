@@ -0,0 +1,149 @@
+# -*- coding: utf-8 -*-
+
+import asyncio
+import inspect
+import os
+import time
+
+import pytest
+
+from MDAnalysisData import adk_equilibrium
+from MDAnalysisData import aio
+from MDAnalysisData import base
+from MDAnalysisData import datasets
+from MDAnalysisData import session
+
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+
+def test_async_fetchers():
+    fetchers = [name for name in datasets.__all__
+                if name.startswith("fetch_") and name != "fetch_many"]
+    for name in fetchers:
+        async_fetch = getattr(datasets, "async_" + name)
+        assert inspect.iscoroutinefunction(async_fetch)
+        assert async_fetch.__name__ == "async_" + name
+        assert (inspect.signature(async_fetch) ==
+                inspect.signature(getattr(datasets, name)))
+
+
+def test_unknown():
+    with pytest.raises(ValueError, match="Unknown dataset"):
+        run(aio.async_fetch("adk"))
+
+
+def test_async_fetch(local_datasets, tmpdir):
+    data = run(datasets.async_fetch_adk_equilibrium(str(tmpdir)))
+    n_requests = len(local_datasets.requests)
+    with open(data.trajectory, 'rb') as f:
+        assert f.read() == b"trajectory" * 1000
+    assert data == datasets.fetch_adk_equilibrium(data_home=str(tmpdir))
+    assert len(local_datasets.requests) == n_requests
+
+    # cached files are verified in the executor
+    run(datasets.async_fetch_adk_equilibrium(data_home=str(tmpdir),
+                                             verify="full"))
+    assert len(local_datasets.requests) == n_requests
+
+
+def test_async_fetch_unpacked(local_datasets, tmpdir):
+    # an archive that was removed after unpacking is not downloaded again
+    datasets.fetch_vesicle_lib(data_home=str(tmpdir), keep_archive=False)
+    n_requests = len(local_datasets.requests)
+    data = run(datasets.async_fetch_vesicle_lib(data_home=str(tmpdir)))
+    assert len(local_datasets.requests) == n_requests
+    assert all(os.path.exists(path) for path in data.structures)
+
+
+def test_async_fetch_many(local_datasets, tmpdir):
+    data = run(datasets.async_fetch_many(
+        ["adk_equilibrium", "vesicle_lib", "yiip_equilibrium_short"],
+        data_home=str(tmpdir)))
+    assert sorted(data) == ["adk_equilibrium", "vesicle_lib",
+                            "yiip_equilibrium_short"]
+    assert all(os.path.exists(path)
+               for path in data["vesicle_lib"].structures)
+    assert os.path.exists(data["yiip_equilibrium_short"].trajectory)
+
+
+def test_loop_not_blocked(local_datasets, tmpdir):
+    local_datasets.httpd.delay = 0.2
+
+    async def main():
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        task = asyncio.create_task(ticker())
+        data = await datasets.async_fetch_adk_equilibrium(
+            data_home=str(tmpdir))
+        task.cancel()
+        return data, ticks
+
+    data, ticks = run(main())
+    assert os.path.exists(data.topology)
+    assert ticks >= 10
+
+
+@pytest.mark.parametrize('parallel', [False, True])
+def test_cancel(local_datasets, tmpdir, monkeypatch, parallel):
+    # 16 MiB at 64 KiB per 20 ms take more than 5 s to download
+    meta = adk_equilibrium.ARCHIVE['trajectory']
+    content = os.urandom(16 * 1024**2)
+    monkeypatch.setitem(adk_equilibrium.ARCHIVE, 'trajectory',
+                        local_datasets.add_file(meta.filename, content))
+    if parallel:
+        monkeypatch.setattr(base, 'PARALLEL_MIN_SIZE', 1024**2)
+        monkeypatch.setattr(base, '_SEGMENT_SIZE', 4 * 1024**2)
+    local_datasets.httpd.throttle = 0.02
+    part = tmpdir.join("adk_equilibrium", meta.filename + ".part")
+
+    async def main():
+        task = asyncio.create_task(datasets.async_fetch_adk_equilibrium(
+            data_home=str(tmpdir)))
+        while not (part.exists() and part.size()):
+            await asyncio.sleep(0.01)
+        start = time.perf_counter()
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        return time.perf_counter() - start
+
+    assert run(main()) < 2
+    # the partial download is kept for resuming
+    assert part.exists()
+    assert not tmpdir.join("adk_equilibrium", meta.filename).exists()
+    assert tmpdir.join("adk_equilibrium", meta.filename + ".part.ranges"
+                       ).exists() == parallel
+
+    # the locks were released and the download is resumed
+    local_datasets.httpd.throttle = 0
+    size = part.size()
+    n_requests = len(local_datasets.requests)
+    data = datasets.fetch_adk_equilibrium(data_home=str(tmpdir))
+    with open(data.trajectory, 'rb') as f:
+        assert f.read() == content
+    ranges = [request[2] for request in local_datasets.requests[n_requests:]
+              if request[1].endswith(meta.filename)]
+    if parallel:
+        # the recorded segments are fetched without probing the file again
+        assert len(ranges) == 4 and None not in ranges
+    else:
+        assert ranges == ["bytes={}-".format(size)]
+
+
+def test_session(local_datasets, tmpdir, mocker):
+    # downloads use the session with its retries and connection pool
+    get = mocker.patch('MDAnalysisData.session.Session.open',
+                       autospec=True, side_effect=session.Session.open)
+    local_datasets.httpd.errors = [503]
+    data = run(datasets.async_fetch_adk_equilibrium(data_home=str(tmpdir)))
+    with open(data.trajectory, 'rb') as f:
+        assert f.read() == b"trajectory" * 1000
+    assert get.called
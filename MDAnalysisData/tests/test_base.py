@@ -1,13 +1,21 @@
 # -*- coding: utf-8 -*-
 
 from urllib.request import urlretrieve
+from concurrent.futures import ProcessPoolExecutor
+import io
+import multiprocessing
 import pathlib
+import pickle
 import os
 import os.path
+import tarfile
+import threading
+import time
 
 import pytest
 
 from MDAnalysisData import base
+from MDAnalysisData.tests.conftest import make_tar
 from MDAnalysisData import adk_equilibrium
 
 @pytest.fixture(scope="module")
@@ -43,6 +51,12 @@ class TestBunch(object):
     def test_dir(self, bunch):
         assert dir(bunch) == list(bunch.keys())
 
+    def test_pickle(self, bunch):
+        restored = pickle.loads(pickle.dumps(bunch))
+        assert isinstance(restored, base.Bunch)
+        assert restored == bunch
+        assert dir(restored) == list(bunch.keys())
+
 
 def test_read_description():
     descr = base._read_description("adk_equilibrium.rst")
@@ -64,6 +78,19 @@ def test_sha256(tmpdir, some_text):
         checksum = base._sha256(filename)
     assert checksum == "4446bfb2ec5dedfbd981d059d6005f5144b067b392a00e3bcf98f8302ec8f765"
 
+
+@pytest.mark.parametrize('n_connections', [1, 3])
+def test_fetch_remote_no_reread(local_server, remote_content, tmpdir, mocker,
+                                monkeypatch, n_connections):
+    # the checksum is computed while downloading
+    monkeypatch.setattr(base, 'PARALLEL_MIN_SIZE', 2**20)
+    monkeypatch.setattr(base, '_SEGMENT_SIZE', 2**20)
+    remote = local_server.add_file("data.bin", remote_content)
+    sha = mocker.patch('MDAnalysisData.base._sha256')
+    base._fetch_remote(remote, dirname=str(tmpdir),
+                       n_connections=n_connections)
+    assert not sha.called
+
 @pytest.mark.parametrize('data_home,location', [
     (None,
      pathlib.Path("~/MDAnalysis_data").expanduser()),
@@ -73,6 +100,24 @@ def test_sha256(tmpdir, some_text):
 def test_get_data_home(data_home, location):
     assert base.get_data_home(data_home=data_home) == str(location)
 
+def test_get_data_path(tmpdir, monkeypatch):
+    shared, user = str(tmpdir.join("shared")), str(tmpdir.join("user"))
+    monkeypatch.delenv('MDANALYSIS_DATA', raising=False)
+    monkeypatch.setenv('MDANALYSIS_DATA_PATH', os.pathsep.join([shared, user]))
+    assert base.get_data_home() == user
+    assert base.get_data_path() == [shared, user]
+    assert base._dataset_layers("adk") == [os.path.join(shared, "adk")]
+    # the read-only layers are not created
+    assert not os.path.exists(shared)
+    # an explicit data home is the only layer
+    assert base.get_data_path(user) == [user]
+
+    other = str(tmpdir.join("other"))
+    monkeypatch.setenv('MDANALYSIS_DATA', other)
+    assert base.get_data_home() == other
+    assert base.get_data_path() == [shared, user, other]
+
+
 def test_clear_data_home(tmpdir, some_text):
     data_home_path = tmpdir.join("MDAnalysis_data_test")
     data_home = base.get_data_home(data_home=str(data_home_path))
@@ -104,30 +149,541 @@ def test_fetch_remote(remote_topology, tmpdir):
     assert os.path.dirname(filename) == str(tmpdir)
 
 
-def test_fetch_remote_sha_fail(remote_topology, mocker):
-    # Mock a SHA fail and check error message
-    mocker.patch('MDAnalysisData.base.urlretrieve')
-    mock_sha = mocker.patch('MDAnalysisData.base._sha256',
-                            return_value='12345678')
+def test_fetch_remote_sha_fail(local_server, remote_content, tmpdir):
+    remote = local_server.add_file("data.bin", remote_content)._replace(
+        checksum='12345678')
 
     with pytest.raises(IOError,
                        match='.+? file may be corrupted'):
-        base._fetch_remote(remote_topology)
+        base._fetch_remote(remote, dirname=str(tmpdir))
+    # neither the corrupted file nor the partial download are kept
+    assert not tmpdir.join("data.bin").exists()
+    assert not tmpdir.join("data.bin" + base.PARTIAL_SUFFIX).exists()
 
 
 @pytest.mark.parametrize('dirname', ['', 'thisplace'])
-def test_fetch_remote_sha_success(remote_topology, mocker, dirname):
-    # Mocked offline successful remote
-    mocker.patch('MDAnalysisData.base.urlretrieve')
-    # Mock a SHA success
-    mocker.patch('MDAnalysisData.base._sha256',
-                 return_value=remote_topology.checksum)
-    exp = os.path.join(dirname, remote_topology.filename)
-    assert base._fetch_remote(remote_topology, dirname=dirname) == exp
+def test_fetch_remote_sha_success(local_server, remote_content, tmpdir,
+                                  dirname):
+    remote = local_server.add_file("data.bin", remote_content)
+    exp = os.path.join(dirname, remote.filename)
+    with tmpdir.as_cwd():
+        if dirname:
+            os.mkdir(dirname)
+        assert base._fetch_remote(remote, dirname=dirname) == exp
+        with open(exp, "rb") as f:
+            assert f.read() == remote_content
+        assert not os.path.exists(exp + base.PARTIAL_SUFFIX)
+
+
+class TestResume(object):
+    @pytest.fixture
+    def remote(self, local_server, remote_content):
+        return local_server.add_file("data.bin", remote_content)
+
+    def test_interrupted(self, local_server, remote, tmpdir):
+        local_server.httpd.fail_after = 100000
+        with pytest.raises(Exception):
+            base._fetch_remote(remote, dirname=str(tmpdir))
+        assert not tmpdir.join(remote.filename).exists()
+        part = tmpdir.join(remote.filename + base.PARTIAL_SUFFIX)
+        assert part.size() == 100000
+
+    @pytest.mark.parametrize('offset', [1, 100000, 3 * 2**21 - 1])
+    def test_resume(self, local_server, remote, remote_content, tmpdir,
+                    offset):
+        part = tmpdir.join(remote.filename + base.PARTIAL_SUFFIX)
+        part.write_binary(remote_content[:offset])
+
+        path = base._fetch_remote(remote, dirname=str(tmpdir))
+
+        with open(path, "rb") as f:
+            assert f.read() == remote_content
+        assert not part.exists()
+        assert local_server.requests[-1][2] == "bytes={}-".format(offset)
+
+    def test_resume_complete(self, local_server, remote, remote_content,
+                             tmpdir):
+        # server answers 416 because there is nothing left to send
+        part = tmpdir.join(remote.filename + base.PARTIAL_SUFFIX)
+        part.write_binary(remote_content)
+
+        path = base._fetch_remote(remote, dirname=str(tmpdir))
+
+        with open(path, "rb") as f:
+            assert f.read() == remote_content
+
+    def test_no_range_support(self, local_server, remote, remote_content,
+                              tmpdir):
+        local_server.httpd.ranges = False
+        part = tmpdir.join(remote.filename + base.PARTIAL_SUFFIX)
+        part.write_binary(remote_content[:1000])
+
+        path = base._fetch_remote(remote, dirname=str(tmpdir))
+
+        with open(path, "rb") as f:
+            assert f.read() == remote_content
+
+    def test_interrupt_and_resume(self, local_server, remote, remote_content,
+                                  tmpdir):
+        local_server.httpd.fail_after = 3 * 2**20
+        with pytest.raises(Exception):
+            base._fetch_remote(remote, dirname=str(tmpdir))
+        local_server.httpd.fail_after = None
+
+        path = base._fetch_remote(remote, dirname=str(tmpdir))
+
+        with open(path, "rb") as f:
+            assert f.read() == remote_content
+        assert local_server.requests[-1][2] == "bytes={}-".format(3 * 2**20)
+
+
+class TestParallel(object):
+    @pytest.fixture
+    def remote(self, local_server, remote_content, monkeypatch):
+        monkeypatch.setattr(base, 'PARALLEL_MIN_SIZE', 2**20)
+        monkeypatch.setattr(base, '_SEGMENT_SIZE', 2**20)
+        return local_server.add_file("data.bin", remote_content)
+
+    @staticmethod
+    def ranges(local_server):
+        return sorted(r for method, path, r in local_server.requests
+                      if r is not None)
+
+    def test_download(self, local_server, remote, remote_content, tmpdir):
+        path = base._fetch_remote(remote, dirname=str(tmpdir),
+                                  n_connections=3)
+
+        with open(path, "rb") as f:
+            assert f.read() == remote_content
+        assert not tmpdir.join(remote.filename + base.PARTIAL_SUFFIX).exists()
+        assert self.ranges(local_server) == [
+            "bytes={}-{}".format(start, start + 2**20 - 1)
+            for start in range(0, len(remote_content), 2**20)]
+
+    def test_no_range_support(self, local_server, remote, remote_content,
+                              tmpdir):
+        local_server.httpd.ranges = False
+        path = base._fetch_remote(remote, dirname=str(tmpdir),
+                                  n_connections=3)
+
+        with open(path, "rb") as f:
+            assert f.read() == remote_content
+        assert local_server.requests == [('GET', '/data.bin', None)]
+
+    def test_small_file(self, local_server, remote_content, tmpdir):
+        remote = local_server.add_file("data.bin", remote_content)
+        base._fetch_remote(remote, dirname=str(tmpdir), n_connections=3)
+        assert local_server.requests == [('GET', '/data.bin', None)]
+
+    def test_single_connection(self, local_server, remote, tmpdir,
+                               monkeypatch):
+        monkeypatch.setenv('MDANALYSIS_DATA_CONNECTIONS', '1')
+        base._fetch_remote(remote, dirname=str(tmpdir))
+        assert local_server.requests == [('GET', '/data.bin', None)]
+
+    def test_resume(self, local_server, remote, remote_content, tmpdir):
+        # segments 0 and 2 were completed before the interruption
+        part = tmpdir.join(remote.filename + base.PARTIAL_SUFFIX)
+        data = bytearray(len(remote_content))
+        for start in (0, 2 * 2**20):
+            data[start:start + 2**20] = remote_content[start:start + 2**20]
+        part.write_binary(bytes(data))
+        tmpdir.join(remote.filename + base.PARTIAL_SUFFIX + ".ranges").write(
+            "[0, {}]".format(2 * 2**20))
+
+        path = base._fetch_remote(remote, dirname=str(tmpdir),
+                                  n_connections=2)
+
+        with open(path, "rb") as f:
+            assert f.read() == remote_content
+        assert self.ranges(local_server) == [
+            "bytes={}-{}".format(start, start + 2**20 - 1)
+            for start in (2**20, 3 * 2**20, 4 * 2**20, 5 * 2**20)]
+
+    def test_interrupted(self, local_server, remote, tmpdir):
+        local_server.httpd.fail_after = 1000
+        with pytest.raises(IOError, match="interrupted"):
+            base._fetch_remote(remote, dirname=str(tmpdir), n_connections=2)
+        assert not tmpdir.join(remote.filename).exists()
+        assert tmpdir.join(remote.filename + base.PARTIAL_SUFFIX +
+                           ".ranges").exists()
+
+
+@pytest.mark.parametrize('value,n_connections', [
+    (None, base.DEFAULT_CONNECTIONS), ("8", 8), ("0", 1)])
+def test_get_connections(monkeypatch, value, n_connections):
+    if value is None:
+        monkeypatch.delenv('MDANALYSIS_DATA_CONNECTIONS', raising=False)
+    else:
+        monkeypatch.setenv('MDANALYSIS_DATA_CONNECTIONS', value)
+    assert base.get_connections() == n_connections
+
+
+class TestFileLock(object):
+    def test_exclusive(self, tmpdir):
+        lockfile = str(tmpdir.join(".data.lock"))
+        events = []
+
+        def hold():
+            with base._FileLock(lockfile):
+                events.append("start")
+                time.sleep(0.2)
+                events.append("stop")
+
+        threads = [threading.Thread(target=hold) for i in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert events == ["start", "stop"] * 3
+
+    def test_release_on_error(self, tmpdir):
+        lockfile = str(tmpdir.join(".data.lock"))
+        with pytest.raises(ValueError):
+            with base._FileLock(lockfile):
+                raise ValueError
+        with base._FileLock(lockfile):
+            pass
+
+
+def test_lock_path():
+    assert base._lock_path(os.path.join("a", "b.dcd")) == os.path.join(
+        "a", ".b.dcd.lock")
+
+
+def test_fetch_remote_processes(local_server, remote_content, tmpdir):
+    # simultaneous fetches from several processes download only once
+    remote = local_server.add_file("data.bin", remote_content)
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=4, mp_context=context) as pool:
+        paths = list(pool.map(base._fetch_remote, [remote] * 4,
+                              [str(tmpdir)] * 4, [1] * 4))
+    assert paths == [str(tmpdir.join(remote.filename))] * 4
+    assert local_server.requests == [('GET', '/data.bin', None)]
+    assert tmpdir.join(remote.filename).read_binary() == remote_content
+
+
+def test_extract_tar(tmpdir):
+    archive = tmpdir.join("data.tar.gz")
+    with tarfile.open(str(archive), "w:gz") as tar:
+        for name in ("top/a.txt", "top/sub/b.txt", "c.txt"):
+            info = tarfile.TarInfo(name)
+            info.size = len(name)
+            tar.addfile(info, io.BytesIO(name.encode()))
+    target = tmpdir.mkdir("dataset")
+    # left over from an earlier, incomplete extraction
+    target.mkdir("top").join("stale.txt").write("stale")
+
+    base._extract_tar(str(archive), str(target))
+
+    assert sorted(os.listdir(str(target))) == ["c.txt", "top"]
+    assert target.join("top", "sub", "b.txt").read() == "top/sub/b.txt"
+    assert not target.join("top", "stale.txt").exists()
+
+
+def test_extract_tar_members(tmpdir):
+    archive = tmpdir.join("data.tar.gz")
+    archive.write_binary(make_tar({name: name.encode() for name in
+                                   ("top/a.txt", "top/sub/b.txt", "c.txt")},
+                                  mode="w:gz"))
+    target = tmpdir.mkdir("dataset")
+    # unpacked earlier
+    target.mkdir("top").join("stale.txt").write("stale")
+
+    base._extract_tar(str(archive), str(target), members=["top/sub/b.txt"])
+
+    assert sorted(os.listdir(str(target))) == ["top"]
+    assert target.join("top", "sub", "b.txt").read() == "top/sub/b.txt"
+    assert target.join("top", "stale.txt").exists()
+    assert not target.join("top", "a.txt").exists()
+
+    with pytest.raises(IOError, match="does not contain missing.txt"):
+        base._extract_tar(str(archive), str(target), members=["missing.txt"])
+
+
+def test_tar_members(tmpdir):
+    archive = tmpdir.join("data.tar.bz2")
+    archive.write_binary(make_tar({"b.txt": b"b", "a.txt": b"a"}))
+    checksum = base._sha256(str(archive))
+
+    assert base._tar_members(str(archive), checksum) == ["b.txt", "a.txt"]
+    assert tmpdir.join(".data.tar.bz2.members.json").exists()
+
+    # the index is used from now on, even without the archive
+    archive.remove()
+    assert base._read_tar_members(str(archive), checksum) == [
+        "b.txt", "a.txt"]
+    assert base._read_tar_members(str(archive), "12345678") is None
+
+
+@pytest.mark.parametrize('value,verify', [
+    (None, base.DEFAULT_VERIFY), ("stat", "stat"), ("full", "full")])
+def test_get_verify(monkeypatch, value, verify):
+    if value is None:
+        monkeypatch.delenv('MDANALYSIS_DATA_VERIFY', raising=False)
+    else:
+        monkeypatch.setenv('MDANALYSIS_DATA_VERIFY', value)
+    assert base.get_verify() == verify
+
+
+def test_get_verify_invalid():
+    with pytest.raises(ValueError, match="verify must be one of"):
+        base.get_verify("sometimes")
+
+
+@pytest.mark.parametrize('value,store', [
+    (None, "home/.blobs"), ("shared", "shared"), ("", None)])
+def test_get_blob_store(tmpdir, monkeypatch, value, store):
+    if value is None:
+        monkeypatch.delenv('MDANALYSIS_DATA_BLOBS', raising=False)
+    else:
+        monkeypatch.setenv('MDANALYSIS_DATA_BLOBS', str(tmpdir.join(value))
+                           if value else value)
+    expected = None if store is None else str(tmpdir.join(store))
+    assert base.get_blob_store(str(tmpdir.join("home"))) == expected
+
+
+class TestStore(object):
+    @pytest.fixture
+    def remote(self, local_server):
+        return local_server.add_file("data.bin", b"shared data")
+
+    def test_fetch_remote(self, local_server, remote, tmpdir):
+        store = str(tmpdir.join("store"))
+        first = base._fetch_remote(remote, dirname=str(tmpdir.mkdir("a")),
+                                   store=store)
+        second = base._fetch_remote(remote, dirname=str(tmpdir.mkdir("b")),
+                                    store=store)
+        assert len(local_server.requests) == 1
+        blob = base._blob_path(store, remote.checksum)
+        assert os.path.samefile(first, blob)
+        assert os.path.samefile(second, blob)
+        assert os.stat(blob).st_nlink == 3
+        assert base._read_manifest(str(tmpdir.join("b")))[
+            remote.filename]['sha256'] == remote.checksum
+
+    def test_corrupted(self, local_server, remote, tmpdir):
+        store = str(tmpdir.join("store"))
+        path = base._fetch_remote(remote, dirname=str(tmpdir), store=store)
+        with open(path, 'wb') as f:
+            f.write(b"corrupted")
+        # the corrupted stored copy is not used
+        base._fetch_remote(remote, dirname=str(tmpdir), store=store)
+        assert len(local_server.requests) == 2
+        assert base._sha256(path) == remote.checksum
+        assert os.path.samefile(path,
+                                base._blob_path(store, remote.checksum))
+
+    def test_prune(self, remote, tmpdir):
+        store = str(tmpdir.join("store"))
+        path = base._fetch_remote(remote, dirname=str(tmpdir), store=store)
+        assert base._prune_store(store) == 0
+        os.remove(path)
+        assert base._prune_store(store) == len(b"shared data")
+        assert not os.path.exists(base._blob_path(store, remote.checksum))
+
+
+class TestVerify(object):
+    @pytest.fixture
+    def remote(self, local_server, remote_content):
+        return local_server.add_file("data.bin", remote_content)
+
+    @pytest.fixture
+    def path(self, remote, tmpdir):
+        return base._fetch_remote(remote, dirname=str(tmpdir))
+
+    def test_manifest(self, remote, path, tmpdir):
+        manifest = base._read_manifest(str(tmpdir))
+        assert manifest[remote.filename] == {
+            'sha256': remote.checksum,
+            'stat': base._stat_signature(path)}
+
+    def test_stat_trusts_manifest(self, remote, path, mocker):
+        sha = mocker.patch('MDAnalysisData.base._sha256')
+        assert base._verify(path, remote.checksum, verify="stat")
+        assert not sha.called
+
+    @pytest.mark.parametrize('verify', ["stat", "full"])
+    def test_truncated(self, remote, path, verify):
+        with open(path, "r+b") as f:
+            f.truncate(1000)
+        assert not base._verify(path, remote.checksum, verify=verify)
+
+    def test_full_detects_same_stat(self, remote, path):
+        # corruption that does not change the stat signature
+        st = os.stat(path)
+        with open(path, "r+b") as f:
+            f.write(b"corrupted")
+        os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns))
+        assert base._verify(path, remote.checksum, verify="stat")
+        assert not base._verify(path, remote.checksum, verify="full")
+
+    def test_stat_unrecorded(self, remote, path, tmpdir, mocker):
+        # files without manifest entry are hashed once and then recorded
+        tmpdir.join(base.MANIFEST).remove()
+        assert base._verify(path, remote.checksum, verify="stat")
+        sha = mocker.patch('MDAnalysisData.base._sha256')
+        assert base._verify(path, remote.checksum, verify="stat")
+        assert not sha.called
+
+    def test_exists(self, path, mocker):
+        sha = mocker.patch('MDAnalysisData.base._sha256')
+        assert base._verify(path, "12345678", verify="exists")
+        assert not sha.called
+
+
+class TestFetchRemoteTar(object):
+    # incompressible so that the archive is large enough to be interrupted
+    members = {"top/a.txt": b"".join(os.urandom(1000) for i in range(100)),
+               "top/sub/b.txt": b"b" * 10, "c.txt": b"c"}
+
+    @pytest.fixture
+    def remote(self, local_server):
+        return local_server.add_file("data.tar.gz",
+                                     make_tar(self.members, mode="w:gz"))
+
+    def check_unpacked(self, tmpdir):
+        for name, content in self.members.items():
+            assert tmpdir.join(name).read_binary() == content
+        assert not [name for name in os.listdir(str(tmpdir))
+                    if name.startswith(".unpack-")]
+
+    @pytest.mark.parametrize('keep_archive', [True, False])
+    def test_stream(self, remote, tmpdir, local_server, keep_archive,
+                    mocker):
+        extract = mocker.patch('MDAnalysisData.base._extract_tar')
+        path = base._fetch_remote_tar(remote, str(tmpdir),
+                                      keep_archive=keep_archive)
+
+        self.check_unpacked(tmpdir)
+        assert not extract.called
+        assert os.path.exists(path) == keep_archive
+        assert not os.path.exists(path + base.PARTIAL_SUFFIX)
+        assert len(local_server.requests) == 1
+        if keep_archive:
+            assert base._verify(path, remote.checksum, verify="stat")
+
+    def test_checksum_fail(self, remote, tmpdir):
+        remote = remote._replace(checksum="12345678")
+        with pytest.raises(IOError, match="file may be corrupted"):
+            base._fetch_remote_tar(remote, str(tmpdir))
+        assert os.listdir(str(tmpdir)) == [".data.tar.gz.lock"]
+
+    def test_interrupted(self, remote, tmpdir, local_server):
+        local_server.httpd.fail_after = 1000
+        with pytest.raises(Exception):
+            base._fetch_remote_tar(remote, str(tmpdir))
+        assert not tmpdir.join("top").exists()
+        assert tmpdir.join(remote.filename + base.PARTIAL_SUFFIX).exists()
+
+        # resumed and unpacked from the archive
+        local_server.httpd.fail_after = None
+        base._fetch_remote_tar(remote, str(tmpdir))
+        self.check_unpacked(tmpdir)
+        assert local_server.requests[-1][2] == "bytes=1000-"
+
+
+@pytest.mark.parametrize('value,mirrors', [
+    (None, []), ("", []), ("http://a/x", ["http://a/x"]),
+    ("http://a/x, http://b/{checksum}\n", ["http://a/x", "http://b/{checksum}"])])
+def test_get_mirrors(monkeypatch, value, mirrors):
+    monkeypatch.delenv('MDANALYSIS_DATA_MIRRORS', raising=False)
+    if value is not None:
+        monkeypatch.setenv('MDANALYSIS_DATA_MIRRORS', value)
+    assert base.get_mirrors() == mirrors
+
+
+def test_remote_urls(monkeypatch):
+    monkeypatch.setenv('MDANALYSIS_DATA_MIRRORS',
+                       "http://a/data/ http://b/sha256/{checksum}")
+    remote = base.RemoteFileMetadata(filename="f.dcd", url="http://c/1",
+                                     checksum="abc",
+                                     mirrors=("http://d/f.dcd",))
+    assert base._remote_urls(remote) == [
+        "http://a/data/f.dcd", "http://b/sha256/abc", "http://c/1",
+        "http://d/f.dcd"]
+    assert base._remote_urls(remote._replace(mirrors=("http://c/1",))) == [
+        "http://a/data/f.dcd", "http://b/sha256/abc", "http://c/1"]
+
+
+class TestMirrors(object):
+    @pytest.fixture(autouse=True)
+    def no_mirrors(self, monkeypatch):
+        monkeypatch.delenv('MDANALYSIS_DATA_MIRRORS', raising=False)
+
+    def downloads(self, server):
+        # requests for the whole file (not the probes)
+        return [request for request in server.requests
+                if request[2] != "bytes=0-0"]
+
+    def test_rank_urls(self, local_server, mirror_server, remote_content):
+        slow = local_server.add_file("data.bin", remote_content)
+        fast = mirror_server.add_file("data.bin", remote_content)
+        local_server.httpd.delay = 0.2
+        missing = mirror_server.url("missing.bin")
+        assert base._rank_urls([missing, slow.url, fast.url]) == [
+            fast.url, slow.url, missing]
+
+    def test_fastest(self, local_server, mirror_server, remote_content,
+                     tmpdir):
+        remote = local_server.add_file("data.bin", remote_content)
+        mirror = mirror_server.add_file("data.bin", remote_content)
+        local_server.httpd.delay = 0.2
+        remote = remote._replace(mirrors=(mirror.url,))
+        path = base._fetch_remote(remote, dirname=str(tmpdir))
+        with open(path, 'rb') as f:
+            assert f.read() == remote_content
+        assert self.downloads(local_server) == []
+        assert len(self.downloads(mirror_server)) == 1
+
+    def test_failover(self, local_server, mirror_server, remote_content,
+                      tmpdir):
+        remote = local_server.add_file("data.bin", remote_content)
+        mirror_server.add_file("data.bin", remote_content)
+        # the fast source is interrupted
+        mirror_server.httpd.fail_after = 1000
+        local_server.httpd.delay = 0.2
+        remote = remote._replace(mirrors=(mirror_server.url("data.bin"),))
+        path = base._fetch_remote(remote, dirname=str(tmpdir))
+        with open(path, 'rb') as f:
+            assert f.read() == remote_content
+        # resumed from the other source
+        assert self.downloads(local_server)[-1][2] == "bytes=1000-"
+
+    def test_corrupted_mirror(self, local_server, mirror_server,
+                              remote_content, tmpdir, monkeypatch):
+        remote = local_server.add_file("data.bin", remote_content)
+        mirror_server.add_file("data.bin", b"corrupted")
+        local_server.httpd.delay = 0.2
+        monkeypatch.setenv('MDANALYSIS_DATA_MIRRORS', mirror_server.url(""))
+        path = base._fetch_remote(remote, dirname=str(tmpdir))
+        with open(path, 'rb') as f:
+            assert f.read() == remote_content
+        assert len(self.downloads(mirror_server)) == 1
+
+    def test_all_fail(self, local_server, mirror_server, tmpdir):
+        remote = local_server.add_file("data.bin", b"data")._replace(
+            url=local_server.url("missing.bin"),
+            mirrors=(mirror_server.url("missing.bin"),))
+        with pytest.raises(IOError):
+            base._fetch_remote(remote, dirname=str(tmpdir))
+        assert not tmpdir.join("data.bin").exists()
+
+    def test_tar_failover(self, local_server, mirror_server, tmpdir):
+        archive = make_tar({"a.txt": b"a" * 100000, "b.txt": b"b"},
+                           mode="w:gz")
+        remote = local_server.add_file("data.tar.gz", archive)
+        mirror_server.add_file("data.tar.gz", archive[:100])
+        local_server.httpd.delay = 0.2
+        remote = remote._replace(mirrors=(mirror_server.url("data.tar.gz"),))
+        base._fetch_remote_tar(remote, str(tmpdir))
+        assert tmpdir.join("a.txt").read_binary() == b"a" * 100000
+        assert len(self.downloads(mirror_server)) == 1
+
 
 def test_lazy_fetch(tmpdir, mocker):
-    mocker.patch('MDAnalysisData.adk_equilibrium.exists', return_value=True)
-    fr = mocker.patch('MDAnalysisData.adk_equilibrium._fetch_remote')
+    mocker.patch('MDAnalysisData.registry.exists', return_value=True)
+    fr = mocker.patch('MDAnalysisData.registry._fetch_remote')
     # check the laziness of grabbing a dataset
     # - mock exists to always say true
     # - grab the "dataset" then check no remote calls were done
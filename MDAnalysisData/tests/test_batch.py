@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+
+import os.path
+
+import pytest
+
+from MDAnalysisData import batch
+from MDAnalysisData import datasets
+from MDAnalysisData import adk_equilibrium
+
+
+def test_fetch_many(local_datasets, tmpdir):
+    names = ['adk_equilibrium', 'vesicle_lib', 'yiip_equilibrium_short',
+             'yiip_equilibrium_long']
+    data = datasets.fetch_many(names, data_home=str(tmpdir), max_workers=3)
+
+    assert sorted(data) == sorted(names)
+    for name in ('adk_equilibrium', 'yiip_equilibrium_short',
+                 'yiip_equilibrium_long'):
+        assert os.path.exists(data[name].topology)
+        assert os.path.exists(data[name].trajectory)
+    assert data['adk_equilibrium'].topology == str(
+        tmpdir.join(adk_equilibrium.NAME,
+                    adk_equilibrium.ARCHIVE['topology'].filename))
+    assert len(data['vesicle_lib'].structures) == 3
+    assert all(os.path.exists(path) for path in data['vesicle_lib'].structures)
+    assert data['vesicle_lib'].DESCR.startswith(".. -*- coding: utf-8 -*-")
+
+    # the YiiP topology is shared between short and long
+    paths = [path for method, path, r in local_datasets.requests]
+    assert len(paths) == len(set(paths)) == 6
+
+
+def test_fetch_many_cached(local_datasets, tmpdir):
+    datasets.fetch_many(['adk_equilibrium'], data_home=str(tmpdir))
+    n_requests = len(local_datasets.requests)
+    data = datasets.fetch_many(['adk_equilibrium'], data_home=str(tmpdir),
+                               download_if_missing=False)
+    assert len(local_datasets.requests) == n_requests
+    assert os.path.exists(data['adk_equilibrium'].trajectory)
+
+
+def test_fetch_many_unpacked(local_datasets, tmpdir):
+    # an archive that was removed after unpacking is not downloaded again
+    datasets.fetch_vesicle_lib(data_home=str(tmpdir), keep_archive=False)
+    n_requests = len(local_datasets.requests)
+    data = datasets.fetch_many(['vesicle_lib'], data_home=str(tmpdir))
+    assert len(local_datasets.requests) == n_requests
+    assert len(data['vesicle_lib'].structures) == 3
+    assert all(os.path.exists(path) for path in data['vesicle_lib'].structures)
+
+
+def test_fetch_many_missing(local_datasets, tmpdir):
+    with pytest.raises(IOError, match="not found"):
+        datasets.fetch_many(['adk_equilibrium'], data_home=str(tmpdir),
+                            download_if_missing=False)
+
+
+def test_fetch_many_download_error(local_datasets, tmpdir, monkeypatch):
+    meta = adk_equilibrium.ARCHIVE['trajectory']
+    monkeypatch.setitem(adk_equilibrium.ARCHIVE, 'trajectory',
+                        meta._replace(checksum="12345678"))
+    with pytest.raises(IOError, match="file may be corrupted"):
+        datasets.fetch_many(['adk_equilibrium'], data_home=str(tmpdir))
+
+
+def test_fetch_many_unknown():
+    with pytest.raises(ValueError, match="Unknown datasets nonsense"):
+        datasets.fetch_many(['adk_equilibrium', 'nonsense'])
+
+
+def test_datasets_complete():
+    fetchers = {name[len("fetch_"):] for name in datasets.__all__
+                if name.startswith("fetch_") and name != "fetch_many"}
+    assert set(batch.DATASETS) == fetchers
+    for name, dataset in batch.DATASETS.items():
+        assert dataset.fetch is getattr(datasets, "fetch_" + name)
@@ -0,0 +1,197 @@
+# -*- coding: utf-8 -*-
+
+import hashlib
+import io
+import json
+import os
+import tarfile
+
+import pytest
+
+from MDAnalysisData import base
+from MDAnalysisData import bundle
+from MDAnalysisData import datasets
+
+
+@pytest.fixture
+def compress(request):
+    if request.param:
+        pytest.importorskip("zstandard")
+    return request.param
+
+
+@pytest.fixture
+def no_store(monkeypatch):
+    # the files of different data homes must not be shared through a store
+    monkeypatch.setenv('MDANALYSIS_DATA_BLOBS', '')
+
+
+@pytest.fixture
+def attached():
+    yield
+    del bundle._attached[:]
+
+
+@pytest.fixture
+def exported(local_datasets, tmpdir, no_store):
+    data_home = str(tmpdir.join("source"))
+    datasets.fetch_adk_equilibrium(data_home=data_home)
+    datasets.fetch_vesicle_lib(data_home=data_home)
+    return data_home
+
+
+@pytest.mark.parametrize('compress', [False, True], indirect=True)
+def test_export_import(exported, tmpdir, compress):
+    path = str(tmpdir.join("data.bundle"))
+    index = bundle.export_bundle(path, data_home=exported, compress=compress)
+    assert sorted(index['datasets']) == ["adk_equilibrium", "vesicle_library"]
+    assert "adk_equilibrium/adk4AKE.psf" in index['files']
+    assert not any(os.path.basename(member) in (base.MANIFEST, ".last_access")
+                   for member in index['files'])
+    assert bundle.read_index(path) == index
+
+    target = str(tmpdir.join("target"))
+    assert bundle.import_bundle(path, names=["adk_equilibrium"],
+                                data_home=target) == ["adk_equilibrium"]
+    assert os.listdir(target) == ["adk_equilibrium"]
+    data = datasets.fetch_adk_equilibrium(data_home=target,
+                                          download_if_missing=False,
+                                          verify="stat")
+    with open(data.topology, 'rb') as f:
+        assert f.read() == b"topology" * 1000
+
+
+def test_import_corrupted(exported, tmpdir):
+    path = str(tmpdir.join("data.bundle"))
+    bundle.export_bundle(path, names=["adk_equilibrium"], data_home=exported)
+    with open(path, 'rb') as f:
+        content = f.read()
+    with open(path, 'wb') as f:
+        f.write(content.replace(b"topology", b"TOPOLOGY", 1))
+    with pytest.raises(IOError, match="corrupted"):
+        bundle.import_bundle(path, data_home=str(tmpdir.join("target")))
+
+
+def test_export_hardlinks(exported, tmpdir):
+    source = os.path.join(exported, "adk_equilibrium")
+    os.link(os.path.join(source, "adk4AKE.psf"),
+            os.path.join(source, "copy.psf"))
+    path = str(tmpdir.join("data.bundle"))
+    bundle.export_bundle(path, names=["adk_equilibrium"], data_home=exported)
+    target = str(tmpdir.join("target"))
+    bundle.import_bundle(path, data_home=target)
+    with open(os.path.join(target, "adk_equilibrium", "copy.psf"), 'rb') as f:
+        assert f.read() == b"topology" * 1000
+
+
+def make_bundle(path, datasets, members):
+    files = {name: {'sha256': hashlib.sha256(b"data").hexdigest(), 'size': 4}
+             for name, _ in members}
+    with tarfile.open(path, 'w') as tar:
+        for name, data in [(bundle.INDEX, json.dumps(
+                {'version': bundle.BUNDLE_VERSION, 'compression': None,
+                 'datasets': datasets, 'files': files}).encode())] + [
+                     (name, b"data") for name, _ in members if _ is None]:
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            tar.addfile(info, io.BytesIO(data))
+        for name, linkname in members:
+            if linkname is not None:
+                info = tarfile.TarInfo(name)
+                info.type = tarfile.SYMTYPE
+                info.linkname = linkname
+                tar.addfile(info)
+
+
+@pytest.mark.parametrize('datasets,members', [
+    (["adk"], [("adk/../../evil", None)]),
+    (["adk"], [("adk//evil", None)]),
+    ([".."], [("../evil", None)]),
+    ([""], [("/tmp/evil", None)]),
+    (["adk"], [("adk/evil", "../../evil")]),
+    (["evil"], [("evil", None)]),
+])
+def test_import_malicious(tmpdir, datasets, members):
+    path = str(tmpdir.join("evil.bundle"))
+    make_bundle(path, datasets, members)
+    data_home = tmpdir.mkdir("data").mkdir("home")
+    with pytest.raises(IOError, match="not a file of a dataset"):
+        bundle.import_bundle(path, data_home=str(data_home))
+    assert not tmpdir.join("evil").exists()
+    assert not tmpdir.join("data", "evil").exists()
+    assert not data_home.join("adk").exists()
+
+
+def test_import_outside(tmpdir):
+    # a dataset directory that links out of the data home
+    path = str(tmpdir.join("evil.bundle"))
+    make_bundle(path, ["adk"], [("adk/evil", None)])
+    data_home = tmpdir.mkdir("home")
+    data_home.join("adk").mksymlinkto(tmpdir.mkdir("elsewhere"))
+    with pytest.raises(IOError, match="outside of the data home"):
+        bundle.import_bundle(path, data_home=str(data_home))
+    assert not tmpdir.join("elsewhere", "evil").exists()
+
+
+def test_import_unknown(exported, tmpdir):
+    path = str(tmpdir.join("data.bundle"))
+    bundle.export_bundle(path, names=["adk_equilibrium"], data_home=exported)
+    with pytest.raises(ValueError, match="vesicle_library"):
+        bundle.import_bundle(path, names=["vesicle_library"],
+                             data_home=str(tmpdir.join("target")))
+
+
+def test_not_a_bundle(tmpdir):
+    path = str(tmpdir.join("data.tar"))
+    with open(path, 'wb') as f:
+        f.write(b"\0" * 1024)
+    with pytest.raises(IOError, match="not an MDAnalysisData bundle"):
+        bundle.read_index(path)
+
+
+@pytest.mark.parametrize('compress', [False, True], indirect=True)
+def test_attach(exported, local_datasets, tmpdir, compress, attached):
+    path = str(tmpdir.join("data.bundle"))
+    bundle.export_bundle(path, data_home=exported, compress=compress)
+    bundle.attach_bundle(path)
+    assert bundle.get_bundles() == [path]
+    n_requests = len(local_datasets.requests)
+
+    target = str(tmpdir.join("target"))
+    data = datasets.fetch_adk_equilibrium(data_home=target)
+    vesicle = datasets.fetch_vesicle_lib(data_home=target)
+    assert len(local_datasets.requests) == n_requests
+    with open(data.trajectory, 'rb') as f:
+        assert f.read() == b"trajectory" * 1000
+    assert all(os.path.exists(path) for path in vesicle.structures)
+
+    bundle.detach_bundle(path)
+    assert bundle.get_bundles() == []
+
+
+def test_attach_environment(exported, local_datasets, tmpdir, monkeypatch):
+    path = str(tmpdir.join("data.bundle"))
+    bundle.export_bundle(path, names=["adk_equilibrium"], data_home=exported)
+    monkeypatch.setenv('MDANALYSIS_DATA_BUNDLES', path)
+    n_requests = len(local_datasets.requests)
+    datasets.fetch_adk_equilibrium(data_home=str(tmpdir.join("target")))
+    assert len(local_datasets.requests) == n_requests
+
+
+def test_copy_missing_checksum(exported, tmpdir, attached):
+    path = str(tmpdir.join("data.bundle"))
+    bundle.export_bundle(path, names=["adk_equilibrium"], data_home=exported)
+    bundle.attach_bundle(path)
+    target = str(tmpdir.join("file"))
+    assert not bundle._copy_from_bundles(target, "0" * 64)
+    assert not os.path.exists(target)
+
+
+def test_main(exported, tmpdir):
+    path = str(tmpdir.join("data.bundle"))
+    target = str(tmpdir.join("target"))
+    bundle.main(["--data-home", exported, "export", path, "vesicle_library"])
+    bundle.main(["--data-home", target, "import", path])
+    assert os.listdir(target) == ["vesicle_library"]
+    manifest = base._read_manifest(os.path.join(target, "vesicle_library"))
+    assert "vesicles_1.0.tar.bz2" in manifest
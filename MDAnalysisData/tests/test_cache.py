@@ -0,0 +1,181 @@
+# -*- coding: utf-8 -*-
+
+import multiprocessing
+import os
+import shutil
+import time
+
+import pytest
+
+from MDAnalysisData import base
+from MDAnalysisData import cache
+from MDAnalysisData import datasets
+from MDAnalysisData import adk_equilibrium
+from MDAnalysisData import yiip_equilibrium
+
+
+def make_dataset(data_home, name, size, last_access):
+    path = data_home.mkdir(name)
+    path.join("data").write_binary(b"x" * size)
+    path.join(cache.ACCESS_STAMP).write("")
+    os.utime(str(path.join(cache.ACCESS_STAMP)), (last_access, last_access))
+    return path
+
+
+def visible(data_home):
+    # lock files of the datasets remain in the data home
+    return sorted(name for name in os.listdir(str(data_home))
+                  if not name.startswith("."))
+
+
+@pytest.fixture
+def data_home(tmpdir):
+    for i, name in enumerate(["old", "middle", "new"]):
+        make_dataset(tmpdir, name, 1000, 1000000 + i)
+    return tmpdir
+
+
+@pytest.mark.parametrize('value,size', [
+    ("1000", 1000), ("2K", 2048), ("500M", 500 * 2**20), ("1.5g", 3 * 2**29),
+    ("20GiB", 20 * 2**30), (1234, 1234)])
+def test_get_max_size(value, size):
+    assert cache.get_max_size(value) == size
+
+
+def test_get_max_size_environment(monkeypatch):
+    monkeypatch.delenv('MDANALYSIS_DATA_MAX_SIZE', raising=False)
+    assert cache.get_max_size() is None
+    monkeypatch.setenv('MDANALYSIS_DATA_MAX_SIZE', '10M')
+    assert cache.get_max_size() == 10 * 2**20
+
+
+def test_get_max_size_invalid():
+    with pytest.raises(ValueError, match="500M or 20G"):
+        cache.get_max_size("lots")
+
+
+def test_list_datasets(data_home):
+    data_home.join("file").write("not a dataset")
+    data_home.mkdir(".hidden")
+    listed = cache.list_datasets(str(data_home))
+    assert [dataset.name for dataset in listed] == ["old", "middle", "new"]
+    assert [dataset.size for dataset in listed] == [1000, 1000, 1000]
+    assert not any(dataset.pinned for dataset in listed)
+
+
+def test_list_datasets_sizes_recorded(data_home, mocker):
+    listed = cache.list_datasets(str(data_home))
+    size = mocker.spy(cache, '_size')
+    # the sizes are read from the stamps without changing the last access
+    assert cache.list_datasets(str(data_home)) == listed
+    assert not size.called
+
+
+def test_size_hardlinks(tmpdir):
+    tmpdir.join("a").write_binary(b"x" * 100)
+    os.link(str(tmpdir.join("a")), str(tmpdir.join("b")))
+    assert cache._size(str(tmpdir)) == 100
+
+
+def test_evict_datasets(data_home):
+    assert cache.evict_datasets("2500", data_home=str(data_home)) == ["old"]
+    assert cache.evict_datasets(1000, data_home=str(data_home)) == ["middle"]
+    assert visible(data_home) == ["new"]
+
+
+def test_evict_datasets_unlimited(data_home, monkeypatch):
+    monkeypatch.delenv('MDANALYSIS_DATA_MAX_SIZE', raising=False)
+    assert cache.evict_datasets(data_home=str(data_home)) == []
+    assert len(os.listdir(str(data_home))) == 3
+
+
+def test_evict_datasets_pinned(data_home):
+    cache.pin_dataset("old", data_home=str(data_home))
+    assert cache.list_datasets(str(data_home))[0].pinned
+    assert cache.evict_datasets(1000, data_home=str(data_home),
+                                keep=["new"]) == ["middle"]
+    assert visible(data_home) == ["new", "old"]
+
+    cache.unpin_dataset("old", data_home=str(data_home))
+    assert cache.evict_datasets(1000, data_home=str(data_home)) == ["old"]
+
+
+def test_evict_datasets_locked(data_home):
+    with base._FileLock(base._lock_path(str(data_home.join("old")))):
+        assert cache.evict_datasets(2500, data_home=str(data_home)) == [
+            "middle"]
+
+
+def test_evict_datasets_in_use(data_home):
+    with base._use_lock(str(data_home.join("old"))):
+        with base._use_lock(str(data_home.join("old"))):
+            # shared by several fetches
+            assert cache.evict_datasets(2500, data_home=str(data_home)) == [
+                "middle"]
+    assert cache.evict_datasets(1000, data_home=str(data_home)) == ["old"]
+
+
+def fetch_adk_equilibrium(archive, data_home):
+    adk_equilibrium.ARCHIVE.update(archive)
+    datasets.fetch_adk_equilibrium(data_home=data_home)
+
+
+def test_evict_during_download(local_datasets, local_server, tmpdir):
+    # a dataset that another process is downloading is not evicted
+    data = datasets.fetch_adk_equilibrium(data_home=str(tmpdir))
+    os.remove(data.trajectory)
+    shutil.rmtree(str(tmpdir.join(base.BLOBS)), ignore_errors=True)
+    del local_server.requests[:]
+    local_server.httpd.delay = 1
+    context = multiprocessing.get_context("spawn")
+    fetch = context.Process(target=fetch_adk_equilibrium,
+                            args=(dict(adk_equilibrium.ARCHIVE), str(tmpdir)))
+    fetch.start()
+    try:
+        while fetch.is_alive() and not local_server.requests:
+            time.sleep(0.01)
+        assert cache.evict_datasets(1, data_home=str(tmpdir)) == []
+    finally:
+        fetch.join()
+    assert fetch.exitcode == 0
+    assert visible(tmpdir) == [adk_equilibrium.NAME]
+    assert cache.evict_datasets(1, data_home=str(tmpdir)) == [
+        adk_equilibrium.NAME]
+
+
+def test_fetch_evicts(local_datasets, tmpdir, monkeypatch):
+    make_dataset(tmpdir, "old", 1000, 1000000)
+    datasets.fetch_adk_equilibrium(data_home=str(tmpdir))
+    assert visible(tmpdir) == sorted([adk_equilibrium.NAME, "old"])
+
+    monkeypatch.setenv('MDANALYSIS_DATA_MAX_SIZE', '1')
+    datasets.fetch_yiip_equilibrium_short(data_home=str(tmpdir))
+    # the dataset that was just fetched is kept even if it is too large
+    assert visible(tmpdir) == [yiip_equilibrium.NAME]
+
+
+def test_evict_prunes_store(local_datasets, tmpdir, monkeypatch):
+    monkeypatch.delenv('MDANALYSIS_DATA_BLOBS', raising=False)
+    datasets.fetch_adk_equilibrium(data_home=str(tmpdir))
+    store = tmpdir.join(base.BLOBS)
+    assert cache._size(str(store)) > 0
+    assert cache.evict_datasets(1, data_home=str(tmpdir)) == [
+        adk_equilibrium.NAME]
+    assert cache._size(str(store)) == 0
+
+
+def test_fetch_measures_own_size(local_datasets, tmpdir, monkeypatch, mocker):
+    make_dataset(tmpdir, "old", 1000, 1000000)
+    monkeypatch.setenv('MDANALYSIS_DATA_MAX_SIZE', '1G')
+    datasets.fetch_adk_equilibrium(data_home=str(tmpdir))
+    size = mocker.spy(cache, '_size')
+    datasets.fetch_yiip_equilibrium_short(data_home=str(tmpdir))
+    # only the fetched dataset is walked; the others have recorded sizes
+    path = str(tmpdir.join(yiip_equilibrium.NAME))
+    assert [call.args[0] for call in size.call_args_list] == [path]
+    listed = {dataset.name: dataset.size
+              for dataset in cache.list_datasets(str(tmpdir))}
+    assert listed == {"old": 1000,
+                      adk_equilibrium.NAME: cache._size(
+                          str(tmpdir.join(adk_equilibrium.NAME))),
+                      yiip_equilibrium.NAME: cache._size(path)}
@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+
+import os
+
+import pytest
+
+from MDAnalysisData import chunked
+from MDAnalysisData import datasets
+from MDAnalysisData import registry
+from MDAnalysisData.tests.conftest import dcd_coordinates, make_dcd
+
+np = pytest.importorskip("numpy")
+
+
+def coordinates(n_frames, n_atoms):
+    return np.array([[[dcd_coordinates(i, j, k) for k in range(3)]
+                      for j in range(n_atoms)] for i in range(n_frames)],
+                    dtype=np.float32).reshape(n_frames, n_atoms, 3)
+
+
+@pytest.fixture
+def dcd(tmpdir):
+    path = tmpdir.join("traj.dcd")
+    path.write_binary(make_dcd(45, n_atoms=23))
+    return str(path)
+
+
+@pytest.fixture(params=['zlib', 'zstd'])
+def compressor(request):
+    if request.param == 'zstd':
+        pytest.importorskip("zstandard")
+    return request.param
+
+
+@pytest.mark.parametrize('decimals', [None, 1])
+def test_convert(dcd, compressor, decimals):
+    path = chunked.convert(dcd, chunks=(10, 5), decimals=decimals,
+                           compressor=compressor)
+    assert path == dcd + ".chunks"
+    assert not os.path.exists(path + ".tmp")
+    assert "4.4.0" in os.listdir(path)
+    traj = chunked.ChunkedTrajectory(path)
+    assert traj.shape == (45, 23, 3)
+    assert traj.chunks == (10, 5)
+    assert len(traj) == 45
+    xyz = traj[:]
+    assert xyz.dtype == np.float32
+    assert np.array_equal(xyz, coordinates(45, 23))
+
+
+@pytest.mark.parametrize('index', [
+    5, -1, slice(None, None, 7), (slice(3, 30), slice(4, 12)),
+    (slice(None), [22, 0, 7]), (12, 3), ([40, 2], -2),
+    (slice(0, 0), slice(None))])
+def test_read(dcd, index):
+    traj = chunked.ChunkedTrajectory(chunked.convert(dcd, chunks=(10, 5)))
+    expected = coordinates(45, 23)[index]
+    assert np.array_equal(traj[index], expected)
+    assert traj[index].shape == expected.shape
+
+
+def test_read_threads(dcd):
+    path = chunked.convert(dcd, chunks=(4, 3), max_workers=3)
+    traj = chunked.ChunkedTrajectory(path, max_workers=5)
+    assert np.array_equal(traj.read(atoms=[1, 20]),
+                          coordinates(45, 23)[:, [1, 20]])
+    with pytest.raises(IndexError):
+        traj[0, 0, 0]
+
+
+def test_chunks_clipped(dcd):
+    traj = chunked.ChunkedTrajectory(chunked.convert(dcd))
+    assert traj.chunks == (45, 23)
+    assert np.array_equal(traj[:], coordinates(45, 23))
+
+
+def test_reused(dcd, mocker):
+    path = chunked.convert(dcd, chunks=(10, 5))
+    write = mocker.patch('MDAnalysisData.chunked._write_chunks',
+                         wraps=chunked._write_chunks)
+    assert chunked.convert(dcd, chunks=(10, 5)) == path
+    assert not write.called
+
+    # other options or a changed trajectory are converted again
+    chunked.convert(dcd, chunks=(10, 10))
+    assert write.call_count == 1
+    with open(dcd, 'wb') as f:
+        f.write(make_dcd(4, n_atoms=23))
+    chunked.convert(dcd, chunks=(10, 10))
+    assert write.call_count == 2
+    assert chunked.ChunkedTrajectory(path).n_frames == 4
+
+
+def test_unknown_compressor(dcd):
+    with pytest.raises(ValueError, match="Unknown compressor lz4"):
+        chunked.convert(dcd, compressor="lz4")
+
+
+def test_not_a_store(tmpdir):
+    with pytest.raises(IOError, match="not a chunked store"):
+        chunked.ChunkedTrajectory(str(tmpdir))
+
+
+def test_chunks_filename(tmpdir):
+    location = str(tmpdir.join("adk"))
+    inside = os.path.join(location, "traj.dcd")
+    assert chunked.chunks_filename(inside, location) == inside + ".chunks"
+    assert chunked.chunks_filename("/shared/adk/traj.dcd", location) == \
+        os.path.join(location, "traj.dcd.chunks")
+
+
+def test_xtc(tmpdir):
+    mda = pytest.importorskip("MDAnalysis")
+    xtc = str(tmpdir.join("traj.xtc"))
+    u = mda.Universe.empty(50, trajectory=True)
+    with mda.Writer(xtc, n_atoms=50) as w:
+        for i in range(20):
+            u.atoms.positions = np.random.RandomState(i).uniform(
+                0, 50, size=(50, 3))
+            w.write(u)
+    # coordinates as stored in the XTC trajectory
+    reader = mda.coordinates.XTC.XTCReader(xtc)
+    positions = np.array([ts.positions.copy() for ts in reader])
+    traj = chunked.ChunkedTrajectory(chunked.convert(xtc, decimals=2,
+                                                     chunks=(8, 16)))
+    assert np.allclose(traj[:], positions, rtol=0, atol=1e-5)
+
+
+def test_zarr(dcd):
+    zarr = pytest.importorskip("zarr")
+    pytest.importorskip("numcodecs")
+    path = chunked.convert(dcd, chunks=(10, 5), decimals=1,
+                           compressor='zlib')
+    array = zarr.open(path, mode='r')
+    assert np.array_equal(array[:], coordinates(45, 23))
+
+
+def test_fetch(adk_dcd, tmpdir):
+    data = datasets.fetch_adk_equilibrium(data_home=str(tmpdir), chunked=True)
+    assert data.trajectory_chunks == data.trajectory + ".chunks"
+    traj = chunked.ChunkedTrajectory(data.trajectory_chunks)
+    assert np.array_equal(traj[::10, 2:4], coordinates(300, 7)[::10, 2:4])
+
+
+def test_fetch_without_trajectories(local_datasets, tmpdir):
+    with pytest.raises(TypeError):
+        datasets.fetch_PEG_1chain(data_home=str(tmpdir), chunked=True)
+    with pytest.raises(ValueError, match="no trajectories"):
+        registry.fetch_dataset("vesicle_lib", data_home=str(tmpdir),
+                               chunked=True)
@@ -23,6 +23,7 @@ from MDAnalysisData import vesicles
 from MDAnalysisData import adk_transitions
 from MDAnalysisData import membrane_peptide
 from MDAnalysisData import yiip_equilibrium
+from MDAnalysisData.tests.conftest import make_tar
 
 # For filetype=topology, the data are downloaded and cached.
 # For filetype=trajectory the cached data are used.
@@ -177,3 +178,211 @@ def test_yiip_equilibrium(traj_len, filetype):
     assert os.path.basename(data[filetype]) == metadata[filetype].filename
     assert os.path.exists(data[filetype])
 
+
+# The following tests do not download anything and use a local HTTP
+# server instead of the original remote locations.
+
+@pytest.mark.parametrize('verify', ('stat', 'full'))
+def test_verify_redownload(local_datasets, tmpdir, verify):
+    data = datasets.fetch_adk_equilibrium(data_home=str(tmpdir))
+    with open(data.trajectory, "r+b") as f:
+        f.truncate(10)
+
+    with pytest.raises(IOError, match="not found or invalid"):
+        datasets.fetch_adk_equilibrium(data_home=str(tmpdir),
+                                       download_if_missing=False,
+                                       verify=verify)
+    data = datasets.fetch_adk_equilibrium(data_home=str(tmpdir),
+                                          verify=verify)
+    assert base._sha256(data.trajectory) == \
+        adk_equilibrium.ARCHIVE['trajectory'].checksum
+
+
+def test_verify_exists(local_datasets, tmpdir):
+    data = datasets.fetch_adk_equilibrium(data_home=str(tmpdir))
+    with open(data.trajectory, "r+b") as f:
+        f.truncate(10)
+    n_requests = len(local_datasets.requests)
+    datasets.fetch_adk_equilibrium(data_home=str(tmpdir), verify="exists")
+    assert len(local_datasets.requests) == n_requests
+
+
+def test_verify_archive(local_datasets, tmpdir):
+    data = datasets.fetch_vesicle_lib(data_home=str(tmpdir))
+    archive = tmpdir.join(vesicles.METADATA['vesicle_lib']['NAME'],
+                          vesicles.METADATA['vesicle_lib']['ARCHIVE'][
+                              'tarfile'].filename)
+    archive.write("garbage")
+    os.remove(data.structures[0])
+
+    data = datasets.fetch_vesicle_lib(data_home=str(tmpdir), verify="stat")
+    assert len(data.structures) == 3
+    assert base._sha256(str(archive)) == \
+        vesicles.METADATA['vesicle_lib']['ARCHIVE']['tarfile'].checksum
+
+
+def test_keep_archive(local_datasets, tmpdir):
+    metadata = vesicles.METADATA['vesicle_lib']
+    archive = tmpdir.join(metadata['NAME'],
+                          metadata['ARCHIVE']['tarfile'].filename)
+
+    data = datasets.fetch_vesicle_lib(data_home=str(tmpdir),
+                                      keep_archive=False)
+    assert len(data.structures) == 3
+    assert not archive.exists()
+
+    # unpacked files are enough without the archive
+    n_requests = len(local_datasets.requests)
+    datasets.fetch_vesicle_lib(data_home=str(tmpdir), keep_archive=False)
+    assert len(local_datasets.requests) == n_requests
+
+    # the archive is downloaded when it should be kept...
+    datasets.fetch_vesicle_lib(data_home=str(tmpdir))
+    assert archive.exists()
+    # ... and removed when it should not
+    datasets.fetch_vesicle_lib(data_home=str(tmpdir), keep_archive=False)
+    assert not archive.exists()
+
+
+@pytest.fixture
+def local_DIMS(local_server, monkeypatch):
+    """Serve a small adk_transitions_DIMS archive locally."""
+    metadata = adk_transitions.METADATA['DIMS']
+    members = {metadata['CONTENTS']['topology']: b"topology"}
+    for i in range(metadata['CONTENTS']['N_trajectories']):
+        name = "DIMS/trajectories/dims{:04d}_fit-core.dcd".format(i)
+        members[name] = name.encode()
+    meta = metadata['ARCHIVE']['tarfile']
+    monkeypatch.setitem(
+        metadata['ARCHIVE'], 'tarfile',
+        local_server.add_file(meta.filename,
+                              make_tar(members, mode="w:gz")))
+    return local_server
+
+
+def test_adk_transitions_selected(local_DIMS, tmpdir):
+    data = datasets.fetch_adk_transitions_DIMS(data_home=str(tmpdir),
+                                               trajectories=range(10))
+    assert data.N_trajectories == 10
+    assert [os.path.basename(path) for path in data.trajectories] == [
+        "dims{:04d}_fit-core.dcd".format(i) for i in range(10)]
+    assert all(os.path.exists(path) for path in data.trajectories)
+    assert os.path.exists(data.topology)
+    location = tmpdir.join(adk_transitions.METADATA['DIMS']['NAME'])
+    assert len(location.join("DIMS", "trajectories").listdir()) == 10
+
+    # more trajectories are added to the ones already unpacked
+    data = datasets.fetch_adk_transitions_DIMS(data_home=str(tmpdir),
+                                               trajectories=[5, 199])
+    assert [os.path.basename(path) for path in data.trajectories] == [
+        "dims0005_fit-core.dcd", "dims0199_fit-core.dcd"]
+    assert len(location.join("DIMS", "trajectories").listdir()) == 11
+
+    # all trajectories
+    data = datasets.fetch_adk_transitions_DIMS(data_home=str(tmpdir))
+    assert data.N_trajectories == len(data.trajectories) == 200
+    assert len(local_DIMS.requests) == 1
+
+    with pytest.raises(ValueError, match="between 0 and 199"):
+        datasets.fetch_adk_transitions_DIMS(data_home=str(tmpdir),
+                                            trajectories=[200])
+
+
+def test_adk_transitions_selected_no_archive(local_DIMS, tmpdir):
+    datasets.fetch_adk_transitions_DIMS(data_home=str(tmpdir),
+                                        trajectories=[0],
+                                        keep_archive=False)
+    # the member index is kept, so unpacked files are found offline
+    data = datasets.fetch_adk_transitions_DIMS(data_home=str(tmpdir),
+                                               trajectories=[0],
+                                               download_if_missing=False,
+                                               keep_archive=False)
+    assert len(data.trajectories) == 1
+    assert len(local_DIMS.requests) == 1
+    with pytest.raises(IOError, match="not found"):
+        datasets.fetch_adk_transitions_DIMS(data_home=str(tmpdir),
+                                            trajectories=[1],
+                                            download_if_missing=False,
+                                            keep_archive=False)
+
+
+def test_vesicles_selected(local_datasets, tmpdir):
+    data = datasets.fetch_vesicle_lib(data_home=str(tmpdir),
+                                      labels=['1_75M'])
+    assert data.labels == ['1_75M']
+    assert data.N_structures == 1
+    assert os.path.exists(data.structures[0])
+    location = tmpdir.join(vesicles.METADATA['vesicle_lib']['NAME'])
+    assert location.join("vesicles").listdir() == [
+        location.join("vesicles", "1_75M")]
+
+    with pytest.raises(ValueError, match="Unknown labels 1M"):
+        datasets.fetch_vesicle_lib(data_home=str(tmpdir), labels=['1M'])
+
+
+def test_shared_store(local_datasets, tmpdir, monkeypatch):
+    monkeypatch.setenv('MDANALYSIS_DATA_BLOBS', str(tmpdir.join("store")))
+    first = datasets.fetch_adk_equilibrium(data_home=str(tmpdir.join("a")))
+    n_requests = len(local_datasets.requests)
+    second = datasets.fetch_adk_equilibrium(data_home=str(tmpdir.join("b")))
+    assert len(local_datasets.requests) == n_requests
+    assert os.path.samefile(first.trajectory, second.trajectory)
+
+    datasets.fetch_vesicle_lib(data_home=str(tmpdir.join("a")))
+    n_requests = len(local_datasets.requests)
+    data = datasets.fetch_vesicle_lib(data_home=str(tmpdir.join("b")))
+    assert len(local_datasets.requests) == n_requests
+    assert all(os.path.exists(path) for path in data.structures)
+
+
+@pytest.fixture
+def data_path(tmpdir, monkeypatch):
+    shared, user = tmpdir.join("shared"), tmpdir.join("user")
+    monkeypatch.delenv('MDANALYSIS_DATA', raising=False)
+    monkeypatch.delenv('MDANALYSIS_DATA_BLOBS', raising=False)
+    monkeypatch.setenv('MDANALYSIS_DATA_PATH',
+                       os.pathsep.join([str(shared), str(user)]))
+    return shared, user
+
+
+def test_data_path(local_datasets, data_path):
+    shared, user = data_path
+    datasets.fetch_adk_equilibrium(data_home=str(shared))
+    n_requests = len(local_datasets.requests)
+
+    data = datasets.fetch_adk_equilibrium(verify="full")
+    assert len(local_datasets.requests) == n_requests
+    assert data.topology.startswith(str(shared))
+    assert data.trajectory.startswith(str(shared))
+
+    # a missing file is only downloaded into the writable data home
+    os.remove(data.trajectory)
+    data = datasets.fetch_adk_equilibrium()
+    assert len(local_datasets.requests) == n_requests + 1
+    assert data.topology.startswith(str(shared))
+    assert data.trajectory.startswith(str(user))
+    assert not shared.join(adk_equilibrium.NAME,
+                           os.path.basename(data.trajectory)).exists()
+
+
+def test_data_path_archive(local_datasets, data_path):
+    shared, user = data_path
+    datasets.fetch_vesicle_lib(data_home=str(shared), keep_archive=False)
+    n_requests = len(local_datasets.requests)
+
+    data = datasets.fetch_vesicle_lib()
+    assert all(path.startswith(str(shared)) for path in data.structures)
+    data = datasets.fetch_vesicle_lib(labels=['3_5M'])
+    assert data.structures[0].startswith(str(shared))
+    assert os.path.exists(data.structures[0])
+    assert len(local_datasets.requests) == n_requests
+
+
+def test_data_path_fetch_many(local_datasets, data_path):
+    shared, user = data_path
+    datasets.fetch_many(['yiip_equilibrium_short'], data_home=str(shared))
+    n_requests = len(local_datasets.requests)
+
+    data = datasets.fetch_many(['yiip_equilibrium_short'])
+    assert len(local_datasets.requests) == n_requests
+    assert data['yiip_equilibrium_short'].topology.startswith(str(shared))
@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+
+import bz2
+import gzip
+import io
+import shutil
+
+import pytest
+
+from MDAnalysisData import decompress
+
+DATA = b"".join(str(i).encode() for i in range(100000))
+
+COMPRESS = {'gz': gzip.compress, 'bz2': bz2.compress}
+
+
+@pytest.mark.parametrize('filename,compression', [
+    ("DIMS.tar.gz", "gz"), ("data.tgz", "gz"),
+    ("vesicles_1.0.tar.bz2", "bz2"), ("data.tbz2", "bz2"),
+    ("data.tar", None), ("adk4AKE.psf", None)])
+def test_get_compression(filename, compression):
+    assert decompress.get_compression(filename) == compression
+
+
+@pytest.mark.parametrize('compression,backend', [
+    (compression, decompressor.name)
+    for compression, decompressors in decompress.DECOMPRESSORS.items()
+    for decompressor in decompressors])
+def test_backends(tmpdir, compression, backend):
+    decompressor = decompress.get_decompressor(compression, backend=backend)
+    if decompressor.name != backend:
+        pytest.skip("{} is not installed".format(backend))
+    archive = tmpdir.join("data")
+    archive.write_binary(COMPRESS[compression](DATA))
+    with open(str(archive), 'rb') as f, \
+         decompress.open_decompressed(f, compression,
+                                      backend=backend) as stream:
+        assert stream.read() == DATA
+
+
+@pytest.fixture
+def gzip_command(monkeypatch):
+    if shutil.which("gzip") is None:
+        pytest.skip("gzip is not installed")
+    monkeypatch.delenv('MDANALYSIS_DATA_DECOMPRESSOR', raising=False)
+    monkeypatch.setitem(decompress.DECOMPRESSORS, 'gz',
+                        list(decompress.DECOMPRESSORS['gz']))
+    decompress.register_decompressor('gz', decompress.Decompressor(
+        'gzip', decompress._commands('gzip', '-dc'),
+        decompress._installed('gzip'), False))
+
+
+@pytest.mark.parametrize('seekable', [True, False])
+def test_command(tmpdir, gzip_command, seekable):
+    archive = tmpdir.join("data.gz")
+    archive.write_binary(gzip.compress(DATA))
+    with open(str(archive), 'rb') as f:
+        fileobj = f if seekable else io.BytesIO(f.read())
+        with decompress.open_decompressed(fileobj, 'gz',
+                                          seekable=seekable) as stream:
+            assert stream.read() == DATA
+
+
+def test_command_stop_early(gzip_command):
+    fileobj = io.BytesIO(gzip.compress(DATA * 20))
+    with decompress.open_decompressed(fileobj, 'gz',
+                                      seekable=False) as stream:
+        assert stream.read(10) == DATA[:10]
+
+
+def test_command_error(gzip_command):
+    fileobj = io.BytesIO(b"not gzip data")
+    with pytest.raises(IOError, match="gzip -dc failed"):
+        with decompress.open_decompressed(fileobj, 'gz',
+                                          seekable=False) as stream:
+            assert stream.read() == b""
+
+
+def test_stream_excludes_seekable(monkeypatch):
+    monkeypatch.delenv('MDANALYSIS_DATA_DECOMPRESSOR', raising=False)
+    monkeypatch.setitem(decompress.DECOMPRESSORS, 'gz', [
+        decompress.Decompressor('file-only', None, lambda: True, True),
+        decompress.Decompressor('stream', None, lambda: True, False)])
+    assert decompress.get_decompressor('gz').name == 'file-only'
+    assert decompress.get_decompressor('gz', seekable=False).name == 'stream'
+
+
+def test_environment(monkeypatch):
+    monkeypatch.setenv('MDANALYSIS_DATA_DECOMPRESSOR', 'python')
+    assert decompress.get_decompressor('bz2').name == 'python'
+    # unusable backends fall back to the standard library
+    monkeypatch.setenv('MDANALYSIS_DATA_DECOMPRESSOR', 'nonsense')
+    assert decompress.get_decompressor('bz2').name == 'python'
+
+
+def test_unknown_compression():
+    with pytest.raises(ValueError, match="compression xz"):
+        decompress.get_decompressor('xz')
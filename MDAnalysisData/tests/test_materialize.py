@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+
+import os
+
+import pytest
+
+from MDAnalysisData import datasets
+from MDAnalysisData import materialize
+from MDAnalysisData import registry
+from MDAnalysisData.tests.conftest import dcd_coordinates, make_dcd
+
+np = pytest.importorskip("numpy")
+
+
+def coordinates(n_frames, n_atoms):
+    return np.array([[[dcd_coordinates(i, j, k) for k in range(3)]
+                      for j in range(n_atoms)] for i in range(n_frames)],
+                    dtype=np.float32).reshape(n_frames, n_atoms, 3)
+
+
+@pytest.fixture
+def dcd(tmpdir):
+    path = tmpdir.join("traj.dcd")
+    path.write_binary(make_dcd(10))
+    return str(path)
+
+
+@pytest.mark.parametrize('unitcell', [True, False])
+@pytest.mark.parametrize('endian', ['<', '>'])
+def test_read_dcd_header(tmpdir, unitcell, endian):
+    path = tmpdir.join("traj.dcd")
+    path.write_binary(make_dcd(5, n_atoms=3, unitcell=unitcell,
+                               endian=endian))
+    header = materialize.read_dcd_header(str(path))
+    assert header.n_frames == 5
+    assert header.n_atoms == 3
+    assert header.endian == endian
+    assert header.unitcell == unitcell
+    assert not header.four_dims
+    assert header.offset + 5 * header.frame_size == path.size()
+
+
+def test_read_dcd_header_invalid(tmpdir):
+    path = tmpdir.join("traj.dcd")
+    path.write_binary(b"not a trajectory" * 100)
+    with pytest.raises(IOError, match="not a DCD trajectory"):
+        materialize.read_dcd_header(str(path))
+
+
+@pytest.mark.parametrize('n_frames', [0, 10, 600])
+def test_materialize(tmpdir, n_frames):
+    path = tmpdir.join("traj.dcd")
+    path.write_binary(make_dcd(n_frames, endian='>'))
+    npy = materialize.materialize(str(path))
+    assert npy == str(path) + ".npy"
+    xyz = np.load(npy, mmap_mode='r')
+    assert xyz.dtype == np.float32
+    assert xyz.shape == (n_frames, 20, 3)
+    assert np.array_equal(xyz, coordinates(n_frames, 20))
+    assert not os.path.exists(npy + ".tmp")
+
+
+def test_reused(dcd, mocker):
+    npy = materialize.materialize(dcd)
+    convert = mocker.patch('MDAnalysisData.materialize._convert',
+                           wraps=materialize._convert)
+    assert materialize.materialize(dcd) == npy
+    assert not convert.called
+
+    # a changed trajectory is converted again
+    with open(dcd, 'wb') as f:
+        f.write(make_dcd(4))
+    os.utime(dcd, (0, os.path.getmtime(npy) + 10))
+    materialize.materialize(dcd)
+    assert convert.call_count == 1
+    assert np.load(npy).shape == (4, 20, 3)
+
+
+def test_npy_filename(tmpdir):
+    location = str(tmpdir.join("adk"))
+    inside = os.path.join(location, "traj.dcd")
+    assert materialize.npy_filename(inside, location) == inside + ".npy"
+    assert materialize.npy_filename("/shared/adk/traj.dcd", location) == \
+        os.path.join(location, "traj.dcd.npy")
+
+
+def test_no_numpy(dcd, mocker):
+    mocker.patch.dict('sys.modules', {'numpy': None})
+    with pytest.raises(ImportError, match="requires the numpy package"):
+        materialize.materialize(dcd)
+
+
+def test_mdanalysis(tmpdir):
+    mda = pytest.importorskip("MDAnalysis")
+    dcd = str(tmpdir.join("traj.dcd"))
+    u = mda.Universe.empty(50, trajectory=True)
+    positions = []
+    with mda.Writer(dcd, n_atoms=50) as w:
+        u.dimensions = [50, 50, 50, 90, 90, 90]
+        for i in range(20):
+            u.atoms.positions = np.random.RandomState(i).uniform(
+                0, 50, size=(50, 3))
+            positions.append(u.atoms.positions.copy())
+            w.write(u)
+    xyz = np.load(materialize.materialize(dcd), mmap_mode='r')
+    assert np.array_equal(xyz, np.array(positions))
+
+
+def test_fetch(adk_dcd, tmpdir):
+    data = datasets.fetch_adk_equilibrium(data_home=str(tmpdir))
+    assert 'trajectory_npy' not in data
+    data = datasets.fetch_adk_equilibrium(data_home=str(tmpdir),
+                                          materialize=True)
+    assert data.trajectory_npy == data.trajectory + ".npy"
+    assert np.array_equal(np.load(data.trajectory_npy, mmap_mode='r'),
+                          coordinates(300, 7))
+
+
+def test_fetch_without_dcd(local_datasets, tmpdir):
+    with pytest.raises(TypeError):
+        datasets.fetch_vesicle_lib(data_home=str(tmpdir), materialize=True)
+    with pytest.raises(ValueError, match="no DCD trajectories"):
+        registry.fetch_dataset("vesicle_lib", data_home=str(tmpdir),
+                               materialize=True)
@@ -0,0 +1,145 @@
+# -*- coding: utf-8 -*-
+
+import os
+import warnings
+
+import pytest
+
+from MDAnalysisData import cache
+from MDAnalysisData import datasets
+from MDAnalysisData import offsets
+from MDAnalysisData.tests.conftest import make_xtc
+
+
+def frame_offsets(content, n_frames):
+    # every frame starts with the magic number and the number of atoms
+    sizes = []
+    offset = 0
+    for i in range(n_frames):
+        start = content.index(content[:8], offset + 1) if i < n_frames - 1 \
+            else len(content)
+        sizes.append(start - offset)
+        offset = start
+    return [sum(sizes[:i]) for i in range(n_frames)]
+
+
+@pytest.fixture
+def xtc(tmpdir):
+    path = tmpdir.join("traj.xtc")
+    path.write_binary(make_xtc(10))
+    return str(path)
+
+
+@pytest.mark.parametrize('n_atoms,magic', [(20, 1995), (20, 2023),
+                                           (5, 1995)])
+def test_read_xtc_offsets(tmpdir, n_atoms, magic):
+    content = make_xtc(10, n_atoms=n_atoms, magic=magic)
+    path = tmpdir.join("traj.xtc")
+    path.write_binary(content)
+    frames, n = offsets.read_xtc_offsets(str(path))
+    assert n == n_atoms
+    assert frames == frame_offsets(content, 10)
+
+
+def test_read_xtc_offsets_invalid(tmpdir):
+    path = tmpdir.join("traj.xtc")
+    path.write_binary(b"not a trajectory" * 100)
+    with pytest.raises(IOError, match="not an XTC trajectory"):
+        offsets.read_xtc_offsets(str(path))
+    path.write_binary(make_xtc(3)[:-10])
+    with pytest.raises(IOError, match="Incomplete XTC frame"):
+        offsets.read_xtc_offsets(str(path))
+
+
+def test_get_offsets(xtc, mocker):
+    path = offsets.get_offsets(xtc)
+    assert path == offsets.offsets_filename(xtc)
+    assert os.path.basename(path) == ".traj.xtc_offsets.npz"
+    data = offsets.load_offsets(path)
+    assert data['offsets'] == offsets.read_xtc_offsets(xtc)[0]
+    assert data['size'] == os.path.getsize(xtc)
+    assert data['ctime'] == os.path.getctime(xtc)
+    assert data['n_atoms'] == 20
+
+    scan = mocker.patch('MDAnalysisData.offsets.read_xtc_offsets',
+                        wraps=offsets.read_xtc_offsets)
+    assert offsets.get_offsets(xtc) == path
+    assert not scan.called
+
+    # a changed trajectory is indexed again
+    with open(xtc, 'wb') as f:
+        f.write(make_xtc(4))
+    offsets.get_offsets(xtc)
+    assert scan.call_count == 1
+    assert len(offsets.load_offsets(path)['offsets']) == 4
+
+
+def test_get_offsets_not_writable(xtc, mocker):
+    mocker.patch('MDAnalysisData.offsets._write_npz',
+                 side_effect=PermissionError("read-only"))
+    assert offsets.get_offsets(xtc) is None
+
+
+def test_load_offsets_invalid(tmpdir):
+    path = tmpdir.join("offsets.npz")
+    path.write_binary(b"garbage")
+    with pytest.raises(IOError, match="Cannot read offsets"):
+        offsets.load_offsets(str(path))
+
+
+def test_numpy_format(xtc):
+    np = pytest.importorskip("numpy")
+    data = np.load(offsets.get_offsets(xtc))
+    assert data['offsets'].dtype == np.int64
+    assert list(data['offsets']) == offsets.read_xtc_offsets(xtc)[0]
+    assert data['ctime'].shape == ()
+    assert data['n_atoms'] == 20
+
+
+def test_mdanalysis(tmpdir):
+    np = pytest.importorskip("numpy")
+    mda = pytest.importorskip("MDAnalysis")
+    xtc = str(tmpdir.join("traj.xtc"))
+    u = mda.Universe.empty(100, trajectory=True)
+    with mda.Writer(xtc, n_atoms=100) as w:
+        for i in range(20):
+            u.atoms.positions = np.random.RandomState(i).uniform(
+                0, 50, size=(100, 3))
+            w.write(u)
+    offsets.get_offsets(xtc)
+    with warnings.catch_warnings():
+        # MDAnalysis warns if it cannot use the stored offsets
+        warnings.simplefilter("error")
+        reader = mda.coordinates.XTC.XTCReader(xtc)
+    assert list(reader._xdr.offsets) == offsets.read_xtc_offsets(xtc)[0]
+    assert reader[13].frame == 13
+
+
+def test_fetch(local_datasets, tmpdir):
+    data = datasets.fetch_yiip_equilibrium_short(data_home=str(tmpdir))
+    assert data.trajectory_offsets == offsets.offsets_filename(
+        data.trajectory)
+    frames = offsets.load_offsets(data.trajectory_offsets)['offsets']
+    assert frames == offsets.read_xtc_offsets(data.trajectory)[0]
+    assert 'trajectory_offsets' not in datasets.fetch_adk_equilibrium(
+        data_home=str(tmpdir))
+
+
+def test_shared_store(local_datasets, tmpdir, monkeypatch, mocker):
+    # linking and removing the trajectory in a second data home changes
+    # the ctime of the trajectory in the first one
+    monkeypatch.setenv('MDANALYSIS_DATA_BLOBS', str(tmpdir.join("blobs")))
+    first = datasets.fetch_yiip_equilibrium_short(
+        data_home=str(tmpdir.join("first")))
+    read = mocker.patch('MDAnalysisData.offsets.read_xtc_offsets',
+                        side_effect=offsets.read_xtc_offsets)
+    second = datasets.fetch_yiip_equilibrium_short(
+        data_home=str(tmpdir.join("second")))
+    assert os.path.samefile(first.trajectory, second.trajectory)
+    assert read.call_count == 1
+    for data in (first, second):
+        assert offsets._valid(data.trajectory_offsets, data.trajectory)
+
+    cache.evict_datasets(max_size=1, data_home=str(tmpdir.join("second")))
+    assert not os.path.exists(second.trajectory)
+    assert offsets._valid(first.trajectory_offsets, first.trajectory)
@@ -1,5 +1,6 @@
 # -*- coding: utf-8 -*-
 
+import subprocess
 import sys
 from importlib import reload
 import pytest
@@ -29,3 +30,47 @@ def test_version():
     # very generic because versioneer will provide different strings depending
     # on the repository status
     assert isinstance(MDAnalysisData.__version__, str)
+
+
+def imported_modules(statement, authors=True):
+    """Return the modules that a fresh interpreter imports for `statement`.
+
+    Without `authors`, the interpreter behaves as if authors.py had not
+    been generated by setup.py.
+    """
+    code = ("import sys; {0}before = set(sys.modules); {1}; "
+            "print(' '.join(sorted(set(sys.modules) - before)))").format(
+                "" if authors else "sys.modules['MDAnalysisData.authors'] "
+                                   "= None; ",
+                statement)
+    output = subprocess.run([sys.executable, "-c", code], check=True,
+                            capture_output=True, text=True).stdout
+    return set(output.split())
+
+
+@pytest.mark.parametrize('authors', [True, False])
+@pytest.mark.parametrize('statement', [
+    "import MDAnalysisData",
+    "from MDAnalysisData import datasets",
+])
+def test_lazy_import(statement, authors):
+    modules = imported_modules(statement, authors=authors)
+    heavy = {'tqdm', 'tarfile', 'hashlib', 'urllib.request', 'http.client',
+             'importlib.metadata', 'MDAnalysisData.base'}
+    assert not modules & heavy
+    assert not any(module.startswith('MDAnalysisData.') and
+                   module not in ('MDAnalysisData.datasets',
+                                  'MDAnalysisData.authors')
+                   for module in modules)
+
+
+def test_lazy_datasets():
+    from MDAnalysisData import datasets
+    assert set(datasets.__all__) <= set(dir(datasets))
+    for name in datasets.__all__:
+        assert callable(getattr(datasets, name))
+    with pytest.raises(AttributeError, match="fetch_adk"):
+        datasets.fetch_adk
+    assert 'registry' in dir(MDAnalysisData)
+    with pytest.raises(AttributeError):
+        MDAnalysisData.no_such_module
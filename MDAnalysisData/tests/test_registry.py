@@ -0,0 +1,165 @@
+# -*- coding: utf-8 -*-
+
+import copy
+import inspect
+import os
+import shutil
+
+import pytest
+
+from MDAnalysisData import base
+from MDAnalysisData import chunked
+from MDAnalysisData import datasets
+from MDAnalysisData import registry
+from MDAnalysisData import adk_transitions
+from MDAnalysisData import vesicles
+
+
+@pytest.mark.parametrize('name', list(registry.DATASETS))
+def test_fetchers(name):
+    dataset = registry.DATASETS[name]
+    fetch = getattr(datasets, "fetch_" + name)
+    assert fetch is registry.fetcher(name)
+    assert fetch.__name__ == "fetch_" + name
+    assert fetch.__module__ == dataset.module
+    assert fetch.__doc__.startswith(dataset.title)
+    assert ":ref:`{}`".format(dataset.reference) in fetch.__doc__
+    assert "<data_home>/{}".format(dataset.directory) in fetch.__doc__
+
+
+def test_signature():
+    parameters = list(inspect.signature(
+        datasets.fetch_adk_equilibrium).parameters)
+    assert parameters == ['data_home', 'download_if_missing', 'verify',
+                          'stride', 'atoms', 'materialize', 'chunked']
+    parameters = list(inspect.signature(
+        datasets.fetch_adk_transitions_DIMS).parameters)
+    assert parameters == ['data_home', 'download_if_missing', 'verify',
+                          'keep_archive', 'trajectories', 'stride', 'atoms',
+                          'materialize', 'chunked']
+    with pytest.raises(TypeError):
+        datasets.fetch_adk_equilibrium(keep_archive=False)
+    assert 'materialize' not in inspect.signature(
+        datasets.fetch_vesicle_lib).parameters
+
+
+def test_unknown():
+    with pytest.raises(ValueError, match="Unknown dataset adk"):
+        registry.fetch_dataset("adk")
+    with pytest.raises(TypeError, match="labels"):
+        registry.fetch_dataset("adk_equilibrium", labels=["10M"])
+
+
+def test_metadata():
+    metadata = adk_transitions.METADATA['DIMS']
+    assert metadata['NAME'] == "adk_transitions_DIMS"
+    assert metadata['ARCHIVE'] is \
+        registry.DATASETS['adk_transitions_DIMS'].files
+    assert metadata['CONTENTS'] == {
+        'topology': "DIMS/topologies/adk4ake.psf",
+        'trajectories': "DIMS/trajectories/dims*_fit-core.dcd",
+        'N_trajectories': 200,
+    }
+    contents = vesicles.METADATA['vesicle_lib']['CONTENTS']
+    assert contents['labels'] == ["1_75M", "3_5M", "10M"]
+    assert contents['N_structures'] == len(contents['structures']) == 3
+
+
+def test_fetch_dataset(local_datasets, tmpdir):
+    data = registry.fetch_dataset("vesicle_lib", data_home=str(tmpdir),
+                                  labels=["3_5M"])
+    assert data.labels == ["3_5M"]
+    assert data == datasets.fetch_vesicle_lib(str(tmpdir), labels=["3_5M"])
+    data = registry.fetch_dataset("adk_equilibrium", data_home=str(tmpdir))
+    assert sorted(data) == ['DESCR', 'topology', 'trajectory']
+
+
+def test_descr(local_datasets, tmpdir, mocker):
+    data = datasets.fetch_adk_equilibrium(data_home=str(tmpdir))
+    assert data.DESCR == base._read_description("adk_equilibrium.rst")
+    assert isinstance(dict(data)['DESCR'], str)
+    assert isinstance({**data}['DESCR'], str)
+    assert isinstance(copy.copy(data)['DESCR'], str)
+
+    # the description file is only read once per process
+    files = mocker.patch('importlib.resources.files')
+    registry.clear_results()
+    again = datasets.fetch_adk_equilibrium(data_home=str(tmpdir))
+    assert again.DESCR is data.DESCR
+    assert not files.called
+
+
+class TestMemo(object):
+    @pytest.fixture
+    def fetches(self, local_datasets, mocker):
+        registry.clear_results()
+        yield mocker.patch('MDAnalysisData.registry._fetch_archive',
+                           wraps=registry._fetch_archive)
+        registry.clear_results()
+
+    def test_memoized(self, fetches, tmpdir):
+        data = datasets.fetch_vesicle_lib(data_home=str(tmpdir))
+        data.structures.append("changed by the caller")
+        again = datasets.fetch_vesicle_lib(data_home=str(tmpdir))
+        assert fetches.call_count == 1
+        assert again.N_structures == len(again.structures) == 3
+        assert again.DESCR == data.DESCR
+
+        # other selections and data homes are fetched
+        datasets.fetch_vesicle_lib(data_home=str(tmpdir), labels=["10M"])
+        datasets.fetch_vesicle_lib(data_home=str(tmpdir.join("other")))
+        assert fetches.call_count == 3
+
+    def test_invalidated(self, fetches, local_datasets, tmpdir):
+        data = datasets.fetch_vesicle_lib(data_home=str(tmpdir))
+        os.remove(data.structures[0])
+        data = datasets.fetch_vesicle_lib(data_home=str(tmpdir))
+        assert fetches.call_count == 2
+        assert os.path.exists(data.structures[0])
+
+    def test_iterator(self, fetches, tmpdir):
+        # a one-shot selection is used for the key and for unpacking
+        data = datasets.fetch_vesicle_lib(data_home=str(tmpdir),
+                                          labels=iter(["3_5M"]))
+        assert data.labels == ["3_5M"]
+        assert len(data.structures) == 1
+        assert os.path.exists(data.structures[0])
+        again = datasets.fetch_vesicle_lib(
+            data_home=str(tmpdir), labels=(label for label in ["3_5M"]))
+        assert again == data
+        assert fetches.call_count == 1
+
+    @pytest.mark.parametrize('derived', ['npy', 'chunks'])
+    def test_derived_invalidated(self, adk_dcd, tmpdir, derived):
+        pytest.importorskip("numpy")
+        options = {'materialize': True} if derived == 'npy' else {
+            'chunked': True}
+        data = datasets.fetch_adk_equilibrium(data_home=str(tmpdir),
+                                              **options)
+        path = data['trajectory_' + derived]
+        if os.path.isdir(path):
+            shutil.rmtree(path)
+        else:
+            os.remove(path)
+        data = datasets.fetch_adk_equilibrium(data_home=str(tmpdir),
+                                              **options)
+        assert data['trajectory_' + derived] == path
+        assert os.path.exists(path)
+        if os.path.isdir(path):
+            assert chunked.ChunkedTrajectory(path)[:].shape == (300, 7, 3)
+
+    def test_verify(self, fetches, tmpdir):
+        datasets.fetch_vesicle_lib(data_home=str(tmpdir))
+        datasets.fetch_vesicle_lib(data_home=str(tmpdir), verify="stat")
+        datasets.fetch_vesicle_lib(data_home=str(tmpdir), verify="full")
+        assert fetches.call_count == 3
+
+    def test_access_recorded(self, fetches, tmpdir, monkeypatch, mocker):
+        datasets.fetch_vesicle_lib(data_home=str(tmpdir))
+        record = mocker.patch('MDAnalysisData.registry._record_access')
+        datasets.fetch_vesicle_lib(data_home=str(tmpdir))
+        assert not record.called
+        monkeypatch.setattr(registry, 'ACCESS_INTERVAL', -1)
+        datasets.fetch_vesicle_lib(data_home=str(tmpdir))
+        assert record.call_count == 1
+        assert fetches.call_count == 1
@@ -0,0 +1,145 @@
+# -*- coding: utf-8 -*-
+
+from urllib.error import HTTPError
+
+import pytest
+
+from MDAnalysisData import session
+
+
+@pytest.fixture
+def http(monkeypatch):
+    monkeypatch.setattr(session, 'BACKOFF', 0.01)
+    for name in ('http_proxy', 'HTTP_PROXY', 'all_proxy', 'ALL_PROXY'):
+        monkeypatch.delenv(name, raising=False)
+    s = session.Session(timeout=5, retries=2)
+    yield s
+    s.close()
+
+
+@pytest.fixture
+def remote(local_server):
+    return local_server.add_file("data.bin", b"0123456789" * 1000)
+
+
+def read(http, url, **kwargs):
+    with http.open(url, **kwargs) as response:
+        return response.read()
+
+
+@pytest.mark.parametrize('value,timeout', [(None, 60.0), ("2.5", 2.5)])
+def test_get_timeout(monkeypatch, value, timeout):
+    monkeypatch.delenv('MDANALYSIS_DATA_TIMEOUT', raising=False)
+    if value is not None:
+        monkeypatch.setenv('MDANALYSIS_DATA_TIMEOUT', value)
+    assert session.get_timeout() == timeout
+
+
+@pytest.mark.parametrize('value,retries', [(None, 3), ("0", 0)])
+def test_get_retries(monkeypatch, value, retries):
+    monkeypatch.delenv('MDANALYSIS_DATA_RETRIES', raising=False)
+    if value is not None:
+        monkeypatch.setenv('MDANALYSIS_DATA_RETRIES', value)
+    assert session.get_retries() == retries
+
+
+def test_invalid():
+    with pytest.raises(ValueError, match="timeout"):
+        session.get_timeout(0)
+    with pytest.raises(ValueError, match="retries"):
+        session.get_retries(-1)
+
+
+def test_get_session():
+    assert session.get_session() is session.get_session()
+
+
+def test_keep_alive(http, remote, local_server):
+    for _ in range(3):
+        assert read(http, remote.url) == b"0123456789" * 1000
+    assert read(http, remote.url, headers={'Range': 'bytes=10-19'}) == \
+        b"0123456789"
+    assert len(local_server.requests) == 4
+    assert len(local_server.httpd.clients) == 1
+
+
+def test_partial_read(http, remote, local_server):
+    # the rest of a short body is read to reuse the connection
+    with http.open(remote.url) as response:
+        response.read(10)
+    assert read(http, remote.url) == b"0123456789" * 1000
+    assert len(local_server.httpd.clients) == 1
+
+
+def test_partial_read_closes(http, local_server):
+    large = local_server.add_file("large.bin", b"x" * 2**20)
+    with http.open(large.url) as response:
+        response.read(10)
+    assert read(http, large.url) == b"x" * 2**20
+    assert len(local_server.httpd.clients) == 2
+
+
+def test_stale_connection(http, remote, local_server):
+    read(http, remote.url)
+    for connections in http._idle.values():
+        for connection in connections:
+            connection.sock.close()
+    assert read(http, remote.url) == b"0123456789" * 1000
+
+
+def test_redirect_cached(http, remote, local_server, mirror_server):
+    mirror_server.httpd.redirects["/file"] = remote.url
+    url = mirror_server.url("file")
+    assert read(http, url) == b"0123456789" * 1000
+    assert read(http, url) == b"0123456789" * 1000
+    assert len(mirror_server.requests) == 1
+    assert len(local_server.requests) == 2
+
+
+def test_expired_redirect(http, remote, local_server, mirror_server,
+                          monkeypatch):
+    monkeypatch.setattr(session, 'REDIRECT_TTL', -1)
+    mirror_server.httpd.redirects["/file"] = remote.url
+    url = mirror_server.url("file")
+    read(http, url)
+    read(http, url)
+    assert len(mirror_server.requests) == 2
+
+
+def test_invalid_redirect_target(http, remote, local_server, mirror_server):
+    mirror_server.httpd.redirects["/file"] = remote.url
+    url = mirror_server.url("file")
+    read(http, url)
+    # the cached target disappears: the redirect is resolved again
+    mirror_server.httpd.redirects["/file"] = local_server.url("other.bin")
+    local_server.add_file("other.bin", b"other")
+    local_server.httpd.errors = [404]
+    assert read(http, url) == b"other"
+    assert len(mirror_server.requests) == 2
+
+
+def test_retry(http, remote, local_server):
+    local_server.httpd.errors = [503, 500]
+    assert read(http, remote.url) == b"0123456789" * 1000
+    assert len(local_server.requests) == 3
+
+
+def test_retries_exhausted(http, remote, local_server):
+    local_server.httpd.errors = [503, 503, 503]
+    with pytest.raises(HTTPError) as err:
+        read(http, remote.url)
+    assert err.value.code == 503
+
+
+def test_not_found(http, local_server):
+    with pytest.raises(HTTPError) as err:
+        read(http, local_server.url("missing.bin"))
+    assert err.value.code == 404
+    assert len(local_server.requests) == 1
+
+
+def test_connection_refused(http, local_server):
+    url = local_server.url("data.bin")
+    local_server.close()
+    with pytest.raises(OSError):
+        read(http, url, retries=0)
@@ -0,0 +1,277 @@
+# -*- coding: utf-8 -*-
+
+import json
+import os
+import struct
+
+import pytest
+
+from MDAnalysisData import bundle
+from MDAnalysisData import datasets
+from MDAnalysisData import offsets
+from MDAnalysisData import nhaa_equilibrium
+from MDAnalysisData import registry
+from MDAnalysisData import variants
+from MDAnalysisData.materialize import read_dcd_header
+from MDAnalysisData.tests.conftest import make_dcd, make_xtc
+
+
+def dcd_frames(path):
+    header = read_dcd_header(path)
+    with open(path, 'rb') as f:
+        content = f.read()
+    return [content[header.offset + i * header.frame_size:
+                    header.offset + (i + 1) * header.frame_size]
+            for i in range(header.n_frames)]
+
+
+def xtc_frames(path):
+    with open(path, 'rb') as f:
+        content = f.read()
+    starts = offsets.read_xtc_offsets(path)[0] + [len(content)]
+    return [content[start:stop] for start, stop in zip(starts, starts[1:])]
+
+
+@pytest.fixture
+def dcd(tmpdir):
+    path = tmpdir.join("traj.dcd")
+    path.write_binary(make_dcd(25, n_atoms=4))
+    return str(path)
+
+
+@pytest.fixture
+def xtc(tmpdir):
+    path = tmpdir.join("traj.xtc")
+    path.write_binary(make_xtc(10))
+    return str(path)
+
+
+@pytest.mark.parametrize('stride', [1, 4, 30])
+def test_stride_dcd(dcd, tmpdir, stride):
+    path = variants.stride_trajectory(dcd, stride,
+                                      str(tmpdir.join("strided", "traj.dcd")))
+    assert dcd_frames(path) == dcd_frames(dcd)[::stride]
+    with open(path, 'rb') as f:
+        n_frames, _, nsavc = struct.unpack_from('<3i', f.read(20), 8)
+    assert n_frames == len(range(0, 25, stride))
+    assert nsavc == stride
+    assert not os.path.exists(path + ".tmp")
+
+
+@pytest.mark.parametrize('stride', [1, 3])
+def test_stride_xtc(xtc, tmpdir, stride):
+    path = variants.stride_trajectory(xtc, stride, str(tmpdir.join("s.xtc")))
+    assert xtc_frames(path) == xtc_frames(xtc)[::stride]
+
+
+def test_reused(dcd, tmpdir, mocker):
+    path = str(tmpdir.join("s.dcd"))
+    variants.stride_trajectory(dcd, 2, path)
+    write = mocker.patch('MDAnalysisData.variants._stride_dcd',
+                         wraps=variants._stride_dcd)
+    variants.stride_trajectory(dcd, 2, path)
+    assert not write.called
+
+    # a changed trajectory is strided again
+    with open(dcd, 'wb') as f:
+        f.write(make_dcd(6, n_atoms=4))
+    os.utime(dcd, (0, os.path.getmtime(path) + 10))
+    variants.stride_trajectory(dcd, 2, path)
+    assert write.call_count == 1
+    assert len(dcd_frames(path)) == 3
+
+
+@pytest.mark.parametrize('stride', [0, -2, 2.5, True, "10"])
+def test_invalid_stride(dcd, tmpdir, stride):
+    with pytest.raises(ValueError, match="positive integer"):
+        variants.stride_trajectory(dcd, stride, str(tmpdir.join("s.dcd")))
+
+
+def test_unsupported(tmpdir):
+    path = tmpdir.join("traj.trr")
+    path.write_binary(b"trajectory")
+    with pytest.raises(ValueError, match="only XTC and DCD"):
+        variants.stride_trajectory(str(path), 2, str(tmpdir.join("s.trr")))
+
+
+def test_mdanalysis(tmpdir):
+    np = pytest.importorskip("numpy")
+    mda = pytest.importorskip("MDAnalysis")
+    dcd = str(tmpdir.join("traj.dcd"))
+    u = mda.Universe.empty(10, trajectory=True)
+    with mda.Writer(dcd, n_atoms=10, dt=2.0) as w:
+        for i in range(20):
+            u.atoms.positions = np.full((10, 3), i)
+            u.dimensions = [20, 20, 20, 90, 90, 90]
+            w.write(u)
+    path = variants.stride_trajectory(dcd, 5, str(tmpdir.join("s.dcd")))
+    full = mda.coordinates.DCD.DCDReader(dcd)
+    strided = mda.coordinates.DCD.DCDReader(path)
+    assert strided.n_frames == 4
+    assert strided.dt == pytest.approx(5 * full.dt)
+    assert [ts.positions[0, 0] for ts in strided] == [0, 5, 10, 15]
+
+
+def test_fetch(local_datasets, tmpdir):
+    full = datasets.fetch_yiip_equilibrium_short(data_home=str(tmpdir))
+    data = datasets.fetch_yiip_equilibrium_short(data_home=str(tmpdir),
+                                                 stride=4)
+    location = variants.variant_location(
+        os.path.dirname(full.trajectory), "stride4")
+    assert data.trajectory == os.path.join(
+        location, os.path.basename(full.trajectory))
+    assert data.topology == full.topology
+    assert xtc_frames(data.trajectory) == xtc_frames(full.trajectory)[::4]
+    assert data.trajectory_offsets == offsets.offsets_filename(
+        data.trajectory)
+    assert offsets.load_offsets(data.trajectory_offsets)['offsets'] == \
+        offsets.read_xtc_offsets(data.trajectory)[0]
+    assert datasets.fetch_yiip_equilibrium_short(
+        data_home=str(tmpdir), stride=1).trajectory == full.trajectory
+
+
+def test_fetch_invalid(local_datasets, tmpdir):
+    with pytest.raises(ValueError, match="positive integer"):
+        datasets.fetch_adk_equilibrium(data_home=str(tmpdir), stride=0)
+    with pytest.raises(TypeError):
+        datasets.fetch_PEG_1chain(data_home=str(tmpdir), stride=2)
+    with pytest.raises(ValueError, match="no trajectories"):
+        registry.fetch_dataset("vesicle_lib", data_home=str(tmpdir),
+                               stride=2)
+
+
+def test_fetch_dcd(adk_dcd, tmpdir):
+    data = datasets.fetch_adk_equilibrium(data_home=str(tmpdir), stride=100)
+    assert len(dcd_frames(data.trajectory)) == 3
+    assert "stride100" in data.trajectory
+
+
+def test_not_bundled(adk_dcd, tmpdir):
+    data_home = str(tmpdir.join("source"))
+    datasets.fetch_adk_equilibrium(data_home=data_home, stride=10)
+    assert not any("/variants/" in member for member, _ in
+                   bundle._dataset_files(data_home, "adk_equilibrium"))
+
+
+@pytest.fixture
+def nhaa(local_server, monkeypatch, tmpdir):
+    """Serve nhaa_equilibrium with 10 residues of N, CA and C in 6 frames."""
+    np = pytest.importorskip("numpy")
+    mda = pytest.importorskip("MDAnalysis")
+    u = mda.Universe.empty(30, n_residues=10, trajectory=True,
+                           atom_resindex=np.repeat(np.arange(10), 3))
+    u.add_TopologyAttr('name', ['N', 'CA', 'C'] * 10)
+    u.add_TopologyAttr('resname', ['ALA'] * 10)
+    u.add_TopologyAttr('resid', np.arange(1, 11))
+    u.atoms.positions = np.arange(90).reshape(30, 3)
+    files = {'topology': str(tmpdir.join("nhaa.gro")),
+             'trajectory': str(tmpdir.join("nhaa.xtc"))}
+    u.atoms.write(files['topology'])
+    with mda.Writer(files['trajectory'], n_atoms=30) as w:
+        for i in range(6):
+            u.atoms.positions = np.arange(90).reshape(30, 3) + i
+            w.write(u)
+    for file_type, meta in nhaa_equilibrium.ARCHIVE.items():
+        with open(files[file_type], 'rb') as f:
+            monkeypatch.setitem(nhaa_equilibrium.ARCHIVE, file_type,
+                                local_server.add_file(meta.filename,
+                                                      f.read()))
+    return mda
+
+
+@pytest.mark.parametrize('atoms', ["name CA", [0, 4, 29], range(5)])
+def test_atoms_key(atoms):
+    assert variants.atoms_key(atoms).startswith("atoms-")
+    assert variants.atoms_key(atoms) == variants.atoms_key(
+        atoms if isinstance(atoms, str) else list(atoms))
+    assert variants.atoms_key("name CA") != variants.atoms_key("name C")
+
+
+@pytest.mark.parametrize('atoms', ["", "  ", [], [1.5], 3, [True]])
+def test_invalid_atoms(atoms):
+    with pytest.raises(ValueError):
+        variants.atoms_key(atoms)
+
+
+@pytest.mark.parametrize('atoms,n_atoms', [("name CA", 10),
+                                           ([0, 4, 29], 3)])
+def test_fetch_atoms(nhaa, tmpdir, atoms, n_atoms, mocker):
+    mda = nhaa
+    full = datasets.fetch_nhaa_equilibrium(data_home=str(tmpdir))
+    data = datasets.fetch_nhaa_equilibrium(data_home=str(tmpdir),
+                                           atoms=atoms)
+    location = variants.variant_location(os.path.dirname(full.trajectory),
+                                         variants.atoms_key(atoms))
+    assert os.path.dirname(data.topology) == location
+    assert os.path.dirname(data.trajectory) == location
+    assert data.trajectory_offsets == offsets.offsets_filename(
+        data.trajectory)
+
+    u = mda.Universe(data.topology, data.trajectory)
+    reference = mda.Universe(full.topology, full.trajectory)
+    selected = (reference.select_atoms(atoms) if isinstance(atoms, str)
+                else reference.atoms[atoms])
+    assert u.atoms.n_atoms == n_atoms
+    assert list(u.atoms.names) == list(selected.names)
+    assert u.trajectory.n_frames == 6
+    for _ in zip(u.trajectory, reference.trajectory):
+        assert (abs(u.atoms.positions - selected.positions) < 1e-3).all()
+
+    # reused by later calls, also in other processes
+    registry.clear_results()
+    write = mocker.patch('MDAnalysisData.variants._write')
+    datasets.fetch_nhaa_equilibrium(data_home=str(tmpdir), atoms=atoms)
+    assert not write.called
+
+
+def test_fetch_atoms_stride(nhaa, tmpdir):
+    mda = nhaa
+    data = datasets.fetch_nhaa_equilibrium(data_home=str(tmpdir), stride=4,
+                                           atoms="name N")
+    assert "stride4-atoms-" in data.trajectory
+    u = mda.Universe(data.topology, data.trajectory)
+    assert u.atoms.n_atoms == 10
+    assert u.trajectory.n_frames == 2
+    assert u.trajectory[1].positions[0, 0] == pytest.approx(4.0)
+
+
+def test_fetch_atoms_invalid(nhaa, tmpdir):
+    with pytest.raises(ValueError, match="selects no atoms"):
+        datasets.fetch_nhaa_equilibrium(data_home=str(tmpdir),
+                                        atoms="name OW")
+    with pytest.raises(ValueError, match="between 0 and 29"):
+        datasets.fetch_nhaa_equilibrium(data_home=str(tmpdir), atoms=[30])
+
+
+def test_selection_recorded(nhaa, tmpdir):
+    data = datasets.fetch_nhaa_equilibrium(data_home=str(tmpdir),
+                                           atoms="name CA")
+    with open(os.path.join(os.path.dirname(data.topology),
+                           variants.SELECTION_FILE)) as f:
+        assert json.load(f) == {'selection': "name CA"}
+
+
+def test_selection_changed(nhaa, tmpdir):
+    data = datasets.fetch_nhaa_equilibrium(data_home=str(tmpdir),
+                                           atoms="name CA", chunked=True)
+    location = os.path.dirname(data.topology)
+    assert os.path.isdir(data.trajectory_chunks)
+    # another selection with the same hash replaces the whole variant
+    variants._record_selection(location, "name N")
+    assert os.listdir(location) == [variants.SELECTION_FILE]
+
+
+def test_fetch_atoms_structure(nhaa, tmpdir, local_server, monkeypatch):
+    # other coordinate files such as the PDB of ifabp_water are reduced, too
+    mda = nhaa
+    structure = str(tmpdir.join("structure.pdb"))
+    mda.Universe(str(tmpdir.join("nhaa.gro"))).atoms.write(structure)
+    with open(structure, 'rb') as f:
+        monkeypatch.setitem(nhaa_equilibrium.ARCHIVE, 'structure',
+                            local_server.add_file("nhaa.pdb", f.read()))
+    data = datasets.fetch_nhaa_equilibrium(data_home=str(tmpdir.join("home")),
+                                           atoms=[0, 4, 29])
+    assert os.path.dirname(data.structure) == os.path.dirname(data.topology)
+    u = mda.Universe(data.structure)
+    assert u.atoms.n_atoms == 3
+    assert list(u.atoms.names) == ["N", "CA", "C"]
@@ -0,0 +1,349 @@
+# -*- coding: utf-8 -*-
+
+"""Variants of datasets that are derived from the cached files.
+
+Smoke tests and regression jobs often need only every 10th or 100th
+frame of a trajectory. With ``stride``, the ``fetch_*`` functions of
+datasets with XTC or DCD trajectories derive a trajectory with every
+`stride`-th frame once from the cached full trajectory (see
+:func:`stride_trajectory`) and return it instead::
+
+    >>> nhaa = datasets.fetch_nhaa_equilibrium(stride=10)
+    >>> nhaa.trajectory
+    '~/MDAnalysis_data/nhaa_equilibrium/variants/stride10/NhaA_non_water.xtc'
+
+Frames of XTC and DCD trajectories are copied unchanged, so deriving a
+strided variant neither requires MDAnalysis nor changes any coordinates.
+
+Most analyses only use some of the atoms, e.g., the protein of a system
+with water. With ``atoms`` (a MDAnalysis selection string or a list of
+atom indices), the ``fetch_*`` functions write a reduced topology and
+trajectories with only these atoms once (see :func:`select_atoms`) and
+return them instead::
+
+    >>> yiip = datasets.fetch_yiip_equilibrium_long(atoms="protein")
+    >>> u = mda.Universe(yiip.topology, yiip.trajectory)
+
+This requires MDAnalysis. The variant is identified by a hash of the
+selection (see :func:`atoms_key`), so that later calls with the same
+selection use the reduced files at once.
+
+A variant is stored in the directory ``variants/<key>`` of the dataset
+in the data home (see :func:`variant_location`), so that it is removed
+together with the dataset.
+"""
+
+from os.path import (basename, dirname, exists, getmtime, isdir, islink, join,
+                     splitext)
+from os import makedirs, remove, replace
+import hashlib
+import os
+import json
+import numbers
+import shutil
+import struct
+
+import logging
+
+from .base import _FileLock, _lock_path
+from .materialize import read_dcd_header
+from .offsets import get_offsets, load_offsets, read_xtc_offsets
+
+logger = logging.getLogger(__name__)
+
+#: Directory of the variants in the directory of a dataset.
+VARIANTS_DIRECTORY = 'variants'
+
+#: Name of the file that records the selection of a variant with
+#: selected atoms.
+SELECTION_FILE = 'selection.json'
+
+#: Formats of topologies that are written in the same format when atoms
+#: are selected; all other topologies are written as PDB files.
+TOPOLOGY_FORMATS = ('.pdb', '.gro')
+
+_COPY_SIZE = 2**20
+
+
+def variant_location(data_location, key):
+    """Return the directory of the variant `key` of a dataset.
+
+    Parameters
+    ----------
+    data_location : str
+        directory of the dataset in the data home
+    key : str
+        name of the variant, e.g., ``"stride10"``
+    """
+    return join(data_location, VARIANTS_DIRECTORY, key)
+
+
+def stride_key(stride):
+    """Return the key of the variant with every `stride`-th frame."""
+    return 'stride{0}'.format(stride)
+
+
+def check_stride(stride):
+    """Raise a :exc:`ValueError` if `stride` is not a positive integer."""
+    if (not isinstance(stride, numbers.Integral) or isinstance(stride, bool)
+            or stride < 1):
+        raise ValueError("stride must be a positive integer, not "
+                         "{0!r}".format(stride))
+
+
+def stride_trajectory(filename, stride, path):
+    """Write every `stride`-th frame of trajectory `filename` into `path`.
+
+    An existing file is used if it is newer than the trajectory. The
+    frames (starting with the first one) are copied unchanged; a DCD
+    trajectory gets a header with the new number of frames and the
+    interval between them.
+
+    Parameters
+    ----------
+    filename : str
+        XTC or DCD trajectory
+    stride : int
+        keep every `stride`-th frame
+    path : str
+        strided trajectory
+
+    Returns
+    -------
+    path : str
+
+    Raises
+    ------
+    ValueError
+        if the format of the trajectory is not supported or `stride` is
+        not a positive integer
+    IOError
+        if the trajectory cannot be read
+    """
+    check_stride(stride)
+    if filename.endswith('.xtc'):
+        write = _stride_xtc
+    elif filename.endswith('.dcd'):
+        write = _stride_dcd
+    else:
+        raise ValueError("Cannot stride {0}: only XTC and DCD trajectories "
+                         "are supported".format(basename(filename)))
+    if dirname(path):
+        makedirs(dirname(path), exist_ok=True)
+    with _FileLock(_lock_path(path)):
+        if exists(path) and getmtime(path) >= getmtime(filename):
+            return path
+        logger.info("Writing every {0}-th frame of {1} -> {2}...".format(
+            stride, filename, path))
+        tmp_path = path + '.tmp'
+        try:
+            with open(filename, 'rb') as src, open(tmp_path, 'wb') as dst:
+                write(filename, src, dst, stride)
+            replace(tmp_path, path)
+        except BaseException:
+            if exists(tmp_path):
+                remove(tmp_path)
+            raise
+    return path
+
+
+def _copy(src, dst, offset, size):
+    """Copy `size` bytes at `offset` of `src` to `dst`."""
+    src.seek(offset)
+    while size > 0:
+        data = src.read(min(size, _COPY_SIZE))
+        if not data:
+            raise IOError("Unexpected end of {0}".format(src.name))
+        dst.write(data)
+        size -= len(data)
+
+
+def _stride_xtc(filename, src, dst, stride):
+    """Copy every `stride`-th frame of XTC trajectory `src` to `dst`."""
+    index = get_offsets(filename)
+    offsets = (load_offsets(index)['offsets'] if index is not None
+               else read_xtc_offsets(filename)[0])
+    end = src.seek(0, 2)
+    for i in range(0, len(offsets), stride):
+        stop = offsets[i + 1] if i + 1 < len(offsets) else end
+        _copy(src, dst, offsets[i], stop - offsets[i])
+
+
+def _stride_dcd(filename, src, dst, stride):
+    """Copy every `stride`-th frame of DCD trajectory `src` to `dst`."""
+    header = read_dcd_header(filename)
+    n_frames = len(range(0, header.n_frames, stride))
+    data = bytearray(src.read(header.offset))
+    # number of frames and number of steps between frames (ICNTRL 1 and 3)
+    (nsavc,) = struct.unpack_from(header.endian + 'i', data, 16)
+    struct.pack_into(header.endian + 'i', data, 8, n_frames)
+    struct.pack_into(header.endian + 'i', data, 16, nsavc * stride)
+    dst.write(data)
+    for i in range(0, header.n_frames, stride):
+        _copy(src, dst, header.offset + i * header.frame_size,
+              header.frame_size)
+
+
+def atoms_key(atoms):
+    """Return the key of the variant with the selected `atoms`.
+
+    The key contains a hash of the selection, see :func:`select_atoms`.
+    """
+    _check_atoms(atoms)
+    return 'atoms-' + hashlib.sha256(
+        _selection(atoms).encode()).hexdigest()[:16]
+
+
+def _check_atoms(atoms):
+    """Raise a :exc:`ValueError` if `atoms` is not a selection."""
+    if isinstance(atoms, str):
+        if not atoms.strip():
+            raise ValueError("The atom selection is empty")
+        return
+    try:
+        indices = list(atoms)
+    except TypeError:
+        indices = None
+    if not indices or not all(isinstance(i, numbers.Integral)
+                              and not isinstance(i, bool) for i in indices):
+        raise ValueError("atoms must be a selection string or a list of "
+                         "atom indices, not {0!r}".format(atoms))
+
+
+def _selection(atoms):
+    """Return the canonical form of a selection as a JSON string."""
+    if isinstance(atoms, str):
+        return json.dumps({'selection': atoms})
+    return json.dumps({'indices': [int(i) for i in atoms]})
+
+
+def select_atoms(topology, trajectories, atoms, location):
+    """Write the selected `atoms` of a topology and its trajectories.
+
+    The reduced topology and trajectories are written into `location`
+    with the names of the original files. Files that exist and are newer
+    than their originals are used as they are. The topology is written in
+    the same format if MDAnalysis can write it (see
+    :data:`TOPOLOGY_FORMATS`) and as a PDB file otherwise; trajectories
+    keep their format.
+
+    Parameters
+    ----------
+    topology : str
+        topology
+    trajectories : list of str
+        trajectories of the topology, or other coordinate files of its
+        atoms such as a PDB structure
+    atoms : str or list of int
+        MDAnalysis selection string (e.g., ``"protein"``) or indices of the
+        atoms (starting at 0)
+    location : str
+        directory of the variant (see :func:`variant_location` and
+        :func:`atoms_key`)
+
+    Returns
+    -------
+    topology : str
+        reduced topology
+    trajectories : list of str
+        reduced trajectories (same order)
+
+    Raises
+    ------
+    ImportError
+        if MDAnalysis is not installed
+    ValueError
+        if the selection is invalid or selects no atoms
+    """
+    _check_atoms(atoms)
+    mda = _mdanalysis()
+    makedirs(location, exist_ok=True)
+    root, ending = splitext(basename(topology))
+    reduced = join(location, root + (ending if ending.lower() in
+                                     TOPOLOGY_FORMATS else '.pdb'))
+    paths = [join(location, basename(filename)) for filename in trajectories]
+    with _FileLock(_lock_path(location)):
+        _record_selection(location, atoms)
+        stale = [(filename, path)
+                 for filename, path in [(topology, reduced)] +
+                 list(zip(trajectories, paths))
+                 if not exists(path) or getmtime(path) < getmtime(filename)]
+        if not stale:
+            return reduced, paths
+        logger.info("Selecting atoms {0} of {1} -> {2}...".format(
+            atoms, topology, location))
+        for filename, path in stale:
+            if path == reduced:
+                # coordinates of the first frame
+                universe = mda.Universe(topology, *trajectories[:1])
+                frames = [universe.trajectory.ts]
+            else:
+                universe = mda.Universe(topology, filename)
+                frames = universe.trajectory
+            _write(mda, _atom_group(universe, atoms), frames, path)
+    return reduced, paths
+
+
+def _write(mda, group, frames, path):
+    """Write the atoms of `group` in all `frames` into `path`."""
+    tmp_path = join(dirname(path), '.tmp' + basename(path))
+    try:
+        with mda.Writer(tmp_path, n_atoms=group.n_atoms,
+                        format=splitext(path)[1][1:].upper()) as w:
+            for _ in frames:
+                w.write(group)
+        replace(tmp_path, path)
+    except BaseException:
+        if exists(tmp_path):
+            remove(tmp_path)
+        raise
+
+
+def _mdanalysis():
+    try:
+        import MDAnalysis
+    except ImportError:
+        raise ImportError("selecting atoms requires the MDAnalysis package "
+                          "(pip install MDAnalysis)")
+    return MDAnalysis
+
+
+def _atom_group(universe, atoms):
+    """Return the selected `atoms` of `universe`."""
+    if isinstance(atoms, str):
+        group = universe.select_atoms(atoms)
+    else:
+        try:
+            group = universe.atoms[[int(i) for i in atoms]]
+        except IndexError:
+            raise ValueError("Atom indices must be between 0 and "
+                             "{0}".format(universe.atoms.n_atoms - 1))
+    if not group.n_atoms:
+        raise ValueError("The selection {0!r} selects no atoms".format(atoms))
+    return group
+
+
+def _record_selection(location, atoms):
+    """Write the selection of the variant in `location`.
+
+    All files of the variant are removed if it had another selection (the
+    hashes of the selections collide).
+    """
+    path = join(location, SELECTION_FILE)
+    selection = json.loads(_selection(atoms))
+    try:
+        with open(path) as f:
+            recorded = json.load(f)
+    except (OSError, ValueError):
+        recorded = None
+    if recorded == selection:
+        return
+    for filename in os.listdir(location):
+        filename = join(location, filename)
+        if isdir(filename) and not islink(filename):
+            # e.g. a chunked store
+            shutil.rmtree(filename)
+        else:
+            remove(filename)
+    with open(path, 'w') as f:
+        json.dump(selection, f)
@@ -0,0 +1,114 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Measure reading coordinates from chunked stores.
+
+Converts a trajectory into a chunked store (see
+:mod:`MDAnalysisData.chunked`) and prints the time to read all
+coordinates, every 10th frame and the first 10% of the atoms with
+different numbers of threads. Without arguments, a synthetic DCD
+trajectory is created first; real trajectories can be given instead,
+e.g. ::
+
+  python benchmarks/chunked_read.py \\
+      ~/MDAnalysis_data/nhaa_equilibrium/NhaA_non_water.xtc
+
+Converting XTC trajectories requires MDAnalysis.
+"""
+
+import argparse
+import os
+import shutil
+import struct
+import tempfile
+import time
+
+import numpy as np
+
+from MDAnalysisData import chunked
+
+
+def make_dcd(path, n_frames, n_atoms):
+    """Write a DCD trajectory of random walks without unit cells."""
+    def record(data):
+        size = struct.pack('<i', len(data))
+        return size + data + size
+
+    header = struct.pack('<4s9if10i', b'CORD', n_frames, 0, 1,
+                         *([0] * 6), 0.1, *([0] * 9), 24)
+    rng = np.random.RandomState(0)
+    xyz = rng.uniform(0, 100, size=(3, n_atoms)).astype(np.float32)
+    with open(path, 'wb') as f:
+        f.write(record(header))
+        f.write(record(struct.pack('<i80s', 1, b'synthetic'.ljust(80))))
+        f.write(record(struct.pack('<i', n_atoms)))
+        for _ in range(n_frames):
+            xyz += rng.normal(scale=0.1, size=xyz.shape).astype(np.float32)
+            for axis in xyz:
+                f.write(record(axis.tobytes()))
+
+
+def best(func, repeats):
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def benchmark(trajectory, workdir, decimals=None, repeats=3):
+    print("{0} ({1:.1f} MB)".format(trajectory,
+                                    os.path.getsize(trajectory) / 2**20))
+    path = os.path.join(workdir, os.path.basename(trajectory) + ".chunks")
+    start = time.perf_counter()
+    chunked.convert(trajectory, path, decimals=decimals)
+    size = sum(os.path.getsize(os.path.join(path, name))
+               for name in os.listdir(path))
+    print("  converted in {0:.2f} s to {1:.1f} MB".format(
+        time.perf_counter() - start, size / 2**20))
+    n_atoms = chunked.ChunkedTrajectory(path).n_atoms
+    selections = [("all", (slice(None),)),
+                  ("every 10th frame", (slice(None, None, 10),)),
+                  ("10% of the atoms",
+                   (slice(None), slice(0, max(1, n_atoms // 10))))]
+    for workers in sorted({1, 2, 4, os.cpu_count() or 1}):
+        traj = chunked.ChunkedTrajectory(path, max_workers=workers)
+        print("  {0:3d} threads: ".format(workers) + "  ".join(
+            "{0} {1:.3f} s".format(name, best(lambda: traj[index], repeats))
+            for name, index in selections))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("trajectories", nargs="*",
+                        help="DCD or XTC trajectories (default: create a "
+                        "synthetic DCD trajectory)")
+    parser.add_argument("--frames", type=int, default=2000,
+                        help="frames of the synthetic trajectory "
+                        "(default: %(default)s)")
+    parser.add_argument("--atoms", type=int, default=20000,
+                        help="atoms of the synthetic trajectory "
+                        "(default: %(default)s)")
+    parser.add_argument("--decimals", type=int, default=None,
+                        help="store coordinates with this many decimals "
+                        "(default: lossless)")
+    parser.add_argument("--repeats", type=int, default=3,
+                        help="report the best of this many runs "
+                        "(default: %(default)s)")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp()
+    try:
+        trajectories = args.trajectories
+        if not trajectories:
+            trajectories = [os.path.join(workdir, "synthetic.dcd")]
+            make_dcd(trajectories[0], args.frames, args.atoms)
+        for trajectory in trajectories:
+            benchmark(trajectory, workdir, decimals=args.decimals,
+                      repeats=args.repeats)
+    finally:
+        shutil.rmtree(workdir)
+
+
+if __name__ == "__main__":
+    main()
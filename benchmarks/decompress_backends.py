@@ -0,0 +1,108 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Compare the decompression backends for dataset archives.
+
+Unpacks tar archives with every available backend of
+:mod:`MDAnalysisData.decompress` and prints the wall-clock time and
+throughput (uncompressed MB/s) of each. Without arguments, a synthetic
+``.tar.gz`` and ``.tar.bz2`` archive are created first; real archives
+from the data directory can be given instead, e.g. ::
+
+  python benchmarks/decompress_backends.py \\
+      ~/MDAnalysis_data/vesicle_library/vesicles_1.0.tar.bz2
+
+Install ``rapidgzip``, ``indexed_bzip2``, ``pigz``, ``lbzip2`` or
+``pbzip2`` to include the multi-core backends.
+"""
+
+import argparse
+import os
+import shutil
+import tarfile
+import tempfile
+import time
+
+from MDAnalysisData import decompress
+
+
+def make_archive(path, size, mode):
+    """Write a tar archive with `size` bytes of moderately compressible data."""
+    block = b"".join(b"%8d %8.3f %8.3f %8.3f\n" % (i, i * 0.1, i * 0.2, i * 0.3)
+                     for i in range(2**14))
+    with tarfile.open(path, mode) as tar:
+        n_files = max(1, size // (16 * 2**20))
+        for i in range(n_files):
+            name = "trajectories/frames{:04d}.dat".format(i)
+            filename = os.path.join(os.path.dirname(path), "member")
+            with open(filename, 'wb') as f:
+                for _ in range(size // n_files // len(block) + 1):
+                    f.write(block)
+            tar.add(filename, arcname=name)
+            os.remove(filename)
+
+
+def unpack(archive, backend, directory):
+    """Unpack `archive` into `directory` and return the uncompressed size."""
+    compression = decompress.get_compression(archive)
+    with open(archive, 'rb') as f, \
+         decompress.open_decompressed(f, compression,
+                                      backend=backend) as stream, \
+         tarfile.open(fileobj=stream, mode='r|', bufsize=2**20) as tar:
+        size = 0
+        for member in tar:
+            tar.extract(member, path=directory)
+            size += member.size
+    return size
+
+
+def benchmark(archive, workdir, repeats=3):
+    compression = decompress.get_compression(archive)
+    print("{0} ({1:.1f} MB)".format(archive,
+                                    os.path.getsize(archive) / 2**20))
+    for decompressor in decompress.DECOMPRESSORS[compression]:
+        if not decompressor.available():
+            print("  {0:<14s} not available".format(decompressor.name))
+            continue
+        times = []
+        for _ in range(repeats):
+            directory = tempfile.mkdtemp(dir=workdir)
+            try:
+                start = time.perf_counter()
+                size = unpack(archive, decompressor.name, directory)
+                times.append(time.perf_counter() - start)
+            finally:
+                shutil.rmtree(directory)
+        best = min(times)
+        print("  {0:<14s} {1:8.2f} s  {2:8.1f} MB/s".format(
+            decompressor.name, best, size / 2**20 / best))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("archives", nargs="*",
+                        help="tar.gz or tar.bz2 archives (default: create "
+                        "synthetic archives)")
+    parser.add_argument("--size", type=int, default=256,
+                        help="uncompressed size of the synthetic archives "
+                        "in MB (default: %(default)s)")
+    parser.add_argument("--repeats", type=int, default=3,
+                        help="report the best of this many runs "
+                        "(default: %(default)s)")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp()
+    try:
+        archives = args.archives
+        if not archives:
+            archives = [os.path.join(workdir, "data.tar.gz"),
+                        os.path.join(workdir, "data.tar.bz2")]
+            for archive, mode in zip(archives, ("w:gz", "w:bz2")):
+                make_archive(archive, args.size * 2**20, mode)
+        for archive in archives:
+            benchmark(archive, workdir, repeats=args.repeats)
+    finally:
+        shutil.rmtree(workdir)
+
+
+if __name__ == "__main__":
+    main()
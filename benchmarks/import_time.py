@@ -0,0 +1,64 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Measure how long it takes to import MDAnalysisData.
+
+Runs each import statement in fresh interpreters and prints the median
+wall-clock time (in ms) over several runs, together with the time of
+starting an interpreter that imports nothing. Use ``--max`` to fail
+(exit status 1) if importing the package takes longer than that many ms
+beyond the bare interpreter start, e.g. ::
+
+  python benchmarks/import_time.py --max 20
+
+Run ``python -X importtime -c "import MDAnalysisData"`` to see which
+modules are responsible for a regression.
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+
+STATEMENTS = [
+    "pass",
+    "import MDAnalysisData",
+    "from MDAnalysisData import datasets",
+    "from MDAnalysisData.datasets import fetch_adk_equilibrium",
+]
+
+
+def measure(statement, repeats=10):
+    """Return the median time (in ms) of running `statement` in a new interpreter."""
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", statement], check=True)
+        times.append(1000 * (time.perf_counter() - start))
+    return statistics.median(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeats", type=int, default=10,
+                        help="number of interpreters per statement")
+    parser.add_argument("--max", type=float, default=None,
+                        help="maximum time (in ms) of 'import MDAnalysisData' "
+                             "beyond the interpreter start")
+    args = parser.parse_args()
+
+    times = {statement: measure(statement, repeats=args.repeats)
+             for statement in STATEMENTS}
+    baseline = times["pass"]
+    for statement, elapsed in times.items():
+        print("{0:8.1f} ms  {1:+8.1f} ms  {2}".format(
+            elapsed, elapsed - baseline, statement))
+    if args.max is not None and \
+            times["import MDAnalysisData"] - baseline > args.max:
+        print("import MDAnalysisData is slower than {} ms".format(args.max))
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())